@@ -0,0 +1,91 @@
+"""Measure the memory allocated by EventLogger.emit.
+
+Compares the copy-on-write payload handling with a full deep copy of the
+payload, both with and without a registered modifier, for events shaped like
+``tests/schemas/good/nested-array.yaml``.
+
+Run with ``python benchmarks/bench_emit_allocations.py``.
+"""
+from __future__ import annotations
+
+import copy
+import logging
+import pathlib
+import timeit
+import tracemalloc
+import typing as t
+
+from jupyter_events import EventLogger
+
+SCHEMA_FILE = (
+    pathlib.Path(__file__).parent.parent / "tests" / "schemas" / "good" / "nested-array.yaml"
+)
+SCHEMA_ID = "http://event.jupyter.org/test"
+
+EVENT = {
+    "users": [
+        {
+            "name": f"user{i}",
+            "hobbies": [{"sport": "golf", "position": "caddy"} for _ in range(10)],
+        }
+        for i in range(50)
+    ]
+}
+
+
+def redact_first_user(
+    schema_id: str,  # noqa: ARG001
+    data: dict[str, t.Any],
+) -> dict[str, t.Any]:
+    """A modifier that only touches a small part of the payload."""
+    data["users"][0]["name"] = "<masked>"
+    return data
+
+
+def make_logger(modifier: bool) -> EventLogger:
+    logger = EventLogger(handlers=[logging.NullHandler()])
+    logger.register_event_schema(SCHEMA_FILE)
+    if modifier:
+        logger.add_modifier(modifier=redact_first_user)
+    return logger
+
+
+def peak_allocated(func: t.Callable[[], t.Any]) -> int:
+    """Return the peak number of bytes allocated during a call to `func`."""
+    func()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        func()
+        # Most of the allocations are transient, so look at the peak.
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak - start
+
+
+def bench(number: int = 200) -> None:
+    """Print peak allocations and timings for each case."""
+    print(f"{'case':<32}{'peak alloc (KiB)':>18}{'time (us)':>12}")
+    for modifier in (False, True):
+        logger = make_logger(modifier)
+
+        def emit(logger: EventLogger = logger) -> t.Any:
+            return logger.emit(schema_id=SCHEMA_ID, data=EVENT)
+
+        def deepcopy_emit(logger: EventLogger = logger) -> t.Any:
+            # The previous behaviour: deep copy before running modifiers.
+            return logger.emit(schema_id=SCHEMA_ID, data=copy.deepcopy(EVENT))
+
+        label = "with modifier" if modifier else "no modifier"
+        for name, func in (
+            (f"copy-on-write, {label}", emit),
+            (f"deepcopy, {label}", deepcopy_emit),
+        ):
+            peak = peak_allocated(func)
+            elapsed = timeit.timeit(func, number=number)
+            print(f"{name:<32}{peak / 1024:>18.1f}{elapsed / number * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    bench()
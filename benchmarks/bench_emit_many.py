@@ -0,0 +1,67 @@
+"""Compare EventLogger.emit_many with a loop of EventLogger.emit calls.
+
+Events are written to an event sink that discards them and to a plain
+logging handler, so the timings cover the per-call overhead of emitting
+(schema lookup, modifiers, validation, timestamps and handler dispatch)
+rather than any I/O.
+
+Run with ``python benchmarks/bench_emit_many.py``.
+"""
+from __future__ import annotations
+
+import logging
+import timeit
+import typing as t
+
+from jupyter_events import EventLogger
+from jupyter_events.sinks import EventSink
+
+SCHEMA_ID = "http://event.jupyter.org/bench"
+SCHEMA = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "name": {"title": "Name", "type": "string"},
+        "count": {"title": "Count", "type": "integer"},
+    },
+}
+
+
+class NullSink(EventSink):
+    """An event sink that discards every event."""
+
+    def write_events(self, events: t.Sequence[bytes]) -> None:
+        """Discard the events."""
+
+
+def make_logger(handler: logging.Handler) -> EventLogger:
+    logger = EventLogger(handlers=[handler])
+    logger.register_event_schema(SCHEMA)
+    return logger
+
+
+def bench(batch_size: int = 1000, number: int = 20) -> None:
+    """Print the time per event for both ways of emitting a batch."""
+    events = [{"name": f"event{i}", "count": i} for i in range(batch_size)]
+    print(f"{'handler':<16}{'loop of emit (us)':>20}{'emit_many (us)':>18}{'speedup':>10}")
+    for label, handler in (("event sink", NullSink()), ("null handler", logging.NullHandler())):
+        logger = make_logger(handler)
+
+        def emit_loop(logger: EventLogger = logger) -> None:
+            for event in events:
+                logger.emit(schema_id=SCHEMA_ID, data=event)
+
+        def emit_many(logger: EventLogger = logger) -> None:
+            logger.emit_many(schema_id=SCHEMA_ID, data=events)
+
+        loop_time = timeit.timeit(emit_loop, number=number) / number / batch_size
+        many_time = timeit.timeit(emit_many, number=number) / number / batch_size
+        print(
+            f"{label:<16}{loop_time * 1e6:>20.2f}{many_time * 1e6:>18.2f}"
+            f"{loop_time / many_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    bench()
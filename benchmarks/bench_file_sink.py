@@ -0,0 +1,61 @@
+"""Compare the throughput of FileSink's fsync policies with logging.FileHandler.
+
+Events are emitted in batches with EventLogger.emit_many to a file in a
+temporary directory, and the handler is flushed (or closed) before the
+clock stops, so the timings include getting every event to the file.
+
+Run with ``python benchmarks/bench_file_sink.py``.
+"""
+from __future__ import annotations
+
+import logging
+import tempfile
+import time
+import typing as t
+from pathlib import Path
+
+from jupyter_events import EventLogger
+from jupyter_events.sinks import FileSink
+
+SCHEMA_ID = "http://event.jupyter.org/bench"
+SCHEMA = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "name": {"title": "Name", "type": "string"},
+        "count": {"title": "Count", "type": "integer"},
+    },
+}
+
+
+def run(handler: logging.Handler, count: int, batch_size: int = 100) -> float:
+    """Return the number of events written per second."""
+    logger = EventLogger(handlers=[handler])
+    logger.register_event_schema(SCHEMA)
+    batch = [{"name": f"event{i}", "count": i} for i in range(batch_size)]
+    start = time.perf_counter()
+    for _ in range(count // batch_size):
+        logger.emit_many(schema_id=SCHEMA_ID, data=batch)
+    handler.close()
+    return count / (time.perf_counter() - start)
+
+
+def bench(count: int = 100_000) -> None:
+    """Print the throughput of each handler."""
+    handlers: list[tuple[str, int, t.Callable[[Path], logging.Handler]]] = [
+        ("logging.FileHandler", count, logging.FileHandler),
+        ("FileSink fsync=never", count, FileSink),
+        ("FileSink fsync=batch", count, lambda path: FileSink(path, fsync="batch")),
+        # Every event is synced to disk, so this is much slower.
+        ("FileSink fsync=event", count // 100, lambda path: FileSink(path, fsync="event")),
+    ]
+    print(f"{'handler':<24}{'events':>10}{'events/s':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (label, events, make_handler) in enumerate(handlers):
+            handler = make_handler(Path(directory, f"events{index}.jsonl"))
+            print(f"{label:<24}{events:>10}{run(handler, events):>12.0f}")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,54 @@
+"""Measure how long it takes to import jupyter_events.
+
+Each statement is run in a fresh interpreter with ``python -X importtime``,
+and the cumulative import time of the jupyter_events modules it loads is
+reported. The script exits with an error if the median time of any
+statement is over its budget, so it can guard against import-time
+regressions in CI.
+
+Run with ``python benchmarks/bench_import.py``.
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+
+# Statements to time, with their budget in milliseconds.
+BUDGETS = {
+    "import jupyter_events": 30.0,
+    "from jupyter_events import EventLogger": 150.0,
+}
+
+
+def import_time(statement: str) -> float:
+    """The import time of the jupyter_events modules in `statement`, in ms."""
+    args = [sys.executable, "-X", "importtime", "-c", statement]
+    result = subprocess.run(args, capture_output=True, text=True, check=True)  # noqa: S603
+    total = 0
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only count top-level imports, which include their dependencies.
+        if not name.startswith("  ") and name.strip().startswith("jupyter_events"):
+            total += int(cumulative)
+    return total / 1000
+
+
+def bench(runs: int = 10) -> bool:
+    """Print the median import times and return whether all are within budget."""
+    ok = True
+    print(f"{'statement':<44}{'median (ms)':>12}{'budget (ms)':>13}")
+    for statement, budget in BUDGETS.items():
+        median = statistics.median(import_time(statement) for _ in range(runs))
+        status = "" if median <= budget else "  OVER BUDGET"
+        ok = ok and median <= budget
+        print(f"{statement:<44}{median:>12.1f}{budget:>13.1f}{status}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if bench() else 1)
@@ -0,0 +1,73 @@
+"""Compare the write throughput of SegmentSink with an uncompressed FileSink.
+
+Events are emitted in batches with EventLogger.emit_many. The emit column
+is the throughput seen by the code emitting events, which does not wait
+for compression; the total column includes closing the sink, i.e. writing
+every event to disk.
+
+Run with ``python benchmarks/bench_segment_sink.py``.
+"""
+from __future__ import annotations
+
+import logging
+import tempfile
+import time
+import typing as t
+from pathlib import Path
+
+from jupyter_events import EventLogger
+from jupyter_events.sinks import FileSink, SegmentSink
+
+SCHEMA_ID = "http://event.jupyter.org/bench"
+SCHEMA = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "name": {"title": "Name", "type": "string"},
+        "path": {"title": "Path", "type": "string"},
+        "count": {"title": "Count", "type": "integer"},
+    },
+}
+
+
+def run(handler: logging.Handler, count: int, batch_size: int = 100) -> tuple[float, float]:
+    """Return the events emitted per second, and written per second."""
+    logger = EventLogger(handlers=[handler])
+    logger.register_event_schema(SCHEMA)
+    batch = [
+        {"name": f"event{i}", "path": f"notebooks/analysis-{i % 10}.ipynb", "count": i}
+        for i in range(batch_size)
+    ]
+    start = time.perf_counter()
+    for _ in range(count // batch_size):
+        logger.emit_many(schema_id=SCHEMA_ID, data=batch)
+    emitted = time.perf_counter()
+    handler.close()
+    done = time.perf_counter()
+    return count / (emitted - start), count / (done - start)
+
+
+def size(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.iterdir() if path.is_file())
+
+
+def bench(count: int = 200_000) -> None:
+    """Print the throughput and size on disk of each sink."""
+    sinks: list[tuple[str, t.Callable[[Path], logging.Handler]]] = [
+        ("FileSink", lambda directory: FileSink(directory / "events.jsonl")),
+        ("SegmentSink gzip", lambda directory: SegmentSink(directory, compression="gzip")),
+        ("SegmentSink lzma", lambda directory: SegmentSink(directory, compression="lzma")),
+    ]
+    print(f"{'sink':<20}{'emit (events/s)':>18}{'total (events/s)':>18}{'size (KiB)':>12}")
+    for label, make_sink in sinks:
+        with tempfile.TemporaryDirectory() as name:
+            directory = Path(name)
+            emit_rate, total_rate = run(make_sink(directory), count)
+            print(
+                f"{label:<20}{emit_rate:>18.0f}{total_rate:>18.0f}{size(directory) / 1024:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    bench()
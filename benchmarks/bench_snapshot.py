@@ -0,0 +1,79 @@
+"""Compare loading a registry snapshot with registering schema files.
+
+A set of schema files is written to a temporary directory, then registered
+in a fresh registry with `SchemaRegistry.register_directory`, and loaded in
+another fresh registry from a snapshot of the first with
+`SchemaRegistry.load_snapshot`. Registries are not shared, so every run
+parses, validates and compiles the schemas again.
+
+Run with ``python benchmarks/bench_snapshot.py``.
+"""
+from __future__ import annotations
+
+import tempfile
+import timeit
+from pathlib import Path
+
+from jupyter_events.schema_registry import SchemaRegistry
+
+SCHEMA = """\
+$id: http://event.jupyter.org/bench/{index}
+version: "1"
+title: Benchmark event {index}
+type: object
+properties:
+  name:
+    title: Name
+    type: string
+    minLength: 1
+  count:
+    title: Count
+    type: integer
+    minimum: 0
+  tags:
+    title: Tags
+    type: array
+    items:
+      type: string
+  user:
+    title: User
+    type: object
+    properties:
+      id:
+        type: string
+      roles:
+        type: array
+        items:
+          enum: [admin, user, guest]
+required:
+  - name
+"""
+
+
+def bench(count: int = 200, number: int = 5) -> None:
+    """Print the time to register the schemas both ways."""
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(count):
+            Path(directory, f"schema{index}.yaml").write_text(SCHEMA.format(index=index))
+
+        def register() -> SchemaRegistry:
+            registry = SchemaRegistry(shared=False)
+            registry.register_directory(directory, max_workers=1)
+            return registry
+
+        snapshot = register().snapshot()
+
+        def load() -> None:
+            SchemaRegistry(shared=False).load_snapshot(snapshot)
+
+        register_time = timeit.timeit(register, number=number) / number
+        load_time = timeit.timeit(load, number=number) / number
+    print(f"{count} schemas, snapshot of {len(snapshot) / 1024:.0f} KiB")
+    print(f"{'register_directory (ms)':>24}{'load_snapshot (ms)':>20}{'speedup':>10}")
+    print(
+        f"{register_time * 1000:>24.1f}{load_time * 1000:>20.1f}{register_time / load_time:>9.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,49 @@
+"""Compare compiled schema validation with the plain Draft 7 validator.
+
+Run with ``python benchmarks/bench_validation.py``.
+"""
+from __future__ import annotations
+
+import pathlib
+import timeit
+
+from jupyter_events import yaml
+from jupyter_events.schema import EventSchema
+
+SCHEMA_PATH = pathlib.Path(__file__).parent.parent / "tests" / "schemas" / "good"
+
+# A representative, valid event for each of the test schemas.
+EVENTS = {
+    "basic.yaml": {"prop": "hello, world"},
+    "user.yaml": {"username": "jovyan"},
+    "array.yaml": {"users": [{"email": f"user{i}@example.com", "id": str(i)} for i in range(10)]},
+    "nested-array.yaml": {
+        "users": [
+            {
+                "name": f"user{i}",
+                "hobbies": [{"sport": "golf", "position": "caddy"} for _ in range(5)],
+            }
+            for i in range(10)
+        ]
+    },
+}
+
+
+def bench(number: int = 20000) -> None:
+    """Print the time per validation for each schema."""
+    print(f"{'schema':<20}{'draft7 (us)':>14}{'compiled (us)':>16}{'speedup':>10}")
+    for name, event in EVENTS.items():
+        schema = yaml.load(SCHEMA_PATH / name)
+        plain = EventSchema(schema, compiled=False)
+        compiled = EventSchema(schema)
+        assert compiled._compiled is not None
+        t_plain = timeit.timeit(lambda: plain.validate(event), number=number)  # noqa: B023
+        t_compiled = timeit.timeit(lambda: compiled.validate(event), number=number)  # noqa: B023
+        print(
+            f"{name:<20}{t_plain / number * 1e6:>14.2f}"
+            f"{t_compiled / number * 1e6:>16.2f}{t_plain / t_compiled:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    bench()
@@ -1,6 +1,35 @@
 # flake8: noqa
 from ._version import __version__
-from .logger import EVENTS_METADATA_VERSION, EventLogger
-from .schema import EventSchema
+
+# Avoids importing typing at runtime; type checkers treat this as True.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .logger import EVENTS_METADATA_VERSION, EventLogger
+    from .schema import EventSchema
 
 __all__ = ["__version__", "EVENTS_METADATA_VERSION", "EventLogger", "EventSchema"]
+
+# The rest of the package is only imported when these are first used,
+# so that `import jupyter_events` stays cheap.
+_LAZY_ATTRIBUTES = {
+    "EVENTS_METADATA_VERSION": "logger",
+    "EventLogger": "logger",
+    "EventSchema": "schema",
+}
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg) from None
+    import importlib
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,155 @@
+"""An on-disk cache of validated event schemas.
+
+Loading a schema file means parsing YAML and validating the result against
+the Jupyter Events meta-schema, which every process repeats for the same
+files. A `SchemaCache` stores the validated schema as JSON, which loads much
+faster, so later processes can skip both steps.
+
+An entry is only used if the schema file's path, modification time, size
+and content hash all match, and if it was written by the same version of
+jupyter_events against the same meta-schemas.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import re
+import tempfile
+import typing as t
+from pathlib import Path, PurePath
+
+from ._version import __version__
+from .validators import SCHEMA_STORE
+
+# The environment variable that enables the cache for EventLoggers,
+# giving the cache directory.
+CACHE_DIR_ENV = "JUPYTER_EVENTS_SCHEMA_CACHE_DIR"
+
+# Increment this when the layout of cache entries changes.
+CACHE_FORMAT_VERSION = 1
+
+# The names of cache entries (the sha256 of the schema file's path) and of
+# the temporary files they are written to. Only these are removed by
+# `SchemaCache.clear`, since the directory may hold other files.
+_ENTRY_NAME = re.compile(r"[0-9a-f]{64}\.json")
+_TEMP_PREFIX = ".entry-"
+_TEMP_SUFFIX = ".tmp"
+
+
+def default_cache_dir() -> Path:
+    """The default cache directory, following the XDG base directory spec."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "jupyter_events" / "schemas"
+
+
+@functools.cache
+def metaschema_hash() -> str:
+    """A hash of the meta-schemas that schemas are validated against."""
+    canonical = json.dumps(SCHEMA_STORE, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SchemaCache:
+    """A directory of validated schemas, keyed by the file they were loaded from.
+
+    Parameters
+    ----------
+    directory: str or Path, optional
+        The cache directory. Defaults to `default_cache_dir()`.
+    """
+
+    def __init__(self, directory: str | PurePath | None = None) -> None:
+        """Initialize the cache."""
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+
+    def __repr__(self) -> str:
+        """The str repr of the cache."""
+        return f"{self.__class__.__name__}({str(self.directory)!r})"
+
+    def _entry_path(self, path: Path) -> Path:
+        name = hashlib.sha256(str(path).encode()).hexdigest()
+        return self.directory / f"{name}.json"
+
+    @staticmethod
+    def _fingerprint(path: Path, content: bytes) -> dict[str, t.Any]:
+        """Everything that must match for a cache entry to be used."""
+        stat = path.stat()
+        return {
+            "format": CACHE_FORMAT_VERSION,
+            "path": str(path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": hashlib.sha256(content).hexdigest(),
+            "jupyter_events": __version__,
+            "metaschema": metaschema_hash(),
+        }
+
+    def get(
+        self,
+        path: PurePath,
+        load: t.Callable[[bytes], tuple[dict[str, t.Any], bool]],
+    ) -> dict[str, t.Any]:
+        """Get the validated schema of a schema file, loading it on a cache miss.
+
+        Parameters
+        ----------
+        path: PurePath
+            The path of the schema file.
+        load: callable
+            Called with the content of the file on a cache miss. Returns the
+            validated schema and whether it may be cached.
+        """
+        path = Path(path).resolve()
+        content = path.read_bytes()
+        fingerprint = self._fingerprint(path, content)
+        entry_path = self._entry_path(path)
+        try:
+            with entry_path.open("rb") as f:
+                entry = json.load(f)
+            if entry["fingerprint"] == fingerprint:
+                return entry["schema"]  # type:ignore[no-any-return]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        schema, cacheable = load(content)
+        if cacheable:
+            self._store(entry_path, {"fingerprint": fingerprint, "schema": schema})
+        return schema
+
+    def _store(self, entry_path: Path, entry: dict[str, t.Any]) -> None:
+        """Write a cache entry atomically.
+
+        Failures are ignored, since the cache is only an optimization.
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=_TEMP_PREFIX, suffix=_TEMP_SUFFIX)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f)
+                Path(tmp).replace(entry_path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except (OSError, TypeError, ValueError):
+            # e.g. a read-only cache directory, or a schema that is not JSON serializable.
+            pass
+
+    def clear(self) -> int:
+        """Remove every cache entry and return the number removed.
+
+        Temporary files left by interrupted writes are removed too. Other
+        files in the cache directory are left alone.
+        """
+        removed = 0
+        for entry in self.directory.glob("*.json"):
+            if _ENTRY_NAME.fullmatch(entry.name):
+                try:
+                    entry.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        for tmp in self.directory.glob(f"{_TEMP_PREFIX}*{_TEMP_SUFFIX}"):
+            tmp.unlink(missing_ok=True)
+        return removed
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import os
 import pathlib
 import platform
 
@@ -13,6 +14,7 @@ from rich.markup import escape
 from rich.padding import Padding
 from rich.style import Style
 
+from jupyter_events.cache import CACHE_DIR_ENV, SchemaCache
 from jupyter_events.schema import EventSchema, EventSchemaFileAbsent, EventSchemaLoadingError
 
 WIN = platform.system() == "Windows"
@@ -99,4 +101,19 @@ def validate(ctx: click.Context, schema: str) -> int:
         return ctx.exit(RC.INVALID)
 
 
+@click.command("clear-cache")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    default=None,
+    help=f"The schema cache directory. Defaults to ${CACHE_DIR_ENV}, or the user cache directory.",
+)
+def clear_cache(cache_dir: pathlib.Path | None) -> None:
+    """Remove every entry from the on-disk schema cache."""
+    cache = SchemaCache(cache_dir or os.environ.get(CACHE_DIR_ENV) or None)
+    removed = cache.clear()
+    console.print(f"Removed {removed} cached schema(s) from {cache.directory}")
+
+
 main.add_command(validate)
+main.add_command(clear_cache)
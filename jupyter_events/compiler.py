@@ -0,0 +1,441 @@
+"""Compile event schemas into specialized validation functions.
+
+A general purpose ``jsonschema`` validator walks the schema and resolves
+every keyword again each time it validates an instance. Event schemas are
+fixed once they are registered, so most of that work can be done a single
+time up front: the schema is translated into the source of a small Python
+function that checks an instance with plain ``isinstance`` tests, membership
+checks and loops.
+
+The generated function only answers "is this instance valid?". It is used
+as a fast path in front of the regular ``Draft7Validator``; when it returns
+``False`` the full validator is run to produce the usual ``ValidationError``.
+The compiler is therefore conservative: it must never accept an instance that
+``Draft7Validator`` would reject, and any schema that uses a keyword it does
+not understand raises ``SchemaCompilationError`` so that callers fall back to
+the full validator.
+
+Given a ``referencing.Registry``, ``$ref`` keywords are resolved when the
+schema is compiled and the referenced schemas are inlined into the generated
+function, so shared definitions cost nothing extra per event. Recursive
+references cannot be inlined and are left to the full validator.
+"""
+from __future__ import annotations
+
+import math
+import re
+import typing as t
+from types import CodeType
+
+from jsonschema import Draft7Validator, FormatChecker
+from referencing.exceptions import Unresolvable
+from referencing.jsonschema import DRAFT7
+
+if t.TYPE_CHECKING:
+    from referencing import Registry
+    from referencing._core import Resolver
+
+
+class SchemaCompilationError(Exception):
+    """An error raised when a schema cannot be compiled."""
+
+
+# Keywords that the code generator knows how to translate.
+SUPPORTED_KEYWORDS = frozenset(
+    {
+        "additionalProperties",
+        "allOf",
+        "const",
+        "enum",
+        "exclusiveMaximum",
+        "exclusiveMinimum",
+        "format",
+        "items",
+        "maxItems",
+        "maxLength",
+        "maxProperties",
+        "maximum",
+        "minItems",
+        "minLength",
+        "minProperties",
+        "minimum",
+        "pattern",
+        "properties",
+        "required",
+        "type",
+    }
+)
+
+# Every other keyword that affects Draft 7 validation. Keywords that
+# are not in either set (title, description, version, ...) are
+# annotations and are ignored by the validator, so they are ignored here too.
+UNSUPPORTED_KEYWORDS = frozenset(Draft7Validator.VALIDATORS) - SUPPORTED_KEYWORDS
+
+_TYPE_CHECKS = {
+    "array": "isinstance({v}, list)",
+    "boolean": "isinstance({v}, bool)",
+    "integer": (
+        "((isinstance({v}, int) and not isinstance({v}, bool))"
+        " or (isinstance({v}, float) and {v}.is_integer()))"
+    ),
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "object": "isinstance({v}, dict)",
+    "string": "isinstance({v}, str)",
+}
+
+_STRING_KEYWORDS = ("minLength", "maxLength", "pattern")
+_NUMBER_KEYWORDS = ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum")
+_OBJECT_KEYWORDS = (
+    "properties",
+    "required",
+    "additionalProperties",
+    "minProperties",
+    "maxProperties",
+)
+_ARRAY_KEYWORDS = ("items", "minItems", "maxItems")
+
+_PREAMBLE = """\
+import re as _re
+
+# Instances of these types are ignored by the numeric keywords.
+_NON_NUMERIC = (str, dict, list, bool, type(None))
+"""
+
+# Name of the generated function inside the compiled module.
+FUNCTION_NAME = "is_valid"
+
+
+class _CodeGenerator:
+    """Translate a schema into the source of a validation function."""
+
+    def __init__(self, resolver: Resolver[t.Any] | None = None) -> None:
+        self._constants: list[str] = []
+        self._lines: list[str] = []
+        self._counter = 0
+        # Resolves `$ref`s against the current base URI, if references
+        # may be inlined.
+        self._resolver = resolver
+        # The referenced schemas being inlined, to detect recursion.
+        self._active_refs: set[int] = set()
+
+    def _variable(self) -> str:
+        self._counter += 1
+        return f"v{self._counter}"
+
+    def _constant(self, expression: str) -> str:
+        name = f"_c{len(self._constants)}"
+        self._constants.append(f"{name} = {expression}")
+        return name
+
+    def _count(self, schema: dict[str, t.Any], keyword: str) -> int:
+        """The value of a length keyword (e.g. minLength), which must be an integer."""
+        value = schema[keyword]
+        if (
+            isinstance(value, bool)
+            or not isinstance(value, (int, float))
+            or not math.isfinite(value)
+            or value != int(value)
+        ):
+            msg = f"Cannot compile {keyword}={value!r}."
+            raise SchemaCompilationError(msg)
+        return int(value)
+
+    def _pattern(self, schema: dict[str, t.Any]) -> str:
+        """The value of a pattern keyword, which Python's `re` must accept."""
+        pattern = schema["pattern"]
+        try:
+            re.compile(pattern)
+        except (re.error, TypeError) as err:
+            # e.g. ECMA 262 syntax like \p{L}, left to the full validator.
+            msg = f"Cannot compile pattern={pattern!r}."
+            raise SchemaCompilationError(msg) from err
+        return t.cast(str, pattern)
+
+    def _line(self, indent: int, text: str) -> None:
+        self._lines.append("    " * indent + text)
+
+    def _fail_unless(self, indent: int, condition: str) -> None:
+        self._line(indent, f"if not ({condition}):")
+        self._line(indent + 1, "return False")
+
+    def generate(self, schema: t.Any) -> str:
+        """Return the source of a module defining the validation function."""
+        self._line(0, f"def {FUNCTION_NAME}(v0):")
+        self._visit(schema, "v0", 1)
+        self._line(1, "return True")
+        return "\n".join([_PREAMBLE, *self._constants, "", "", *self._lines, ""])
+
+    def _literal_check(self, var: str, values: list[t.Any]) -> str:
+        """Build an expression testing that `var` equals one of `values`.
+
+        Only literals whose JSON equality matches Python equality
+        for the given type are handled.
+        """
+        checks = []
+        strings = [value for value in values if isinstance(value, str)]
+        if strings:
+            if len(strings) == 1:
+                checks.append(f"(isinstance({var}, str) and {var} == {strings[0]!r})")
+            else:
+                name = self._constant(f"frozenset({sorted(strings)!r})")
+                checks.append(f"(isinstance({var}, str) and {var} in {name})")
+        for value in values:
+            if isinstance(value, str):
+                continue
+            if value is None or isinstance(value, bool):
+                checks.append(f"{var} is {value!r}")
+            elif isinstance(value, int):
+                checks.append(f"(type({var}) is int and {var} == {value!r})")
+            else:
+                msg = f"Cannot compile the literal {value!r}."
+                raise SchemaCompilationError(msg)
+        if not checks:
+            return "False"
+        return " or ".join(checks)
+
+    def _visit(self, schema: t.Any, var: str, indent: int) -> None:
+        """Emit the checks for `schema` applied to the variable `var`."""
+        if schema is True:
+            return
+        if schema is False:
+            self._line(indent, "return False")
+            return
+        if not isinstance(schema, dict):
+            msg = f"Expected a schema object, got {schema!r}."
+            raise SchemaCompilationError(msg)
+
+        if self._resolver is None:
+            self._visit_keywords(schema, var, indent)
+            return
+        # In Draft 7, the other keywords next to a `$ref` are ignored.
+        if "$ref" in schema:
+            self._visit_ref(schema["$ref"], var, indent)
+            return
+        outer = self._resolver
+        if "$id" in schema:
+            # References in this subschema are relative to its `$id`.
+            self._resolver = outer.in_subresource(DRAFT7.create_resource(schema))
+        try:
+            self._visit_keywords(schema, var, indent)
+        finally:
+            self._resolver = outer
+
+    def _visit_ref(self, ref: t.Any, var: str, indent: int) -> None:
+        """Inline the schema referenced by a `$ref`."""
+        assert self._resolver is not None
+        try:
+            resolved = self._resolver.lookup(ref)
+        except (Unresolvable, TypeError) as err:
+            msg = f"Cannot resolve the reference {ref!r}."
+            raise SchemaCompilationError(msg) from err
+        key = id(resolved.contents)
+        if key in self._active_refs:
+            msg = f"Cannot compile the recursive reference {ref!r}."
+            raise SchemaCompilationError(msg)
+        outer = self._resolver
+        self._resolver = resolved.resolver
+        if isinstance(resolved.contents, dict):
+            self._active_refs.add(key)
+        try:
+            self._visit(resolved.contents, var, indent)
+        finally:
+            self._resolver = outer
+            self._active_refs.discard(key)
+
+    def _visit_keywords(self, schema: dict[str, t.Any], var: str, indent: int) -> None:
+        """Emit the checks for the keywords of `schema`."""
+        unsupported = UNSUPPORTED_KEYWORDS.intersection(schema)
+        if unsupported:
+            msg = f"Cannot compile the keywords: {', '.join(sorted(unsupported))}."
+            raise SchemaCompilationError(msg)
+
+        # When the schema pins the instance to a single type, the keyword
+        # groups for the other types can never apply and the type guard
+        # in front of the matching group is redundant.
+        known_type = None
+        if "type" in schema:
+            types = schema["type"]
+            if isinstance(types, str):
+                types = [types]
+            if not isinstance(types, list) or not types:
+                msg = f"Cannot compile the type {schema['type']!r}."
+                raise SchemaCompilationError(msg)
+            try:
+                checks = [_TYPE_CHECKS[type_].format(v=var) for type_ in types]
+            except (KeyError, TypeError):
+                msg = f"Cannot compile the type {schema['type']!r}."
+                raise SchemaCompilationError(msg) from None
+            self._fail_unless(indent, " or ".join(checks))
+            if len(types) == 1:
+                known_type = types[0]
+
+        if "enum" in schema:
+            if not isinstance(schema["enum"], list):
+                msg = "The enum keyword must be an array."
+                raise SchemaCompilationError(msg)
+            self._fail_unless(indent, self._literal_check(var, schema["enum"]))
+
+        if "const" in schema:
+            self._fail_unless(indent, self._literal_check(var, [schema["const"]]))
+
+        if "format" in schema:
+            self._fail_unless(indent, f"_format_checker.conforms({var}, {schema['format']!r})")
+
+        if any(key in schema for key in _STRING_KEYWORDS) and known_type in (None, "string"):
+            inner = indent
+            if known_type is None:
+                self._line(indent, f"if isinstance({var}, str):")
+                inner += 1
+            if "minLength" in schema:
+                self._fail_unless(inner, f"len({var}) >= {self._count(schema, 'minLength')!r}")
+            if "maxLength" in schema:
+                self._fail_unless(inner, f"len({var}) <= {self._count(schema, 'maxLength')!r}")
+            if "pattern" in schema:
+                name = self._constant(f"_re.compile({self._pattern(schema)!r})")
+                self._fail_unless(inner, f"{name}.search({var}) is not None")
+
+        if any(key in schema for key in _NUMBER_KEYWORDS) and known_type in (
+            None,
+            "number",
+            "integer",
+        ):
+            # Anything that is not obviously a non-number must be a plain
+            # int or float within bounds; exotic numeric types are left to
+            # the full validator.
+            self._line(indent, f"if not isinstance({var}, _NON_NUMERIC):")
+            bounds = [f"isinstance({var}, (int, float))"]
+            for keyword, operator in (
+                ("minimum", ">="),
+                ("maximum", "<="),
+                ("exclusiveMinimum", ">"),
+                ("exclusiveMaximum", "<"),
+            ):
+                if keyword in schema:
+                    bound = schema[keyword]
+                    # Non-finite bounds have no literal to write in the
+                    # generated code.
+                    if (
+                        isinstance(bound, bool)
+                        or not isinstance(bound, (int, float))
+                        or not math.isfinite(bound)
+                    ):
+                        msg = f"Cannot compile {keyword}={bound!r}."
+                        raise SchemaCompilationError(msg)
+                    bounds.append(f"{var} {operator} {bound!r}")
+            self._fail_unless(indent + 1, " and ".join(bounds))
+
+        if any(key in schema for key in _OBJECT_KEYWORDS) and known_type in (None, "object"):
+            inner = indent
+            if known_type is None:
+                self._line(indent, f"if isinstance({var}, dict):")
+                inner += 1
+            self._visit_object(schema, var, inner)
+
+        if any(key in schema for key in _ARRAY_KEYWORDS) and known_type in (None, "array"):
+            inner = indent
+            if known_type is None:
+                self._line(indent, f"if isinstance({var}, list):")
+                inner += 1
+            if "minItems" in schema:
+                self._fail_unless(inner, f"len({var}) >= {self._count(schema, 'minItems')!r}")
+            if "maxItems" in schema:
+                self._fail_unless(inner, f"len({var}) <= {self._count(schema, 'maxItems')!r}")
+            items = schema.get("items", True)
+            if isinstance(items, list):
+                msg = "Cannot compile tuple-style items."
+                raise SchemaCompilationError(msg)
+            if items is not True and items != {}:
+                item = self._variable()
+                self._line(inner, f"for {item} in {var}:")
+                self._visit(items, item, inner + 1)
+
+        for subschema in schema.get("allOf", []):
+            self._visit(subschema, var, indent)
+
+    def _visit_object(self, schema: dict[str, t.Any], var: str, indent: int) -> None:
+        """Emit the checks for the object keywords of `schema`."""
+        required = schema.get("required", [])
+        if required:
+            self._fail_unless(indent, " and ".join(f"{name!r} in {var}" for name in required))
+        if "minProperties" in schema:
+            self._fail_unless(indent, f"len({var}) >= {self._count(schema, 'minProperties')!r}")
+        if "maxProperties" in schema:
+            self._fail_unless(indent, f"len({var}) <= {self._count(schema, 'maxProperties')!r}")
+
+        properties = schema.get("properties", {})
+        if not isinstance(properties, dict):
+            msg = "The properties keyword must be an object."
+            raise SchemaCompilationError(msg)
+        for name, subschema in properties.items():
+            if subschema is True or subschema == {}:
+                continue
+            self._line(indent, f"if {name!r} in {var}:")
+            value = self._variable()
+            self._line(indent + 1, f"{value} = {var}[{name!r}]")
+            self._visit(subschema, value, indent + 1)
+
+        additional = schema.get("additionalProperties", True)
+        if additional is True or additional == {}:
+            return
+        known = self._constant(f"frozenset({sorted(properties)!r})")
+        key, value = self._variable(), self._variable()
+        self._line(indent, f"for {key}, {value} in {var}.items():")
+        self._line(indent + 1, f"if {key} not in {known}:")
+        self._visit(additional, value, indent + 2)
+
+
+def generate_source(schema: t.Any, registry: Registry[t.Any] | None = None) -> str:
+    """Generate the source of a module that validates instances of `schema`.
+
+    If a registry is given, `$ref`s are resolved with it and inlined.
+    Otherwise, and for references that cannot be resolved, a
+    SchemaCompilationError is raised, as it is for any other feature
+    that the compiler does not support.
+    """
+    resolver = None
+    if registry is not None:
+        if not isinstance(schema, dict):
+            msg = f"Expected a schema object, got {schema!r}."
+            raise SchemaCompilationError(msg)
+        resolver = registry.resolver_with_root(DRAFT7.create_resource(schema))
+    return _CodeGenerator(resolver).generate(schema)
+
+
+class CompiledValidator:
+    """A validation function generated for a single schema.
+
+    Parameters
+    ----------
+    code: CodeType
+        The compiled module produced from `generate_source`.
+    format_checker: FormatChecker
+        The format checker used for the `format` keyword.
+    """
+
+    def __init__(self, code: CodeType, format_checker: FormatChecker) -> None:
+        """Initialize the compiled validator."""
+        namespace: dict[str, t.Any] = {"_format_checker": format_checker}
+        exec(code, namespace)  # noqa: S102
+        self.code = code
+        self.is_valid: t.Callable[[t.Any], bool] = namespace[FUNCTION_NAME]
+
+    @classmethod
+    def from_schema(
+        cls,
+        schema: t.Any,
+        format_checker: FormatChecker,
+        registry: Registry[t.Any] | None = None,
+    ) -> CompiledValidator:
+        """Compile a schema, inlining `$ref`s resolved with `registry`, if given.
+
+        Raises a SchemaCompilationError if the schema cannot be compiled.
+        """
+        try:
+            source = generate_source(schema, registry)
+            code = compile(source, "<jupyter_events.compiler>", "exec")
+        except (SyntaxError, RecursionError) as err:
+            # e.g. the schema is nested deeper than Python allows for blocks.
+            msg = "The generated validator could not be compiled."
+            raise SchemaCompilationError(msg) from err
+        return cls(code, format_checker)
@@ -0,0 +1,337 @@
+"""Funnel the events of several processes to a single writer.
+
+When several processes (or several EventLoggers) write to the same log,
+their writes interleave and break across rotations. In funnel mode, each
+producer's EventLogger sends its serialized events over a local Unix socket
+to a `FunnelServer`, running in one process (or thread), which owns the
+real handlers and writes the events from every producer in batches.
+
+Events are sent in frames: the length of the frame's payload, as a 4-byte
+big-endian integer, followed by the payload, one or more serialized events
+separated by newlines. `FunnelSink` sends one event per frame;
+`jupyter_events.sinks.SocketSink` packs several events per frame.
+"""
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import selectors
+import socket
+import threading
+import typing as t
+from pathlib import Path
+
+from .sinks.base import SERIALIZED_EVENT_ATTRIBUTE, EventFormatter, EventSink
+from .sinks.network import FRAME_HEADER
+
+if t.TYPE_CHECKING:
+    from .projections import Projection
+
+# Frames larger than this are rejected by the server, which closes the connection.
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+def encode_frames(events: t.Iterable[bytes]) -> bytes:
+    """Encode events as length-prefixed frames, one event per frame."""
+    pack = FRAME_HEADER.pack
+    return b"".join(pack(len(event)) + event for event in events)
+
+
+class FunnelSink(EventSink):
+    """A sink that sends events to a `FunnelServer` over a Unix socket.
+
+    The connection is opened on the first write, and opened again after
+    errors and in forked child processes, so a forked process never writes
+    to its parent's connection.
+
+    After an error, the batch of events being sent is sent again on a new
+    connection. The server may already have received some of its events, so
+    events are delivered at least once, and may occasionally be written twice.
+
+    Parameters
+    ----------
+    path: str or PathLike
+        The path of the server's Unix socket.
+    timeout: float, optional
+        The longest time, in seconds, to wait for the server to accept events.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        timeout: float | None = 10.0,
+        level: int = logging.NOTSET,
+        projection: Projection | None = None,
+    ) -> None:
+        """Initialize the sink."""
+        super().__init__(level)
+        self.path = Path(path)
+        self.timeout = timeout
+        self.projection = projection
+        self._socket: socket.socket | None = None
+        self._pid = os.getpid()
+
+    def _connect(self) -> socket.socket:
+        if self._socket is not None and self._pid != os.getpid():
+            # Forked: the connection belongs to the parent process. Closing
+            # the child's copy leaves the parent's connection open.
+            self._disconnect()
+        if self._socket is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(str(self.path))
+            except OSError:
+                sock.close()
+                raise
+            self._socket = sock
+            self._pid = os.getpid()
+        return self._socket
+
+    def write_events(self, events: t.Sequence[bytes]) -> None:
+        """Send a batch of events to the server."""
+        data = encode_frames(events)
+        try:
+            self._connect().sendall(data)
+        except OSError:
+            # The server may have restarted: reconnect once. If sending
+            # failed part way through, the server drops the partial frame,
+            # but may have received (and will write again) earlier events.
+            self._disconnect()
+            self._connect().sendall(data)
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def close(self) -> None:
+        """Close the connection to the server."""
+        self.acquire()
+        try:
+            self._disconnect()
+        finally:
+            self.release()
+        super().close()
+
+
+class _Connection:
+    """A producer connected to the server, and its incomplete frame."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.socket = sock
+        self.buffer = bytearray()
+
+
+class FunnelServer:
+    """Receive events from `FunnelSink`s (or `SocketSink`s) and write them to handlers.
+
+    The server owns the handlers: it is the only one writing to them. Events
+    from every connected producer are read as they arrive and written in
+    batches, so the events of each producer stay in order and whole. Run the
+    server in a thread with `start`, or in the current thread (e.g. in
+    a dedicated writer process) with `serve_forever`.
+
+    Parameters
+    ----------
+    path: str or PathLike
+        The path of the Unix socket to listen on. A stale socket file at
+        this path, left by a server that is gone, is replaced; if another
+        server is listening on it, OSError is raised.
+    handlers: list of logging.Handler
+        The handlers to write events to. `EventSink`s receive the events
+        as sent by the producers; other handlers receive a LogRecord whose
+        formatted message is the event.
+    max_batch_size: int
+        The maximum number of events written to the handlers at once.
+    log: logging.Logger, optional
+        The logger used to report errors.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        handlers: t.Sequence[logging.Handler],
+        *,
+        max_batch_size: int = 1000,
+        log: logging.Logger | None = None,
+    ) -> None:
+        """Initialize the server and start listening."""
+        self.path = Path(path)
+        self.handlers = list(handlers)
+        self.max_batch_size = max_batch_size
+        self.log = log or logging.getLogger(__name__)
+        self.events_written = 0
+        self._sinks = [handler for handler in self.handlers if isinstance(handler, EventSink)]
+        self._handlers = [
+            handler for handler in self.handlers if not isinstance(handler, EventSink)
+        ]
+        for handler in self._handlers:
+            handler.setFormatter(EventFormatter())
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._serving = False
+        self._stopped = threading.Event()
+        if self.path.is_socket():
+            if self._is_served(self.path):
+                msg = f"A funnel server is already listening on {self.path}."
+                raise OSError(errno.EADDRINUSE, msg)
+            self.path.unlink()
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(str(self.path))
+        self._listener.listen()
+        # Identifies the socket file, so that `close` only removes its own.
+        self._inode = self.path.stat().st_ino
+        self._listener.setblocking(False)
+        # Written to by `close` to wake the server up.
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+
+    @staticmethod
+    def _is_served(path: Path) -> bool:
+        """Whether a server is listening on the socket at `path`."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(str(path))
+            except OSError:
+                return False
+        return True
+
+    def start(self) -> None:
+        """Serve in a daemon thread."""
+        if self._thread is None:
+            self._serving = True
+            self._thread = threading.Thread(
+                target=self.serve_forever, name="jupyter-events-funnel", daemon=True
+            )
+            self._thread.start()
+
+    def serve_forever(self) -> None:
+        """Receive and write events until `close` is called."""
+        self._serving = True
+        selector = selectors.DefaultSelector()
+        selector.register(self._listener, selectors.EVENT_READ)
+        selector.register(self._wakeup_reader, selectors.EVENT_READ)
+        try:
+            while True:
+                events: list[bytes] = []
+                for key, _ in selector.select():
+                    if key.fileobj is self._listener:
+                        self._accept(selector)
+                    elif key.fileobj is self._wakeup_reader:
+                        self._wakeup_reader.recv(1024)
+                    else:
+                        self._receive(selector, key.data, events)
+                self._write(events)
+                if self._stopping:
+                    # Producers that connected just before `close` may
+                    # still be waiting to be accepted.
+                    while self._accept(selector):
+                        pass
+                    self._drain(selector, [key.data for key in selector.get_map().values()])
+                    return
+        finally:
+            for key in list(selector.get_map().values()):
+                if isinstance(key.data, _Connection):
+                    key.data.socket.close()
+            selector.close()
+            self._stopped.set()
+
+    def _accept(self, selector: selectors.BaseSelector) -> bool:
+        """Accept a pending connection, returning whether there was one."""
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return False
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ, _Connection(sock))
+        return True
+
+    def _receive(
+        self, selector: selectors.BaseSelector, connection: _Connection, events: list[bytes]
+    ) -> None:
+        """Read the frames available on a connection, closing it at the end of its stream."""
+        try:
+            data = connection.socket.recv(1024 * 1024)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        buffer = connection.buffer
+        buffer += data
+        start = 0
+        while len(buffer) - start >= FRAME_HEADER.size:
+            (size,) = FRAME_HEADER.unpack_from(buffer, start)
+            if size > MAX_FRAME_SIZE:
+                self.log.error("Closing a funnel connection that sent a %d byte frame.", size)
+                data = b""
+                break
+            end = start + FRAME_HEADER.size + size
+            if end > len(buffer):
+                break
+            events.extend(bytes(buffer[start + FRAME_HEADER.size : end]).split(b"\n"))
+            start = end
+        del buffer[:start]
+        if not data:
+            if buffer:
+                self.log.warning("Dropping an incomplete event from a closed funnel connection.")
+            selector.unregister(connection.socket)
+            connection.socket.close()
+
+    def _drain(self, selector: selectors.BaseSelector, connections: list[t.Any]) -> None:
+        """Read the events already sent by connected producers."""
+        for connection in connections:
+            if not isinstance(connection, _Connection):
+                continue
+            while connection.socket.fileno() != -1:
+                events: list[bytes] = []
+                before = len(connection.buffer)
+                self._receive(selector, connection, events)
+                self._write(events)
+                if not events and len(connection.buffer) == before:
+                    break
+
+    def _write(self, events: list[bytes]) -> None:
+        """Write events to every handler, in batches."""
+        for start in range(0, len(events), self.max_batch_size):
+            batch = events[start : start + self.max_batch_size]
+            for sink in self._sinks:
+                if sink.level <= logging.INFO:
+                    sink.handle_events(batch)
+            for data in batch if self._handlers else ():
+                record = logging.makeLogRecord(
+                    {
+                        "name": __name__,
+                        "levelno": logging.INFO,
+                        "levelname": "INFO",
+                        SERIALIZED_EVENT_ATTRIBUTE: data.decode("utf-8"),
+                    }
+                )
+                for handler in self._handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            self.events_written += len(batch)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write the events already received, stop serving and flush the handlers.
+
+        Handlers are not closed, since they may be shared.
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        if self._serving:
+            self._wakeup_writer.send(b"\0")
+            self._stopped.wait(timeout)
+        self._listener.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+        try:
+            if self.path.stat().st_ino == self._inode:
+                self.path.unlink()
+        except FileNotFoundError:
+            pass
+        for handler in self.handlers:
+            handler.flush()
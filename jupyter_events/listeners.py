@@ -0,0 +1,161 @@
+"""Bounded queues that feed events to long-lived listener tasks."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .logger import EventLogger
+
+# What to do with a new event when a listener's queue is full.
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class ListenerQueue:
+    """Feed events to a listener from a bounded queue in a single consumer task.
+
+    Instead of creating a task for every event, events are queued and a
+    long-lived task awaits the listener for each of them in turn, so a
+    listener sees its events one at a time and in order.
+
+    Parameters
+    ----------
+    listener: callable
+        The listener coroutine function.
+    logger: EventLogger
+        The logger passed to the listener.
+    maxsize: int
+        The maximum number of queued events.
+    overflow: str
+        What to do with a new event when the queue is full:
+
+        - ``"block"``: wait for space in the queue. Since events are emitted
+          synchronously, the event is handed to a task that waits for
+          space; later events queue up behind it, so ordering is kept.
+        - ``"drop_oldest"``: discard the oldest queued event.
+        - ``"drop_newest"``: discard the new event.
+    log: logging.Logger, optional
+        The logger used to report errors raised by the listener.
+    """
+
+    def __init__(
+        self,
+        listener: t.Callable[..., t.Coroutine[t.Any, t.Any, None]],
+        logger: EventLogger,
+        *,
+        maxsize: int = 1000,
+        overflow: str = "block",
+        log: logging.Logger | None = None,
+    ) -> None:
+        """Initialize the queue; the consumer starts with the first event."""
+        if overflow not in OVERFLOW_POLICIES:
+            msg = f"Unknown overflow policy {overflow!r}; expected one of {', '.join(OVERFLOW_POLICIES)}."
+            raise ValueError(msg)
+        self.listener = listener
+        self.logger = logger
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.log = log or logging.getLogger(__name__)
+        self.processed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._queue: asyncio.Queue[tuple[str, dict[str, t.Any]]] | None = None
+        self._consumer: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Tasks waiting for space in the queue (in "block" mode).
+        self._pending_puts: set[asyncio.Task[None]] = set()
+        self._closing = False
+        # Whether the consumer is running the listener.
+        self._busy = False
+
+    @property
+    def depth(self) -> int:
+        """The number of events waiting to be handled, including blocked ones."""
+        if self._queue is None:
+            return 0
+        return self._queue.qsize() + len(self._pending_puts)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters describing the queue."""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "processed": self.processed,
+            "dropped": self.dropped,
+        }
+
+    def _start(self) -> asyncio.Queue[tuple[str, dict[str, t.Any]]]:
+        """Create the queue and its consumer on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            # Queues and tasks belong to a single event loop, so
+            # start over if the loop has changed.
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._pending_puts = set()
+            self._loop = loop
+            self._consumer = loop.create_task(self._consume(self._queue))
+        return self._queue
+
+    def put(self, schema_id: str, data: dict[str, t.Any]) -> None:
+        """Queue an event for the listener."""
+        self._closing = False
+        queue = self._start()
+        item = (schema_id, data)
+        if self.overflow == "block":
+            if self._pending_puts or queue.full():
+                task = asyncio.create_task(queue.put(item))
+                self._pending_puts.add(task)
+                task.add_done_callback(self._pending_puts.discard)
+            else:
+                queue.put_nowait(item)
+        elif queue.full():
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                return
+            queue.get_nowait()
+            queue.task_done()
+            queue.put_nowait(item)
+        else:
+            queue.put_nowait(item)
+        self.max_depth = max(self.max_depth, self.depth)
+
+    async def join(self) -> None:
+        """Wait until every queued event has been handled."""
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+        if self._pending_puts:
+            await asyncio.gather(*self._pending_puts, return_exceptions=True)
+        await self._queue.join()
+
+    def close(self) -> None:
+        """Stop the consumer once the queued events have been handled."""
+        self._closing = True
+        if self._consumer is not None and not self._busy and self.depth == 0:
+            self._consumer.cancel()
+            self._consumer = None
+            self._queue = None
+
+    async def _consume(self, queue: asyncio.Queue[tuple[str, dict[str, t.Any]]]) -> None:
+        while True:
+            schema_id, data = await queue.get()
+            self._busy = True
+            try:
+                await self.listener(logger=self.logger, schema_id=schema_id, data=data)
+            except Exception as err:
+                self.log.error(
+                    "Event listener %s failed for %s: %s",
+                    getattr(self.listener, "__qualname__", self.listener),
+                    schema_id,
+                    err,
+                    exc_info=err,
+                )
+            finally:
+                self._busy = False
+                self.processed += 1
+                queue.task_done()
+            if self._closing and queue is self._queue and self.depth == 0:
+                self._consumer = None
+                self._queue = None
+                return
@@ -4,30 +4,45 @@ Emit structured, discrete events when various actions happen.
 from __future__ import annotations
 
 import asyncio
-import copy
-import json
+import functools
+import itertools
 import logging
+import os
 import typing as t
 import warnings
 from datetime import datetime, timezone
-from importlib.metadata import version
-
-from jsonschema import ValidationError
-from packaging.version import parse
-from traitlets import Dict, Instance, Set, default
+from pathlib import PurePath
+
+from traitlets import (
+    Bool,
+    Dict,
+    Enum,
+    Float,
+    Instance,
+    Integer,
+    Set,
+    TraitError,
+    Type,
+    Unicode,
+    default,
+    observe,
+    validate,
+)
 from traitlets.config import Config, LoggingConfigurable
 
-from .schema import SchemaType
-from .schema_registry import SchemaRegistry
+from .cache import CACHE_DIR_ENV, SchemaCache
+from .listeners import OVERFLOW_POLICIES, ListenerQueue
+from .payload import CopyOnWriteDict, unwrap
+from .policies import ValidationPolicy
+from .projections import ProjectFunction, Projection
+from .schema import EventSchema, SchemaType
+from .schema_registry import ENTRY_POINT_GROUP, RegistrationReport, SchemaRegistry
+from .serializers import EventSerializer, JSONSerializer
+from .sinks import EventSink
+from .sinks.base import SERIALIZED_EVENT_ATTRIBUTE, EventFormatter
 from .traits import Handlers
-from .validators import JUPYTER_EVENTS_CORE_VALIDATOR
-
-# Check if the version is greater than 3.1.0
-version_info = version("python-json-logger")
-if parse(version_info) >= parse("3.1.0"):
-    from pythonjsonlogger.json import JsonFormatter
-else:
-    from pythonjsonlogger.jsonlogger import JsonFormatter  # type: ignore[attr-defined]
+from .validators import _get as _get_validator
+from .writer import BackgroundWriter
 
 # Increment this version when the metadata included with each event
 # changes.
@@ -61,6 +76,16 @@ class ListenerError(Exception):
     """
 
 
+class _Dispatch(t.NamedTuple):
+    """The modifiers and listeners that apply to a schema, in registration order."""
+
+    modifiers: tuple[t.Callable[..., t.Any], ...]
+    modified_listeners: tuple[t.Callable[..., t.Any], ...]
+    unmodified_listeners: tuple[t.Callable[..., t.Any], ...]
+    # Whether any listener would receive the event.
+    has_listeners: bool
+
+
 class EventLogger(LoggingConfigurable):
     """
     An Event logger for emitting structured events.
@@ -80,6 +105,129 @@ class EventLogger(LoggingConfigurable):
         """,
     ).tag(config=True)
 
+    background_writer = Bool(
+        False,
+        help="""Write events to the handlers from a dedicated thread.
+
+        When enabled, `emit` validates and serializes the event, then queues
+        it; a writer thread writes queued events to the handlers in batches.
+        This keeps slow handlers (e.g. disk writes) from blocking the thread
+        that emits events, such as the event loop. Call `flush` or `close` to
+        make sure queued events are written.
+        """,
+    ).tag(config=True)
+
+    writer_queue_size = Integer(
+        10000,
+        help="""The maximum number of events waiting for the background writer.
+        `emit` blocks while the queue is full.""",
+    ).tag(config=True)
+
+    writer_batch_size = Integer(
+        100, help="""The maximum number of events the background writer writes at once."""
+    ).tag(config=True)
+
+    writer_flush_interval = Float(
+        0.5,
+        help="""The longest time, in seconds, that a queued event waits for
+        a batch to fill up before the background writer writes it.""",
+    ).tag(config=True)
+
+    funnel_path = Unicode(
+        None,
+        allow_none=True,
+        help="""The Unix socket of a `jupyter_events.funnel.FunnelServer` to send events to.
+
+        When set, events are serialized and sent to the funnel server, which
+        writes the events of every process using it to its own handlers,
+        in addition to this logger's other handlers. Use it when several
+        processes write events to the same log.
+        """,
+    ).tag(config=True)
+
+    lazy_schema_registration = Bool(
+        False,
+        help="""Defer loading schema files registered with `register_event_schema`
+        until the first event is emitted for them.
+
+        Registering a file then only reads the schema's `$id`; parsing
+        the file, validating it against the Jupyter Events meta-schema
+        and building its validator happen on first use. Errors in a
+        schema file are raised by the first `emit` for it.
+        """,
+    ).tag(config=True)
+
+    schema_cache_dir = Unicode(
+        None,
+        allow_none=True,
+        help="""A directory in which to cache validated schemas loaded from files.
+
+        On later runs, schema files that have not changed are loaded from
+        the cache, skipping YAML parsing and meta-schema validation.
+        The cache is disabled by default; it can also be enabled with the
+        JUPYTER_EVENTS_SCHEMA_CACHE_DIR environment variable. Clear it with
+        `jupyter-events clear-cache`.
+        """,
+    ).tag(config=True)
+
+    include_schema_fingerprint = Bool(
+        False,
+        help="""Include the fingerprint of each event's schema in the event,
+        as `__schema_fingerprint__`.
+
+        The fingerprint is a hash of the schema's content (see
+        `EventSchema.fingerprint`), so readers of the events can tell
+        apart, or deduplicate, schemas that share an $id and version.
+        """,
+    ).tag(config=True)
+
+    listener_dispatch = Enum(
+        ["task", "queue"],
+        default_value="task",
+        help="""How events are handed to listeners.
+
+        - "task": run each listener in a new asyncio task for every event.
+        - "queue": give each listener a bounded queue, drained by a single
+          long-lived task that runs the listener on one event at a time.
+          See `listener_queue_size` and `listener_overflow`.
+        """,
+    ).tag(config=True)
+
+    listener_queue_size = Integer(
+        1000,
+        help="""The maximum number of events queued for each listener
+        when `listener_dispatch` is "queue".""",
+    ).tag(config=True)
+
+    listener_overflow = Enum(
+        list(OVERFLOW_POLICIES),
+        default_value="block",
+        help="""What to do with a new event when a listener's queue is full.
+
+        - "block": wait for space in the queue. The event is handed to a task
+          that waits for space, and later events queue up behind it.
+        - "drop_oldest": discard the oldest queued event.
+        - "drop_newest": discard the new event.
+        """,
+    ).tag(config=True)
+
+    serializer_class = Type(
+        default_value=JSONSerializer,
+        klass=EventSerializer,
+        help="""The EventSerializer class used to serialize events.
+
+        Use "jupyter_events.serializers.OrjsonSerializer" for a faster
+        serializer when orjson is installed.
+        """,
+    ).tag(config=True)
+
+    serializer = Instance(
+        EventSerializer,
+        help="""The EventSerializer used to serialize events. Defaults
+        to an instance of `serializer_class`.
+        """,
+    )
+
     schemas = Instance(
         SchemaRegistry,
         help="""The SchemaRegistry for caching validated schemas
@@ -87,7 +235,31 @@ class EventLogger(LoggingConfigurable):
         """,
     )
 
-    _modifiers = Dict({}, help="A mapping of schemas to their list of modifiers.")
+    validation_policies = Dict(
+        key_trait=Unicode(),
+        value_trait=Unicode(),
+        default_value={},
+        help="""A mapping of schema $id to the validation policy used for its events.
+
+        A policy is one of:
+
+        - "always": validate every event.
+        - "first:N": validate only the first N events.
+        - "sampled:RATE": validate a random fraction RATE (0 to 1) of events.
+        - "trusted": never validate events; the producer is trusted.
+
+        Schemas not listed here use `default_validation_policy`.
+        """,
+    ).tag(config=True)
+
+    default_validation_policy = Unicode(
+        "always",
+        help="""The validation policy for schemas not listed in `validation_policies`.""",
+    ).tag(config=True)
+
+    # Each registry maps a callable to its registration order, so
+    # that the dispatch tables list callables in the order they were added.
+    _modifiers = Dict({}, help="A mapping of schemas to their modifiers.")
 
     _modified_listeners = Dict({}, help="A mapping of schemas to the listeners of modified events.")
 
@@ -98,15 +270,112 @@ class EventLogger(LoggingConfigurable):
     _active_listeners: set[asyncio.Task[t.Any]] = Set()  # type:ignore[assignment]
 
     async def gather_listeners(self) -> list[t.Any]:
-        """Gather all of the active listeners."""
-        return await asyncio.gather(*self._active_listeners, return_exceptions=True)
+        """Gather all of the active listeners.
+
+        Also waits for the events queued for each listener to be handled.
+        """
+        results = await asyncio.gather(*self._active_listeners, return_exceptions=True)
+        for listener_queue in list(self._listener_queues.values()):
+            await listener_queue.join()
+        return results
+
+    @property
+    def listener_queue_stats(self) -> dict[t.Callable[..., t.Any], dict[str, int]]:
+        """Queue depth and counters for each listener's queue.
+
+        Only populated when `listener_dispatch` is "queue". Counters are
+        keyed by the listener itself, so that listeners sharing a name
+        (e.g. the same method of two objects) are reported separately.
+        """
+        return {
+            listener: listener_queue.stats
+            for listener, listener_queue in self._listener_queues.items()
+        }
+
+    @default("serializer")
+    def _default_serializer(self) -> EventSerializer:
+        return self.serializer_class()
+
+    @default("schema_cache_dir")
+    def _default_schema_cache_dir(self) -> str | None:
+        return os.environ.get(CACHE_DIR_ENV) or None
 
     @default("schemas")
     def _default_schemas(self) -> SchemaRegistry:
-        return SchemaRegistry()
+        cache = SchemaCache(self.schema_cache_dir) if self.schema_cache_dir else None
+        return SchemaRegistry(cache=cache)
+
+    @validate("validation_policies")
+    def _validate_validation_policies(self, proposal: t.Any) -> dict[str, str]:
+        for spec in proposal["value"].values():
+            try:
+                ValidationPolicy.from_string(spec)
+            except ValueError as err:
+                raise TraitError(str(err)) from None
+        return proposal["value"]  # type:ignore[no-any-return]
+
+    @validate("default_validation_policy")
+    def _validate_default_validation_policy(self, proposal: t.Any) -> str:
+        try:
+            ValidationPolicy.from_string(proposal["value"])
+        except ValueError as err:
+            raise TraitError(str(err)) from None
+        return proposal["value"]  # type:ignore[no-any-return]
+
+    @observe("validation_policies", "default_validation_policy")
+    def _reset_validation_policies(self, change: t.Any) -> None:  # noqa: ARG002
+        self._policies.clear()
+
+    def _get_validation_policy(self, schema_id: str) -> ValidationPolicy:
+        """Get (or create) the validation policy for a schema."""
+        try:
+            return self._policies[schema_id]
+        except KeyError:
+            spec = self.validation_policies.get(schema_id, self.default_validation_policy)
+            policy = self._policies[schema_id] = ValidationPolicy.from_string(spec)
+            return policy
+
+    @property
+    def validation_stats(self) -> dict[str, dict[str, int]]:
+        """The number of events validated and skipped for each schema."""
+        return {
+            schema_id: {"validated": policy.validated, "skipped": policy.skipped}
+            for schema_id, policy in self._policies.items()
+        }
 
     def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
         """Initialize the logger."""
+        # Validation policies (and their counters) for each schema,
+        # created on the first event emitted for that schema.
+        self._policies: dict[str, ValidationPolicy] = {}
+        # Validated capsule templates (see _get_capsule_template), keyed
+        # by schema $id, along with the schema they were built for.
+        self._capsule_templates: dict[tuple[str, str], tuple[EventSchema, dict[str, t.Any]]] = {}
+        # Registered handlers that accept serialized events directly.
+        self._sinks: list[EventSink] = []
+        # The sinks' projections compiled for each schema (see _get_projectors),
+        # keyed like the capsule templates.
+        self._projectors: dict[
+            tuple[str, str], tuple[EventSchema, tuple[tuple[Projection, ProjectFunction], ...]]
+        ] = {}
+        # The background writer thread, started by the first event
+        # emitted in background mode.
+        self._writer: BackgroundWriter | None = None
+        # Listener queues, keyed by listener, used when listener_dispatch is "queue".
+        self._listener_queues: dict[t.Callable[..., t.Any], ListenerQueue] = {}
+        # Modifiers and listeners added without a schema_id, which apply
+        # to every schema, including ones registered later.
+        self._wildcard_modifiers: dict[t.Callable[..., t.Any], int] = {}
+        self._wildcard_modified_listeners: dict[t.Callable[..., t.Any], int] = {}
+        self._wildcard_unmodified_listeners: dict[t.Callable[..., t.Any], int] = {}
+        # Wildcard callables that were removed from a single schema.
+        self._wildcard_exclusions: dict[str, set[t.Callable[..., t.Any]]] = {}
+        self._registration_order = itertools.count()
+        # The sink sending events to the funnel server, if `funnel_path` is set.
+        self._funnel_sink: EventSink | None = None
+        # The dispatch record of each schema, rebuilt when registrations change.
+        self._dispatch: dict[str, _Dispatch] = {}
+        self._closed = False
         # We need to initialize the configurable before
         # adding the logging handlers.
         super().__init__(*args, **kwargs)
@@ -122,6 +391,7 @@ class EventLogger(LoggingConfigurable):
         if self.handlers:
             for handler in self.handlers:
                 self.register_handler(handler)
+        self._set_funnel(self.funnel_path)
 
     def _load_config(
         self,
@@ -145,54 +415,380 @@ class EventLogger(LoggingConfigurable):
         eventlogger_cfg = Config({"EventLogger": my_cfg})
         super()._load_config(eventlogger_cfg, section_names=None, traits=None)
 
-    def register_event_schema(self, schema: SchemaType) -> None:
+    @observe("background_writer")
+    def _stop_background_writer(self, change: t.Any) -> None:
+        # Drain the queue so events stay in order once writes are synchronous again.
+        if not change["new"] and self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    @observe("funnel_path")
+    def _update_funnel(self, change: t.Any) -> None:
+        # Handlers are registered at the end of __init__.
+        if hasattr(self, "_logger"):
+            self._set_funnel(change["new"])
+
+    def _set_funnel(self, path: str | None) -> None:
+        """Replace the sink sending events to the funnel server."""
+        if self._funnel_sink is not None:
+            self.remove_handler(self._funnel_sink)
+            self._funnel_sink.close()
+            self._funnel_sink = None
+        if path:
+            from .funnel import FunnelSink
+
+            self._funnel_sink = FunnelSink(path)
+            self.register_handler(self._funnel_sink)
+
+    @observe("include_schema_fingerprint")
+    def _reset_capsule_templates(self, change: t.Any) -> None:  # noqa: ARG002
+        self._capsule_templates.clear()
+
+    @observe("listener_dispatch", "listener_queue_size", "listener_overflow")
+    def _close_listener_queues(self, change: t.Any) -> None:  # noqa: ARG002
+        # Queues are rebuilt with the new settings as events arrive;
+        # the old consumers exit once their queued events are handled.
+        for listener_queue in self._listener_queues.values():
+            listener_queue.close()
+        self._listener_queues.clear()
+
+    def _get_capsule_template(self, schema: EventSchema) -> dict[str, t.Any]:
+        """Get the capsule template for a schema, building it if needed.
+
+        The template holds the event metadata that is constant for a schema
+        version.
+        It is validated against the core event schema once, when it is built,
+        so that emitting an event only needs to add the timestamp.
+        """
+        key = (schema.id, str(schema.version))
+        cached = self._capsule_templates.get(key)
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        template = {
+            # Placeholder; keeps the timestamp first in the emitted event.
+            "__timestamp__": datetime.fromtimestamp(0, tz=timezone.utc).isoformat() + "Z",
+            "__schema__": schema.id,
+            "__schema_version__": schema.version,
+            "__metadata_version__": EVENTS_METADATA_VERSION,
+        }
+        if self.include_schema_fingerprint:
+            template["__schema_fingerprint__"] = schema.fingerprint
+        from jsonschema import ValidationError
+
+        try:
+            _get_validator("JUPYTER_EVENTS_CORE_VALIDATOR").validate(template)
+        except ValidationError as err:
+            raise CoreMetadataError from err
+        self._capsule_templates[key] = (schema, template)
+        return template
+
+    def _get_projectors(
+        self, schema: EventSchema
+    ) -> tuple[tuple[Projection, ProjectFunction], ...]:
+        """Get the projections of the registered sinks compiled for a schema.
+
+        Each distinct projection is compiled once per schema version, when
+        the schema is registered or the sinks change. Projections that keep
+        the whole event are left out.
+        """
+        key = (schema.id, str(schema.version))
+        cached = self._projectors.get(key)
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        projections = dict.fromkeys(
+            sink.projection for sink in self._sinks if sink.projection is not None
+        )
+        projectors = []
+        for projection in projections:
+            project = projection.compile(schema)
+            if project is not None:
+                projectors.append((projection, project))
+        self._projectors[key] = (schema, tuple(projectors))
+        return self._projectors[key][1]
+
+    def register_event_schema(self, schema: SchemaType, lazy: bool | None = None) -> None:
         """Register this schema with the schema registry.
 
         Get this registered schema using the EventLogger.schema.get() method.
+
+        Parameters
+        ----------
+        schema: dict, str, PurePath or EventSchema
+            The schema to register.
+        lazy: bool, optional
+            Whether to defer loading a schema file until the first event is
+            emitted for it (see `SchemaRegistry.register_lazy`). Only applies
+            to schema files. Defaults to `lazy_schema_registration`.
         """
-        event_schema = self.schemas.register(schema)  # type:ignore[arg-type]
-        key = event_schema.id
+        if lazy is None:
+            lazy = self.lazy_schema_registration
+        if lazy and isinstance(schema, PurePath):
+            # The capsule template is built on the first emit instead.
+            key = self.schemas.register_lazy(schema)
+        else:
+            event_schema = self.schemas.register(schema)
+            self._get_capsule_template(event_schema)
+            self._get_projectors(event_schema)
+            key = event_schema.id
+        self._add_schema_registries(key)
+
+    def _add_schema_registries(self, key: str) -> None:
         # It's possible that listeners and modifiers have been added for this
         # schema before the schema is registered.
-        if key not in self._modifiers:
-            self._modifiers[key] = set()
-        if key not in self._modified_listeners:
-            self._modified_listeners[key] = set()
-        if key not in self._unmodified_listeners:
-            self._unmodified_listeners[key] = set()
+        self._modifiers.setdefault(key, {})
+        self._modified_listeners.setdefault(key, {})
+        self._unmodified_listeners.setdefault(key, {})
+
+    def _finish_bulk_registration(self, report: RegistrationReport) -> None:
+        for key in report.schema_ids:
+            schema = self.schemas.get(key)
+            self._get_capsule_template(schema)
+            self._get_projectors(schema)
+            self._add_schema_registries(key)
+        for source, elapsed in report.source_timings().items():
+            self.log.debug(
+                "Loaded %d event schema(s) from %s in %.1f ms",
+                len(report.sources[source]),
+                source,
+                elapsed * 1000,
+            )
+
+    def register_event_schema_directory(
+        self, path: str | PurePath, pattern: str = "*.yaml"
+    ) -> RegistrationReport:
+        """Register every schema file in a directory.
+
+        The files are loaded and validated in parallel. If any of them fail,
+        a `SchemaRegistrationError` listing every failure is raised and none
+        of the schemas are registered. The time spent loading each file is
+        returned in a report and logged at debug level.
+
+        Parameters
+        ----------
+        path: str or PurePath
+            The directory.
+        pattern: str
+            A glob pattern selecting the schema files in the directory.
+        """
+        report = self.schemas.register_directory(path, pattern)
+        self._finish_bulk_registration(report)
+        return report
+
+    def register_event_schema_entry_points(
+        self, group: str = ENTRY_POINT_GROUP, pattern: str = "*.yaml"
+    ) -> RegistrationReport:
+        """Register the schemas that installed packages declare with entry points.
+
+        See `SchemaRegistry.register_entry_points` for how packages declare
+        their schemas and `register_event_schema_directory` for how failures
+        and timings are reported. Timings are reported per entry point.
+        """
+        report = self.schemas.register_entry_points(group, pattern)
+        self._finish_bulk_registration(report)
+        return report
 
     def register_handler(self, handler: logging.Handler) -> None:
         """Register a new logging handler to the Event Logger.
 
-        All outgoing messages will be formatted as a JSON string.
+        Each event is serialized to JSON once, by the `serializer`, and the
+        same serialized event is passed to every handler: `EventSink`s receive
+        it as bytes, other handlers receive a LogRecord whose formatted message
+        is the event. Sinks with a `projection` receive the projected event,
+        serialized once for all the sinks sharing that projection.
         """
-
-        def _handle_message_field(record: t.Any, **kwargs: t.Any) -> str:
-            """Python's logger always emits the "message" field with
-            the value as "null" unless it's present in the schema/data.
-            Message happens to be a common field for event logs,
-            so special case it here and only emit it if "message"
-            is found the in the schema's property list.
-            """
-            schema = self.schemas.get(record["__schema__"])
-            if "message" not in schema.properties:
-                del record["message"]
-            return json.dumps(record, **kwargs)
-
-        formatter = JsonFormatter(
-            json_serializer=_handle_message_field,
-        )
-        handler.setFormatter(formatter)
-        self._logger.addHandler(handler)
+        if isinstance(handler, EventSink):
+            if handler not in self._sinks:
+                self._sinks.append(handler)
+                self._projectors.clear()
+        else:
+            handler.setFormatter(EventFormatter())
+            self._logger.addHandler(handler)
         if handler not in self.handlers:
             self.handlers.append(handler)
 
     def remove_handler(self, handler: logging.Handler) -> None:
         """Remove a logging handler from the logger and list of handlers."""
         self._logger.removeHandler(handler)
+        if handler in self._sinks:
+            self._sinks.remove(handler)
+            self._projectors.clear()
         if handler in self.handlers:
             self.handlers.remove(handler)
 
+    def _write_events(self, capsules: t.Sequence[dict[str, t.Any]], schema: EventSchema) -> None:
+        """Serialize events once each and pass them to every handler.
+
+        Events are also serialized once for each projection of the sinks
+        that applies to their schema. In background mode, the serialized
+        events are queued for the writer thread instead of being written
+        on the caller's thread.
+        """
+        dumps = self.serializer.dumps
+        projectors = self._get_projectors(schema)
+        events: list[tuple[dict[str, t.Any], bytes, dict[Projection, bytes] | None]]
+        if projectors:
+            events = [
+                (
+                    capsule,
+                    dumps(capsule),
+                    {projection: dumps(project(capsule)) for projection, project in projectors},
+                )
+                for capsule in capsules
+            ]
+        else:
+            events = [(capsule, dumps(capsule), None) for capsule in capsules]
+        writer = self._get_writer()
+        if writer is not None:
+            for event in events:
+                writer.submit(event)
+        else:
+            self._write_serialized(events)
+
+    def _write_serialized(
+        self, events: t.Sequence[tuple[dict[str, t.Any], bytes, dict[Projection, bytes] | None]]
+    ) -> None:
+        """Write a batch of (capsule, serialized event, projected events) to every handler."""
+        if self._sinks:
+            # Sinks sharing a projection share the batch.
+            batches: dict[Projection | None, list[bytes]] = {}
+            for sink in tuple(self._sinks):
+                if sink.level <= logging.INFO:
+                    projection = sink.projection
+                    batch = batches.get(projection)
+                    if batch is None:
+                        batch = batches[projection] = [
+                            data if projected is None else projected.get(projection, data)  # type:ignore[arg-type]
+                            for _, data, projected in events
+                        ]
+                    sink.handle_events(batch)
+        if self._logger.handlers:
+            # Regular logging handlers share a single record per event;
+            # its EventFormatter returns the serialized event as-is.
+            for capsule, data, _ in events:
+                record = self._logger.makeRecord(
+                    self._logger.name,
+                    logging.INFO,
+                    "",
+                    0,
+                    capsule,
+                    (),
+                    None,
+                    extra={SERIALIZED_EVENT_ATTRIBUTE: data.decode("utf-8")},
+                )
+                self._logger.handle(record)
+
+    def _get_writer(self) -> BackgroundWriter | None:
+        """Get the background writer, starting it if needed.
+
+        Returns None when events should be written synchronously.
+        """
+        if not self.background_writer or self._closed:
+            return None
+        if self._writer is None:
+            self._writer = BackgroundWriter(
+                self._write_serialized,
+                max_queue_size=self.writer_queue_size,
+                batch_size=self.writer_batch_size,
+                flush_interval=self.writer_flush_interval,
+                log=self.log,
+            )
+        return self._writer
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Write any queued events and flush all handlers.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            The longest time, in seconds, to wait for the background
+            writer to write the queued events.
+        """
+        if self._writer is not None:
+            self._writer.flush(timeout)
+        for handler in self.handlers or []:
+            handler.flush()
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write any queued events and stop the background writer.
+
+        Events emitted after the logger is closed are written synchronously.
+        Handlers are flushed but not closed, since they may be shared.
+        """
+        self._closed = True
+        if self._writer is not None:
+            self._writer.close(timeout)
+            self._writer = None
+        for handler in self.handlers or []:
+            handler.flush()
+
+    def _get_dispatch(self, schema_id: str) -> _Dispatch:
+        """Get (or build) the dispatch record of a schema."""
+        try:
+            return self._dispatch[schema_id]
+        except KeyError:
+            pass
+        excluded = self._wildcard_exclusions.get(schema_id, set())
+
+        def ordered(
+            registry: dict[str, dict[t.Callable[..., t.Any], int]],
+            wildcards: dict[t.Callable[..., t.Any], int],
+        ) -> tuple[t.Callable[..., t.Any], ...]:
+            callables = {
+                callback: order for callback, order in wildcards.items() if callback not in excluded
+            }
+            for callback, order in registry.get(schema_id, {}).items():
+                callables[callback] = min(order, callables.get(callback, order))
+            return tuple(sorted(callables, key=callables.__getitem__))
+
+        modified_listeners = ordered(self._modified_listeners, self._wildcard_modified_listeners)
+        unmodified_listeners = ordered(
+            self._unmodified_listeners, self._wildcard_unmodified_listeners
+        )
+        dispatch = self._dispatch[schema_id] = _Dispatch(
+            modifiers=ordered(self._modifiers, self._wildcard_modifiers),
+            modified_listeners=modified_listeners,
+            unmodified_listeners=unmodified_listeners,
+            has_listeners=bool(modified_listeners or unmodified_listeners),
+        )
+        return dispatch
+
+    def _add_callback(
+        self,
+        registry: dict[str, dict[t.Callable[..., t.Any], int]],
+        wildcards: dict[t.Callable[..., t.Any], int],
+        schema_id: str | None,
+        callback: t.Callable[..., t.Any],
+    ) -> None:
+        """Register a modifier or listener for a schema, or for all schemas."""
+        if schema_id:
+            # If the schema hasn't been added yet,
+            # start a placeholder registry.
+            registry.setdefault(schema_id, {}).setdefault(callback, next(self._registration_order))
+            self._wildcard_exclusions.get(schema_id, set()).discard(callback)
+        else:
+            wildcards.setdefault(callback, next(self._registration_order))
+            for excluded in self._wildcard_exclusions.values():
+                excluded.discard(callback)
+        self._dispatch.clear()
+
+    def _remove_callback(
+        self,
+        registry: dict[str, dict[t.Callable[..., t.Any], int]],
+        wildcards: dict[t.Callable[..., t.Any], int],
+        schema_id: str | None,
+        callback: t.Callable[..., t.Any],
+    ) -> None:
+        """Remove a modifier or listener from a schema, or from all schemas."""
+        if schema_id:
+            registry.get(schema_id, {}).pop(callback, None)
+            if callback in wildcards:
+                self._wildcard_exclusions.setdefault(schema_id, set()).add(callback)
+        else:
+            wildcards.pop(callback, None)
+            for callbacks in registry.values():
+                callbacks.pop(callback, None)
+        self._dispatch.clear()
+
     def add_modifier(
         self,
         *,
@@ -201,8 +797,14 @@ class EventLogger(LoggingConfigurable):
     ) -> None:
         """Add a modifier (callable) to a registered event.
 
+        Modifiers run in the order they were added.
+
         Parameters
         ----------
+        schema_id: str
+            If given, add this modifier only for a specific event type.
+            Otherwise, it applies to all events, including ones whose schema is
+            registered later.
         modifier: Callable
             A callable function/method that executes when the named event occurs.
             This method enforces a string signature for modifiers:
@@ -213,19 +815,7 @@ class EventLogger(LoggingConfigurable):
         if not callable(modifier):
             msg = "`modifier` must be a callable"  # type:ignore[unreachable]
             raise TypeError(msg)
-
-        # If the schema ID and version is given, only add
-        # this modifier to that schema
-        if schema_id:
-            # If the schema hasn't been added yet,
-            # start a placeholder set.
-            modifiers = self._modifiers.get(schema_id, set())
-            modifiers.add(modifier)
-            self._modifiers[schema_id] = modifiers
-            return
-        for id_ in self._modifiers:
-            if schema_id is None or id_ == schema_id:
-                self._modifiers[id_].add(modifier)
+        self._add_callback(self._modifiers, self._wildcard_modifiers, schema_id, modifier)
 
     def remove_modifier(
         self,
@@ -243,15 +833,7 @@ class EventLogger(LoggingConfigurable):
 
             The modifier to remove.
         """
-        # If schema_id is given remove the modifier from this schema.
-        if schema_id:
-            self._modifiers[schema_id].discard(modifier)
-        # If no schema_id is given, remove the modifier from all events.
-        else:
-            for schema_id in self.schemas.schema_ids:
-                # Remove the modifier if it is found in the list.
-                self._modifiers[schema_id].discard(modifier)
-                self._modifiers[schema_id].discard(modifier)
+        self._remove_callback(self._modifiers, self._wildcard_modifiers, schema_id, modifier)
 
     def add_listener(
         self,
@@ -268,34 +850,22 @@ class EventLogger(LoggingConfigurable):
             If True (default), listens to the data after it has been mutated/modified
             by the list of modifiers.
         schema_id: str
-            $id of the schema
+            $id of the schema. If not given, the listener applies to all events,
+            including ones whose schema is registered later.
         listener: Callable
             A callable function/method that executes when the named event occurs.
         """
         if not callable(listener):
             msg = "`listener` must be a callable"  # type:ignore[unreachable]
             raise TypeError(msg)
-
-        # If the schema ID and version is given, only add
-        # this modifier to that schema
-        if schema_id:
-            if modified:
-                # If the schema hasn't been added yet,
-                # start a placeholder set.
-                listeners = self._modified_listeners.get(schema_id, set())
-                listeners.add(listener)
-                self._modified_listeners[schema_id] = listeners
-                return
-            listeners = self._unmodified_listeners.get(schema_id, set())
-            listeners.add(listener)
-            self._unmodified_listeners[schema_id] = listeners
-            return
-        for id_ in self.schemas.schema_ids:
-            if schema_id is None or id_ == schema_id:
-                if modified:
-                    self._modified_listeners[id_].add(listener)
-                else:
-                    self._unmodified_listeners[id_].add(listener)
+        if modified:
+            self._add_callback(
+                self._modified_listeners, self._wildcard_modified_listeners, schema_id, listener
+            )
+        else:
+            self._add_callback(
+                self._unmodified_listeners, self._wildcard_unmodified_listeners, schema_id, listener
+            )
 
     def remove_listener(
         self,
@@ -313,43 +883,32 @@ class EventLogger(LoggingConfigurable):
         listener: Callable[[EventLogger, str, dict], dict]
             The modifier to remove.
         """
-        # If schema_id is given remove the listener from this schema.
-        if schema_id:
-            self._modified_listeners[schema_id].discard(listener)
-            self._unmodified_listeners[schema_id].discard(listener)
-        # If no schema_id is given, remove the listener from all events.
-        else:
-            for schema_id in self.schemas.schema_ids:
-                # Remove the listener if it is found in the list.
-                self._modified_listeners[schema_id].discard(listener)
-                self._unmodified_listeners[schema_id].discard(listener)
+        self._remove_callback(
+            self._modified_listeners, self._wildcard_modified_listeners, schema_id, listener
+        )
+        self._remove_callback(
+            self._unmodified_listeners, self._wildcard_unmodified_listeners, schema_id, listener
+        )
 
-    def emit(
-        self, *, schema_id: str, data: dict[str, t.Any], timestamp_override: datetime | None = None
-    ) -> dict[str, t.Any] | None:
-        """
-        Record given event with schema has occurred.
+        # Stop the listener's queue once nothing can feed it any more.
+        if listener in self._listener_queues and not any(
+            listener in dispatch.modified_listeners or listener in dispatch.unmodified_listeners
+            for dispatch in map(self._get_dispatch, self.schemas.schema_ids)
+        ):
+            self._listener_queues.pop(listener).close()
 
-        Parameters
-        ----------
-        schema_id: str
-            $id of the schema
-        data: dict
-            The event to record
-        timestamp_override: datetime, optional
-            Optionally override the event timestamp. By default it is set to the current timestamp.
+    def _get_emit_schema(
+        self, schema_id: str, schema_version: str | None
+    ) -> tuple[EventSchema, _Dispatch] | None:
+        """Get the schema and dispatch record for an event that is about to be emitted.
 
-        Returns
-        -------
-        dict
-            The recorded event data
+        Returns None if the event does not need to be emitted, either
+        because nothing would receive it or because its schema has not
+        been registered.
         """
+        dispatch = self._get_dispatch(schema_id)
         # If no handlers are routing these events, there's no need to proceed.
-        if (
-            not self.handlers
-            and not self._modified_listeners.get(schema_id)
-            and not self._unmodified_listeners.get(schema_id)
-        ):
+        if not self.handlers and not dispatch.has_listeners:
             return None
 
         # If the schema hasn't been registered, raise a warning to make sure
@@ -360,93 +919,230 @@ class EventLogger(LoggingConfigurable):
                 "this was not intentional, please register the schema using the "
                 "`register_event_schema` method.",
                 SchemaNotRegistered,
-                stacklevel=2,
+                # Point at the caller of emit/emit_many.
+                stacklevel=3,
             )
             return None
 
-        schema = self.schemas.get(schema_id)
+        return self.schemas.get(schema_id, schema_version), dispatch
 
-        # Deep copy the data and modify the copy.
-        modified_data = copy.deepcopy(data)
-        for modifier in self._modifiers[schema.id]:
-            modified_data = modifier(schema_id=schema_id, data=modified_data)
+    @staticmethod
+    def _format_timestamp(timestamp_override: datetime | None) -> str:
+        """Format the timestamp of an event, checking any override."""
+        if timestamp_override is None:
+            timestamp = datetime.now(tz=timezone.utc)
+        elif isinstance(timestamp_override, datetime):
+            timestamp = timestamp_override
+        else:
+            msg = f"timestamp_override must be a datetime, not {type(timestamp_override).__name__}."  # type:ignore[unreachable]
+            raise CoreMetadataError(msg)
+        return timestamp.isoformat() + "Z"
 
-        if self._unmodified_listeners[schema.id]:
-            # Process this event, i.e. validate and modify (in place)
-            self.schemas.validate_event(schema_id, data)
+    def _modify_and_validate(
+        self,
+        schema_id: str,
+        data: dict[str, t.Any],
+        dispatch: _Dispatch,
+        schema_version: str | None = None,
+    ) -> dict[str, t.Any]:
+        """Run the modifiers on an event and validate the result.
+
+        Returns the modified data.
+        """
+        modifiers = dispatch.modifiers
+        if modifiers:
+            # Modifiers work on a copy-on-write view of the data, so only
+            # the parts of the payload that they touch are copied and the
+            # original data is left untouched for unmodified listeners.
+            modified_data: dict[str, t.Any] = CopyOnWriteDict(data)
+            for modifier in modifiers:
+                modified_data = modifier(schema_id=schema_id, data=modified_data)
+            modified_data = unwrap(modified_data)
+        else:
+            # Nothing can change the data, so there is no need to copy it.
+            modified_data = data
 
-        # Validate the modified data.
-        self.schemas.validate_event(schema_id, modified_data)
+        if self._get_validation_policy(schema_id).should_validate():
+            validate_event = self.schemas.validate_event
+            if schema_version is not None:
+                validate_event = functools.partial(validate_event, version=schema_version)
 
-        # Generate the empty event capsule.
-        timestamp = (
-            datetime.now(tz=timezone.utc) if timestamp_override is None else timestamp_override
-        )
-        capsule = {
-            "__timestamp__": timestamp.isoformat() + "Z",
-            "__schema__": schema_id,
-            "__schema_version__": schema.version,
-            "__metadata_version__": EVENTS_METADATA_VERSION,
-        }
+            # Without modifiers, the raw and modified data are the
+            # same, so the raw data only needs validating separately
+            # when modifiers ran and unmodified listeners will see it.
+            if modifiers and dispatch.unmodified_listeners:
+                validate_event(schema_id, data)
+
+            # Validate the modified data.
+            validate_event(schema_id, modified_data)
+        return modified_data
+
+    def _listener_task_done(self, schema_id: str, task: asyncio.Task[t.Any]) -> None:
+        """Remove a finished listener task from the active listeners.
+
+        If the listener raised an exception, log it to the main
+        application's logger.
+        """
+        self._active_listeners.discard(task)
         try:
-            JUPYTER_EVENTS_CORE_VALIDATOR.validate(capsule)
-        except ValidationError as err:
-            raise CoreMetadataError from err
+            err = task.exception()
+        except asyncio.CancelledError:
+            return
+        if err:
+            self.log.error(
+                "Event listener %s failed for %s: %s",
+                task.get_name(),
+                schema_id,
+                err,
+                exc_info=err,
+            )
 
-        capsule.update(modified_data)
+    def _get_listener_queue(self, listener: t.Callable[..., t.Any]) -> ListenerQueue:
+        """Get (or create) the queue feeding a listener."""
+        try:
+            return self._listener_queues[listener]
+        except KeyError:
+            listener_queue = self._listener_queues[listener] = ListenerQueue(
+                listener,
+                self,
+                maxsize=self.listener_queue_size,
+                overflow=self.listener_overflow,
+                log=self.log,
+            )
+            return listener_queue
 
-        self._logger.info(capsule)
+    def _schedule_listeners(
+        self,
+        schema_id: str,
+        dispatch: _Dispatch,
+        modified_data: dict[str, t.Any],
+        data: dict[str, t.Any],
+    ) -> None:
+        """Hand an event to its listeners, as tasks or through their queues."""
+        if self.listener_dispatch == "queue":
+            for listener in dispatch.modified_listeners:
+                self._get_listener_queue(listener).put(schema_id, modified_data)
+            for listener in dispatch.unmodified_listeners:
+                self._get_listener_queue(listener).put(schema_id, data)
+            return
 
-        # callback for removing from finished listeners
-        # from active listeners set.
-        def _listener_task_done(task: asyncio.Task[t.Any]) -> None:
-            # If an exception happens, log it to the main
-            # applications logger
-            try:
-                err = task.exception()
-            except asyncio.CancelledError:
-                self._active_listeners.discard(task)
-                return
-            if err:
-                self.log.error(
-                    "Event listener %s failed for %s: %s",
-                    task.get_name(),
-                    schema_id,
-                    err,
-                    exc_info=err,
-                )
-            self._active_listeners.discard(task)
-
-        # Loop over listeners and execute them.
-        for listener in self._modified_listeners[schema_id]:
-            # Schedule this listener as a task and add
-            # it to the list of active listeners
-            task = asyncio.create_task(
-                listener(
-                    logger=self,
-                    schema_id=schema_id,
-                    data=modified_data,
+        done_callback = functools.partial(self._listener_task_done, schema_id)
+        for listeners, listener_data in (
+            (dispatch.modified_listeners, modified_data),
+            (dispatch.unmodified_listeners, data),
+        ):
+            for listener in listeners:
+                # Schedule this listener as a task and add
+                # it to the list of active listeners
+                task = asyncio.create_task(
+                    listener(logger=self, schema_id=schema_id, data=listener_data)
                 )
-            )
-            self._active_listeners.add(task)
+                self._active_listeners.add(task)
+                # Cleans the task up once it's finished.
+                task.add_done_callback(done_callback)
 
-            # Adds the task and cleans it up later if needed.
-            task.add_done_callback(_listener_task_done)
+    def emit(
+        self,
+        *,
+        schema_id: str,
+        data: dict[str, t.Any],
+        timestamp_override: datetime | None = None,
+        schema_version: str | None = None,
+    ) -> dict[str, t.Any] | None:
+        """
+        Record given event with schema has occurred.
 
-        for listener in self._unmodified_listeners[schema_id]:
-            task = asyncio.create_task(listener(logger=self, schema_id=schema_id, data=data))
-            self._active_listeners.add(task)
+        Parameters
+        ----------
+        schema_id: str
+            $id of the schema
+        data: dict
+            The event to record
+        timestamp_override: datetime, optional
+            Optionally override the event timestamp. By default it is set to the current timestamp.
+        schema_version: str, optional
+            The version of the schema the event follows, if several versions
+            are registered. Defaults to the latest version.
 
-            # Remove task from active listeners once its finished.
-            def _listener_task_done(task: asyncio.Task[t.Any]) -> None:
-                # If an exception happens, log it to the main
-                # applications logger
-                err = task.exception()
-                if err:
-                    self.log.error(err)
-                self._active_listeners.discard(task)
+        Returns
+        -------
+        dict
+            The recorded event data
+        """
+        emit_schema = self._get_emit_schema(schema_id, schema_version)
+        if emit_schema is None:
+            return None
+        schema, dispatch = emit_schema
 
-            # Adds the task and cleans it up later if needed.
-            task.add_done_callback(_listener_task_done)
+        modified_data = self._modify_and_validate(schema_id, data, dispatch, schema_version)
+
+        # Fill in the event capsule. Everything but the timestamp is
+        # constant for a schema and was validated when the template was built.
+        capsule = self._get_capsule_template(schema).copy()
+        capsule["__timestamp__"] = self._format_timestamp(timestamp_override)
+        capsule.update(modified_data)
 
+        if self.handlers:
+            self._write_events((capsule,), schema)
+
+        self._schedule_listeners(schema_id, dispatch, modified_data, data)
         return capsule
+
+    def emit_many(
+        self,
+        *,
+        schema_id: str,
+        data: t.Iterable[dict[str, t.Any]],
+        timestamp_override: datetime | None = None,
+        schema_version: str | None = None,
+    ) -> list[dict[str, t.Any]]:
+        """
+        Record a batch of events with the same schema.
+
+        This is equivalent to calling `emit` for each event, but the schema
+        and its modifiers are looked up once and the whole batch is written
+        to each handler in a single call. Every event is modified and
+        validated before any of them is written, so if one event fails
+        validation, none of the events are recorded.
+
+        Parameters
+        ----------
+        schema_id: str
+            $id of the schema
+        data: iterable of dict
+            The events to record
+        timestamp_override: datetime, optional
+            Optionally override the events' timestamp. By default it is set
+            to the current timestamp, once for the whole batch.
+        schema_version: str, optional
+            The version of the schema the events follow, if several versions
+            are registered. Defaults to the latest version.
+
+        Returns
+        -------
+        list of dict
+            The recorded events
+        """
+        emit_schema = self._get_emit_schema(schema_id, schema_version)
+        if emit_schema is None:
+            return []
+        schema, dispatch = emit_schema
+
+        template = self._get_capsule_template(schema)
+        timestamp = self._format_timestamp(timestamp_override)
+        events = []
+        capsules = []
+        for item in data:
+            modified_data = self._modify_and_validate(schema_id, item, dispatch, schema_version)
+            capsule = template.copy()
+            capsule["__timestamp__"] = timestamp
+            capsule.update(modified_data)
+            events.append((modified_data, item))
+            capsules.append(capsule)
+
+        if self.handlers and capsules:
+            self._write_events(capsules, schema)
+
+        for modified_data, item in events:
+            self._schedule_listeners(schema_id, dispatch, modified_data, item)
+        return capsules
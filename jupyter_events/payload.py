@@ -0,0 +1,286 @@
+"""Copy-on-write containers for event payloads.
+
+Modifiers receive a payload that they are allowed to mutate, but the
+caller's original data (which is also handed to unmodified listeners)
+must not change. Instead of deep copying the whole payload up front,
+the payload is wrapped in a `CopyOnWriteDict`: a shallow copy whose nested
+dicts and lists are themselves shallow copied, lazily, the first time they
+are accessed. Subtrees a modifier never touches are never copied.
+"""
+from __future__ import annotations
+
+import copy
+import typing as t
+
+# Values of these types are immutable and never need copying.
+_IMMUTABLE = (str, int, float, bool, type(None))
+
+
+def _own(value: t.Any) -> t.Any:
+    """Return a private version of `value` that is safe to mutate."""
+    cls = type(value)
+    if cls is dict:
+        return CopyOnWriteDict(value)
+    if cls is list:
+        return CopyOnWriteList(value)
+    if isinstance(value, _IMMUTABLE):
+        return value
+    return copy.deepcopy(value)
+
+
+def unwrap(value: t.Any) -> t.Any:
+    """Convert copy-on-write containers back into plain dicts and lists.
+
+    Only the subtrees that were accessed are visited, so this is cheap
+    when modifiers only touched a small part of the payload. Plain dicts
+    and lists (e.g. a new dict built by a modifier) are searched for
+    copy-on-write containers, and copied if they hold any.
+    """
+    if isinstance(value, (CopyOnWriteDict, CopyOnWriteList)):
+        return value.unwrap()
+    cls = type(value)
+    if cls is dict:
+        plain: dict[t.Any, t.Any] | None = None
+        for key, item in value.items():
+            new = unwrap(item)
+            if new is not item:
+                if plain is None:
+                    plain = dict(value)
+                plain[key] = new
+        return value if plain is None else plain
+    if cls is list:
+        items = [unwrap(item) for item in value]
+        if any(new is not item for new, item in zip(items, value)):
+            return items
+    return value
+
+
+class CopyOnWriteDict(dict):  # type:ignore[type-arg]
+    """A shallow copy of a dict that copies nested values on first access."""
+
+    __slots__ = ("_owned",)
+
+    def __init__(self, source: t.Any = (), **kwargs: t.Any) -> None:
+        """Initialize the dict from a source mapping."""
+        super().__init__(source, **kwargs)
+        # Keys whose values are private to this dict (copied or assigned).
+        self._owned: set[t.Any] = set()
+
+    def _own(self, key: t.Any) -> t.Any:
+        value = dict.__getitem__(self, key)
+        if key in self._owned:
+            return value
+        self._owned.add(key)
+        if isinstance(value, _IMMUTABLE):
+            return value
+        value = _own(value)
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _own_all(self) -> None:
+        for key in list(dict.keys(self)):
+            self._own(key)
+
+    def __getitem__(self, key: t.Any) -> t.Any:
+        """Get a value, copying it first if needed."""
+        return self._own(key)
+
+    # Overriding __iter__ and keys keeps CPython from merging this dict
+    # into another (in `dict(data)`, `{**data}` or `dict.update`) by
+    # copying its storage directly: it has to go through __getitem__,
+    # which copies the nested values.
+    def __iter__(self) -> t.Iterator[t.Any]:
+        """Iterate over the keys."""
+        return dict.__iter__(self)
+
+    def keys(self) -> t.Any:
+        """A view of the keys."""
+        return dict.keys(self)
+
+    def __setitem__(self, key: t.Any, value: t.Any) -> None:
+        """Set a value."""
+        dict.__setitem__(self, key, value)
+        self._owned.add(key)
+
+    def __delitem__(self, key: t.Any) -> None:
+        """Delete a value."""
+        dict.__delitem__(self, key)
+        self._owned.discard(key)
+
+    def __or__(self, other: t.Any) -> CopyOnWriteDict:
+        """Merge with another mapping."""
+        new = self.copy()
+        new.update(other)
+        return new
+
+    def __ior__(self, other: t.Any) -> CopyOnWriteDict:  # noqa: PYI034
+        """Update from another mapping in place."""
+        self.update(other)
+        return self
+
+    def get(self, key: t.Any, default: t.Any = None) -> t.Any:
+        """Get a value, copying it first if needed."""
+        if key in self:
+            return self._own(key)
+        return default
+
+    def setdefault(self, key: t.Any, default: t.Any = None) -> t.Any:
+        """Get a value, setting it to `default` if missing."""
+        if key in self:
+            return self._own(key)
+        self[key] = default
+        return default
+
+    def pop(self, key: t.Any, *args: t.Any) -> t.Any:
+        """Remove a key and return its value."""
+        if key in self:
+            value = self._own(key)
+            del self[key]
+            return value
+        return dict.pop(self, key, *args)
+
+    def popitem(self) -> tuple[t.Any, t.Any]:
+        """Remove and return the last inserted item."""
+        key = next(reversed(dict.keys(self)))
+        return key, self.pop(key)
+
+    def update(self, *args: t.Any, **kwargs: t.Any) -> None:
+        """Update from a mapping or iterable of pairs."""
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        """Remove all items."""
+        dict.clear(self)
+        self._owned.clear()
+
+    def values(self) -> t.Any:
+        """A view of the values, all of which are copied first."""
+        self._own_all()
+        return dict.values(self)
+
+    def items(self) -> t.Any:
+        """A view of the items, all of which are copied first."""
+        self._own_all()
+        return dict.items(self)
+
+    def copy(self) -> CopyOnWriteDict:
+        """A shallow copy that also copies nested values on access."""
+        return CopyOnWriteDict(dict.items(self))
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        """Support pickling and copying."""
+        return (self.__class__, (self.unwrap(),))
+
+    def unwrap(self) -> dict[t.Any, t.Any]:
+        """Return a plain dict with the same contents."""
+        # Built from the items view of the storage, without going
+        # through the overridden accessors.
+        plain = dict(dict.items(self))
+        for key in self._owned:
+            if key in plain:
+                plain[key] = unwrap(plain[key])
+        return plain
+
+
+class CopyOnWriteList(list):  # type:ignore[type-arg]
+    """A shallow copy of a list that copies nested values on first access."""
+
+    __slots__ = ("_owned",)
+
+    def __init__(self, source: t.Iterable[t.Any] = ()) -> None:
+        """Initialize the list from a source iterable."""
+        super().__init__(source)
+        # Identities of the values that are private to this list.
+        self._owned: set[int] = set()
+
+    def _own(self, index: int) -> t.Any:
+        value = list.__getitem__(self, index)
+        if isinstance(value, _IMMUTABLE) or id(value) in self._owned:
+            return value
+        value = _own(value)
+        list.__setitem__(self, index, value)
+        self._owned.add(id(value))
+        return value
+
+    def _own_all(self) -> None:
+        for index in range(len(self)):
+            self._own(index)
+
+    def __getitem__(self, index: t.Any) -> t.Any:
+        """Get a value or slice, copying values first if needed."""
+        if isinstance(index, slice):
+            for i in range(*index.indices(len(self))):
+                self._own(i)
+            return list.__getitem__(self, index)
+        return self._own(index)
+
+    def __setitem__(self, index: t.Any, value: t.Any) -> None:
+        """Set a value or slice."""
+        if isinstance(index, slice):
+            value = list(value)
+            self._owned.update(id(v) for v in value)
+        else:
+            self._owned.add(id(value))
+        list.__setitem__(self, index, value)
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        """Iterate over the values, copying each one first if needed."""
+        for index in range(len(self)):
+            yield self._own(index)
+
+    def __reversed__(self) -> t.Iterator[t.Any]:
+        """Iterate over the values in reverse order."""
+        for index in range(len(self) - 1, -1, -1):
+            yield self._own(index)
+
+    def __add__(self, other: t.Any) -> list[t.Any]:
+        """Concatenate with another list."""
+        self._own_all()
+        return list.__add__(self, other)
+
+    def __iadd__(self, other: t.Any) -> CopyOnWriteList:  # noqa: PYI034
+        """Extend the list in place."""
+        self.extend(other)
+        return self
+
+    def __mul__(self, n: t.Any) -> list[t.Any]:
+        """Repeat the list."""
+        self._own_all()
+        return list.__mul__(self, n)
+
+    def append(self, value: t.Any) -> None:
+        """Append a value."""
+        self._owned.add(id(value))
+        list.append(self, value)
+
+    def insert(self, index: t.Any, value: t.Any) -> None:
+        """Insert a value."""
+        self._owned.add(id(value))
+        list.insert(self, index, value)
+
+    def extend(self, values: t.Iterable[t.Any]) -> None:
+        """Extend the list with values."""
+        values = list(values)
+        self._owned.update(id(v) for v in values)
+        list.extend(self, values)
+
+    def pop(self, index: t.Any = -1) -> t.Any:
+        """Remove and return a value."""
+        value = self._own(index)
+        list.pop(self, index)
+        return value
+
+    def copy(self) -> list[t.Any]:
+        """A shallow copy of the list."""
+        self._own_all()
+        return list.copy(self)
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        """Support pickling and copying."""
+        return (self.__class__, (self.unwrap(),))
+
+    def unwrap(self) -> list[t.Any]:
+        """Return a plain list with the same contents."""
+        owned = self._owned
+        return [unwrap(value) if id(value) in owned else value for value in list.__iter__(self)]
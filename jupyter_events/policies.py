@@ -0,0 +1,81 @@
+"""Validation policies for event schemas."""
+from __future__ import annotations
+
+import math
+import random
+
+
+class ValidationPolicy:
+    """Decide whether an event should be validated against its schema.
+
+    Policies are usually given as strings in an EventLogger's
+    `validation_policies` configuration:
+
+    - ``"always"``: validate every event (default).
+    - ``"first:N"``: validate only the first N events.
+    - ``"sampled:RATE"``: validate a random fraction RATE (0 to 1) of events.
+    - ``"trusted"``: never validate; the producer is trusted to emit valid data.
+
+    Each policy keeps a count of the events that were validated
+    and that skipped validation.
+    """
+
+    KINDS = ("always", "first", "sampled", "trusted")
+
+    def __init__(self, kind: str = "always", value: float | None = None) -> None:
+        """Initialize the policy."""
+        if kind not in self.KINDS:
+            msg = f"Unknown validation policy {kind!r}; expected one of {', '.join(self.KINDS)}."
+            raise ValueError(msg)
+        if kind == "first":
+            if value is None or not math.isfinite(value) or value < 0 or int(value) != value:
+                msg = "The 'first' validation policy requires a non-negative integer count."
+                raise ValueError(msg)
+            value = int(value)
+        elif kind == "sampled":
+            if value is None or not 0 <= value <= 1:
+                msg = "The 'sampled' validation policy requires a rate between 0 and 1."
+                raise ValueError(msg)
+        elif value is not None:
+            msg = f"The {kind!r} validation policy does not take a value."
+            raise ValueError(msg)
+        self.kind = kind
+        self.value = value
+        self.validated = 0
+        self.skipped = 0
+        self._random = random.Random()
+
+    @classmethod
+    def from_string(cls, spec: str) -> ValidationPolicy:
+        """Build a policy from its string form, e.g. ``"first:100"``."""
+        kind, _, value = spec.strip().partition(":")
+        if not value:
+            return cls(kind)
+        try:
+            return cls(kind, float(value))
+        except ValueError:
+            msg = f"Invalid validation policy {spec!r}."
+            raise ValueError(msg) from None
+
+    def __repr__(self) -> str:
+        """The str repr of the policy."""
+        if self.value is None:
+            return self.kind
+        return f"{self.kind}:{self.value}"
+
+    def should_validate(self) -> bool:
+        """Return True if the next event should be validated and update the counters."""
+        kind = self.kind
+        if kind == "always":
+            validate = True
+        elif kind == "trusted":
+            validate = False
+        elif kind == "first":
+            validate = self.validated < self.value  # type:ignore[operator]
+        else:
+            validate = self._random.random() < self.value  # type:ignore[operator]
+        if validate:
+            self.validated += 1
+        else:
+            self.skipped += 1
+        return validate
@@ -0,0 +1,202 @@
+"""Projections that select the fields of an event written to a sink.
+
+A `Projection` describes the fields a sink should receive: an allowlist,
+a list of fields to drop, and whether fields that the event's schema does
+not declare are dropped. Fields are named by dotted paths, e.g.
+``"user.name"``; a path through an array applies to each of its items, so
+``"users.name"`` names the ``name`` of every object in ``users``. The event metadata fields (``__timestamp__``,
+``__schema__``, ...) are always kept unless they are explicitly excluded.
+
+A projection is compiled once for each schema into a function that builds
+the projected event, so writing an event does not look up its schema.
+"""
+from __future__ import annotations
+
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .schema import EventSchema
+
+ProjectFunction = t.Callable[[dict[str, t.Any]], dict[str, t.Any]]
+
+# The metadata fields of an event capsule, in the order they are emitted.
+METADATA_FIELDS = (
+    "__timestamp__",
+    "__schema__",
+    "__schema_version__",
+    "__metadata_version__",
+    "__schema_fingerprint__",
+)
+
+
+class _Node:
+    """The fields kept from one (possibly nested) object of an event.
+
+    `keys` lists the fields to keep, or is None to keep every field but
+    those in `drop`. `children` holds the nodes of nested objects that
+    are themselves projected. A node projects each item of an array.
+    """
+
+    def __init__(self) -> None:
+        self.keys: dict[str, None] | None = None
+        self.drop: set[str] = set()
+        self.children: dict[str, _Node] = {}
+
+    def child(self, key: str) -> _Node:
+        try:
+            return self.children[key]
+        except KeyError:
+            node = self.children[key] = _Node()
+            return node
+
+    def build(self) -> t.Callable[[t.Any], t.Any] | None:
+        """Build the function projecting an object, or None if it keeps everything."""
+        children = tuple(
+            (key, function)
+            for key, child in self.children.items()
+            if key not in self.drop and (function := child.build()) is not None
+        )
+        if self.keys is None and not self.drop and not children:
+            return None
+        keys = (
+            None if self.keys is None else tuple(key for key in self.keys if key not in self.drop)
+        )
+        drop = frozenset(self.drop)
+
+        def project(value: t.Any) -> t.Any:
+            if isinstance(value, list):
+                return [project(item) for item in value]
+            if not isinstance(value, dict):
+                return value
+            if keys is None:
+                result = {key: item for key, item in value.items() if key not in drop}
+            else:
+                result = {key: value[key] for key in keys if key in value}
+            for key, function in children:
+                if key in result:
+                    result[key] = function(result[key])
+            return result
+
+        return project
+
+
+def _declared_properties(schema: t.Any) -> dict[str, t.Any] | None:
+    """The properties declared for an object, or for the items of (nested) arrays."""
+    while isinstance(schema, dict):
+        if isinstance(schema.get("properties"), dict):
+            return t.cast(dict[str, t.Any], schema["properties"])
+        schema = schema.get("items")
+    return None
+
+
+def _declared(node: _Node, properties: dict[str, t.Any]) -> None:
+    """Restrict a node, and its nested objects, to the properties a schema declares."""
+    node.keys = dict.fromkeys(properties)
+    for key, subschema in properties.items():
+        subproperties = _declared_properties(subschema)
+        if subproperties is not None:
+            _declared(node.child(key), subproperties)
+
+
+def _restrict(node: _Node, tree: dict[str, t.Any]) -> None:
+    """Restrict a node, and its nested objects, to the fields of an include tree."""
+    keys = dict.fromkeys(tree)
+    node.keys = keys if node.keys is None else {key: None for key in node.keys if key in keys}
+    for key, subtree in tree.items():
+        if subtree is not None:
+            _restrict(node.child(key), subtree)
+
+
+def _include_tree(paths: t.Iterable[str]) -> dict[str, t.Any]:
+    """Turn dotted paths into a tree of dicts; None marks a field kept whole."""
+    tree: dict[str, t.Any] = {}
+    for path in paths:
+        *parents, last = path.split(".")
+        node = tree
+        for part in parents:
+            subtree = node.setdefault(part, {})
+            if subtree is None:
+                # A parent is already kept whole.
+                break
+            node = subtree
+        else:
+            node[last] = None
+    return tree
+
+
+class Projection:
+    """The fields of an event that are written to a sink.
+
+    Projections are compared by value, so sinks with equal projections
+    share the serialized events.
+
+    Parameters
+    ----------
+    include: iterable of str, optional
+        The fields to keep, as dotted paths. A path keeps its whole value,
+        e.g. ``"user"`` keeps every field of ``user``. By default, every
+        field is kept.
+    exclude: iterable of str
+        The fields to drop, as dotted paths.
+    declared_only: bool
+        Drop the fields, including nested ones and those of objects in
+        arrays, that the event's schema does not declare in its
+        `properties`. Nested objects whose schema does not list
+        `properties` (e.g. a ``$ref``) are kept whole.
+    """
+
+    def __init__(
+        self,
+        include: t.Iterable[str] | None = None,
+        exclude: t.Iterable[str] = (),
+        declared_only: bool = False,
+    ) -> None:
+        """Initialize the projection."""
+        self.include = None if include is None else tuple(include)
+        self.exclude = tuple(exclude)
+        self.declared_only = declared_only
+        for path in (*(self.include or ()), *self.exclude):
+            if not path or "" in path.split("."):
+                msg = f"Invalid field path {path!r} in projection."
+                raise ValueError(msg)
+
+    def _key(self) -> tuple[t.Any, ...]:
+        return (self.include, self.exclude, self.declared_only)
+
+    def __eq__(self, other: object) -> bool:
+        """Whether two projections select the same fields."""
+        if not isinstance(other, Projection):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        """Hash the projection by value."""
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        """The str repr of the projection."""
+        return (
+            f"Projection(include={self.include!r}, exclude={self.exclude!r}, "
+            f"declared_only={self.declared_only!r})"
+        )
+
+    def compile(self, schema: EventSchema) -> ProjectFunction | None:
+        """Compile the projection for the events of a schema.
+
+        Returns a function building the projected event from an event
+        capsule, or None if the projection keeps the whole event.
+        """
+        root = _Node()
+        if self.declared_only:
+            _declared(root, schema.properties)
+        if self.include is not None:
+            _restrict(root, _include_tree(self.include))
+        if root.keys is not None:
+            root.keys = {**dict.fromkeys(METADATA_FIELDS), **root.keys}
+        for path in self.exclude:
+            *parents, last = path.split(".")
+            node = root
+            for part in parents:
+                node = node.child(part)
+            node.drop.add(last)
+        return root.build()
@@ -4,11 +4,15 @@ from __future__ import annotations
 import io
 import json
 import logging
+import tempfile
+import time
+from collections.abc import Iterator
 from typing import Any, Callable
 
 import pytest
 
 from jupyter_events import EventLogger
+from jupyter_events.funnel import FunnelServer
 
 
 @pytest.fixture
@@ -61,3 +65,43 @@ def jp_event_logger(jp_event_handler: logging.Handler, jp_event_schemas: list[An
         logger.register_event_schema(schema)
     logger.register_handler(handler=jp_event_handler)
     return logger
+
+
+@pytest.fixture
+def jp_event_funnel() -> Iterator[FunnelServer]:
+    """A funnel server, running in a thread, that collects the events sent to it.
+
+    Point loggers at it with ``EventLogger(funnel_path=str(jp_event_funnel.path))``;
+    `jp_read_funnel_events` returns the events it received.
+    """
+    # Unix socket paths are limited to about 100 characters, so the
+    # socket is not placed in pytest's (long) temporary directory.
+    with tempfile.TemporaryDirectory() as directory:
+        server = FunnelServer(f"{directory}/funnel.sock", [logging.StreamHandler(io.StringIO())])
+        server.start()
+        yield server
+        server.close()
+
+
+@pytest.fixture
+def jp_read_funnel_events(jp_event_funnel: FunnelServer) -> Callable[..., list[Any]]:
+    """Reads the events received by the funnel server since the last call.
+
+    Events that producers are still sending may not have been received yet;
+    pass `count` to wait (up to `timeout` seconds) for that many events.
+    """
+    (handler,) = jp_event_funnel.handlers
+    stream: io.StringIO = handler.stream  # type:ignore[attr-defined]
+    read = 0
+
+    def _read(count: int = 0, timeout: float = 10) -> list[Any]:
+        nonlocal read
+        deadline = time.monotonic() + timeout
+        while jp_event_funnel.events_written - read < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        lines = stream.getvalue().splitlines()
+        events = [json.loads(line) for line in lines[read:]]
+        read = len(lines)
+        return events
+
+    return _read
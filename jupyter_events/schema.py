@@ -1,21 +1,25 @@
 """Event schema objects."""
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
+import threading
+import weakref
 from pathlib import Path, PurePath
-from typing import Any, Union
+from typing import TYPE_CHECKING, Any, Union
 
-from jsonschema import FormatChecker, validators
-from referencing import Registry
-from referencing.jsonschema import DRAFT7
+from .validators import validate_schema
 
-try:
+if TYPE_CHECKING:
+    from types import CodeType
+
+    from jsonschema import FormatChecker
     from jsonschema.protocols import Validator
-except ImportError:
-    Validator = Any  # type:ignore[assignment, misc]
+    from referencing import Registry, Resource
 
-from . import yaml
-from .validators import draft7_format_checker, validate_schema
+    from .cache import SchemaCache
+    from .compiler import CompiledValidator
 
 
 class EventSchemaUnrecognized(Exception):
@@ -32,6 +36,43 @@ class EventSchemaFileAbsent(Exception):
 
 SchemaType = Union[dict[str, Any], str, PurePath]
 
+# EventSchemas shared across registries (see EventSchema.shared), keyed by a
+# hash of their source. Entries disappear once no registry uses them.
+_shared_schemas: weakref.WeakValueDictionary[str, EventSchema] = weakref.WeakValueDictionary()
+_shared_schemas_lock = threading.Lock()
+
+
+def _content_key(schema: SchemaType) -> str | None:
+    """Hash the content of a schema source, or return None if it can't be hashed."""
+    if isinstance(schema, dict):
+        try:
+            text = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+        content = b"dict:" + text.encode()
+    elif isinstance(schema, PurePath):
+        try:
+            content = b"text:" + Path(schema).read_bytes()
+        except OSError:
+            return None
+    elif isinstance(schema, str):
+        content = b"text:" + schema.encode()
+    else:
+        return None  # type:ignore[unreachable]
+    return hashlib.sha256(content).hexdigest()
+
+
+def _has_external_refs(schema: Any) -> bool:
+    """Whether a schema has `$ref`s to other documents."""
+    if isinstance(schema, dict):
+        ref = schema.get("$ref")
+        if isinstance(ref, str) and not ref.startswith("#"):
+            return True
+        return any(_has_external_refs(value) for value in schema.values())
+    if isinstance(schema, list):
+        return any(_has_external_refs(item) for item in schema)
+    return False
+
 
 class EventSchema:
     """A validated schema that can be used.
@@ -49,35 +90,176 @@ class EventSchema:
         of this event schema. The schema itself will be validated
         against Jupyter Event's metaschema to ensure that
         any schema registered here follows the expected form
-        of Jupyter Events.
+        of Jupyter Events. Defaults to the Draft 7 validator.
+
+    format_checker: jsonschema.FormatChecker
+        The format checker used by the validator. Defaults to the
+        Draft 7 format checker.
 
     registry:
-        Registry for nested JSON schema references.
+        Registry for nested JSON schema references. References to other
+        documents (e.g. definitions shared by several schemas, see
+        `SchemaRegistry.register_definitions`) are resolved with it, and
+        inlined into the compiled validator.
+
+    compiled: bool
+        If True (default), translate the schema into a specialized
+        validation function (see `jupyter_events.compiler`) that is
+        tried before the full validator. Schemas that cannot be
+        compiled always use the full validator. Only applies when
+        `validator_class` is the default Draft 7 validator.
+
+    cache: SchemaCache, optional
+        If given and `schema` is a path, the validated schema is read from
+        (and stored in) this on-disk cache, skipping YAML parsing and
+        meta-schema validation when the file has not changed.
     """
 
     def __init__(
         self,
         schema: SchemaType,
-        validator_class: type[Validator] = validators.Draft7Validator,  # type:ignore[assignment]
-        format_checker: FormatChecker = draft7_format_checker,
+        validator_class: type[Validator] | None = None,
+        format_checker: FormatChecker | None = None,
         registry: Registry[Any] | None = None,
+        compiled: bool = True,
+        cache: SchemaCache | None = None,
     ):
         """Initialize an event schema."""
-        _schema = self._load_schema(schema)
-        # Validate the schema against Jupyter Events metaschema.
-        validate_schema(_schema)
+        if cache is not None and isinstance(schema, PurePath):
+            if not Path(schema).exists():
+                msg = f'Schema file not present at path "{schema}".'
+                raise EventSchemaFileAbsent(msg)
+            _schema = cache.get(schema, self._load_and_validate)
+        else:
+            _schema = self._load_schema(schema)
+            # Validate the schema against Jupyter Events metaschema.
+            validate_schema(_schema)
+        self._setup(_schema, validator_class, format_checker, registry, compiled)
 
-        if registry is None:
-            registry = DRAFT7.create_resource(_schema) @ Registry()
+    def _setup(
+        self,
+        _schema: dict[str, Any],
+        validator_class: type[Validator] | None,
+        format_checker: FormatChecker | None,
+        registry: Registry[Any] | None,
+        compiled: bool,
+        compiled_code: CodeType | None = None,
+    ) -> None:
+        """Build the validators of a loaded and validated schema.
+
+        If given, `compiled_code` is used as the compiled validator
+        instead of compiling the schema again.
+        """
+        # jsonschema is slow to import, so it is only imported once
+        # a schema is created.
+        from jsonschema import Draft7Validator
+        from referencing import Registry
+        from referencing.jsonschema import DRAFT7
+
+        from .compiler import CompiledValidator, SchemaCompilationError
+        from .validators import _get
+
+        if validator_class is None:
+            validator_class = Draft7Validator
+        if format_checker is None:
+            format_checker = _get("draft7_format_checker")
+
+        self._has_external_refs = _has_external_refs(_schema)
+        if not self._has_external_refs:
+            # The registry is only needed to resolve references to other
+            # documents. Not keeping it stops a shared schema from keeping
+            # alive the SchemaRegistry (and the schemas) it retrieves from.
+            registry = None
+        self._resource: Resource[Any] = DRAFT7.create_resource(_schema)
+        registry = self._resource @ (registry if registry is not None else Registry())
 
         # Create a validator for this schema
-        self._validator = validator_class(_schema, registry=registry, format_checker=format_checker)  # type: ignore[call-arg]
+        self._validator = validator_class(_schema, registry=registry, format_checker=format_checker)
         self._schema = _schema
+        self._fingerprint: str | None = None
+
+        self._compiled: CompiledValidator | None = None
+        if compiled_code is not None:
+            self._compiled = CompiledValidator(compiled_code, format_checker)
+        elif compiled and validator_class is Draft7Validator:
+            try:
+                self._compiled = CompiledValidator.from_schema(_schema, format_checker, registry)
+            except SchemaCompilationError:
+                pass
+
+    @classmethod
+    def _restore(
+        cls,
+        schema: dict[str, Any],
+        fingerprint: str,
+        compiled_code: CodeType | None,
+        registry: Registry[Any] | None = None,
+    ) -> EventSchema:
+        """Rebuild a schema saved by `SchemaRegistry.snapshot`.
+
+        The schema was validated before it was saved, so it is not
+        validated against the meta-schema or compiled again.
+        """
+        event_schema = cls.__new__(cls)
+        event_schema._setup(
+            schema, None, None, registry, compiled=False, compiled_code=compiled_code
+        )
+        event_schema._fingerprint = fingerprint
+        return event_schema
+
+    @classmethod
+    def shared(
+        cls,
+        schema: SchemaType,
+        cache: SchemaCache | None = None,
+        registry: Registry[Any] | None = None,
+    ) -> EventSchema:
+        """Get an EventSchema with the default validator, shared across the process.
+
+        Schemas are shared by content: registering the same schema (the same
+        dict, string or file content) with several registries parses,
+        validates and compiles it only once. Shared schemas are held weakly,
+        so they are freed once no registry uses them.
+
+        Schemas with `$ref`s to other documents depend on what `registry`
+        resolves them to, so they are never shared.
+        """
+        key = _content_key(schema)
+        if key is None:
+            return cls(schema, cache=cache, registry=registry)
+        with _shared_schemas_lock:
+            existing = _shared_schemas.get(key)
+        if existing is not None:
+            return existing
+        if isinstance(schema, dict):
+            # The shared schema must not change if the caller's dict does.
+            schema = copy.deepcopy(schema)
+        event_schema = cls(schema, cache=cache, registry=registry)
+        if event_schema._has_external_refs:
+            return event_schema
+        with _shared_schemas_lock:
+            return _shared_schemas.setdefault(key, event_schema)
 
     def __repr__(self) -> str:
         """A string repr for an event schema."""
         return json.dumps(self._schema, indent=2)
 
+    @staticmethod
+    def _load_and_validate(content: bytes) -> tuple[dict[str, Any], bool]:
+        """Parse and validate the content of a schema file for a SchemaCache.
+
+        Returns the schema and whether it can be cached.
+        """
+        from . import yaml
+
+        loaded_schema = yaml.loads(content.decode("utf-8"))
+        EventSchema._ensure_yaml_loaded(loaded_schema)
+        # Schemas whose version is coerced to a string are not cached,
+        # so that the deprecation warning is shown every time.
+        cacheable = not isinstance(loaded_schema.get("version"), int)
+        validate_schema(loaded_schema)
+        return loaded_schema, cacheable
+
     @staticmethod
     def _ensure_yaml_loaded(schema: SchemaType, was_str: bool = False) -> None:
         """Ensures schema was correctly loaded into a dictionary. Raises
@@ -114,6 +296,8 @@ class EventSchema:
         if isinstance(schema, dict):
             return schema
 
+        from . import yaml
+
         # if schema is PurePath, ensure file exists at path and then load from file
         if isinstance(schema, PurePath):
             if not Path(schema).exists():
@@ -144,10 +328,33 @@ class EventSchema:
         """Schema's version."""
         return self._schema["version"]  # type:ignore[no-any-return]
 
+    @property
+    def fingerprint(self) -> str:
+        """A hash of the schema's content, computed once.
+
+        The hash is taken over the schema in canonical JSON form, so
+        identical schemas have the same fingerprint whether they were
+        loaded from a dict, a string or a file, and whatever their key order.
+        """
+        if self._fingerprint is None:
+            canonical = json.dumps(self._schema, sort_keys=True, separators=(",", ":"), default=str)
+            self._fingerprint = hashlib.sha256(canonical.encode()).hexdigest()
+        return self._fingerprint
+
+    @property
+    def resource(self) -> Resource[Any]:
+        """The schema as a resource that other schemas can reference."""
+        return self._resource
+
     @property
     def properties(self) -> dict[str, Any]:
         return self._schema["properties"]  # type:ignore[no-any-return]
 
     def validate(self, data: dict[str, Any]) -> None:
         """Validate an incoming instance of this event schema."""
+        # The compiled validator never accepts an invalid instance, but
+        # it does not report why an instance is invalid. Run the full
+        # validator for those to raise the usual ValidationError.
+        if self._compiled is not None and self._compiled.is_valid(data):
+            return
         self._validator.validate(data)
@@ -1,73 +1,573 @@
 """"An event schema registry."""
 from __future__ import annotations
 
-from typing import Any
+import copy
+import json
+import marshal
+import re
+import sys
+from collections.abc import Iterable
+from pathlib import Path, PurePath
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Union
 
-from .schema import EventSchema
+from .schema import EventSchema, SchemaType
+
+if TYPE_CHECKING:
+    from referencing import Registry, Resource
+
+    from .cache import SchemaCache
+
+# Matches the `$id` of a YAML schema file without parsing it. Top-level
+# YAML keys are not indented, while the keys of nested subschemas are.
+_TOP_LEVEL_ID = re.compile(r"""^["']?\$id["']?\s*:\s*["']?([^"'\s,#}]+)""", re.MULTILINE)
+
+
+def _scan_schema_id(path: PurePath) -> str | None:
+    """Find the `$id` of a schema file without loading the schema.
+
+    JSON files are parsed, which is cheap next to validating the schema.
+    In YAML files, the `$id` is only trusted if it is the single unindented
+    one; otherwise (e.g. flow-style YAML) None is returned.
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    if text.lstrip().startswith("{"):
+        try:
+            schema = json.loads(text)
+        except ValueError:
+            return None
+        schema_id = schema.get("$id") if isinstance(schema, dict) else None
+        return schema_id if isinstance(schema_id, str) else None
+    matches = _TOP_LEVEL_ID.findall(text)
+    return matches[0] if len(matches) == 1 else None
+
+
+# The entry point group used to discover schemas shipped by packages.
+ENTRY_POINT_GROUP = "jupyter_events.schemas"
+
+# What a schema entry point may load: a schema file or a directory of
+# schema files, an iterable of those, or a callable returning either.
+SchemaSource = Union[str, PurePath, Iterable[Union[str, PurePath]]]
 
 
 class SchemaRegistryException(Exception):
     """Exception class for Jupyter Events Schema Registry Errors."""
 
 
+class SchemaRegistrationError(SchemaRegistryException):
+    """An error raised when schemas fail to register in bulk.
+
+    `errors` maps each schema file (or entry point) that failed to its error.
+    None of the schemas in the batch are registered.
+    """
+
+    def __init__(self, errors: dict[str, Exception]):
+        """Initialize the error."""
+        self.errors = errors
+        details = "\n".join(f"  {source}: {error}" for source, error in errors.items())
+        super().__init__(f"{len(errors)} schema(s) failed to register:\n{details}")
+
+
+class RegistrationReport(NamedTuple):
+    """The outcome of registering schemas in bulk."""
+
+    #: The $ids of the registered schemas.
+    schema_ids: list[str]
+    #: The seconds spent loading and validating each schema file.
+    timings: dict[str, float]
+    #: The schema files found in each source (a directory or an entry point name).
+    sources: dict[str, list[str]]
+    #: The wall-clock seconds spent registering the whole batch.
+    elapsed: float
+
+    def source_timings(self) -> dict[str, float]:
+        """The seconds spent loading the schema files of each source."""
+        return {
+            source: sum(self.timings[path] for path in paths)
+            for source, paths in self.sources.items()
+        }
+
+
+def _version_key(version: str) -> tuple[int, ...] | None:
+    """A sort key for numeric versions like "2" or "1.10", or None for others."""
+    try:
+        return tuple(int(part) for part in version.split("."))
+    except ValueError:
+        return None
+
+
+def _is_newer(version: str, other: str) -> bool:
+    """Whether `version` supersedes `other` as the latest version of a schema.
+
+    Numeric versions are compared part by part, so "1.10" is newer than
+    "1.9". Otherwise, the most recently registered version is the latest.
+    """
+    key, other_key = _version_key(version), _version_key(other)
+    if key is None or other_key is None:
+        return True
+    return key > other_key
+
+
+# Registry snapshots start with this line, followed by a line of JSON
+# describing the snapshot and the marshalled registry.
+SNAPSHOT_MAGIC = b"jupyter_events registry snapshot\n"
+# Increment this when the layout of snapshots changes.
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def _snapshot_header() -> dict[str, Any]:
+    """Everything that must match for a snapshot to be loaded."""
+    from ._version import __version__
+    from .cache import metaschema_hash
+
+    return {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        # marshal data and code objects are specific to a Python version.
+        "python": sys.implementation.cache_tag,
+        "jupyter_events": __version__,
+        "metaschema": metaschema_hash(),
+    }
+
+
+# A function migrating an event from one version of its schema to the next.
+UpgradeFunction = Callable[[dict[str, Any]], dict[str, Any]]
+
+
+def _entry_points(group: str) -> list[Any]:
+    from importlib.metadata import entry_points
+
+    if sys.version_info < (3, 10):  # pragma: no cover
+        return list(entry_points().get(group, []))  # type:ignore[unreachable,unused-ignore]
+    return list(entry_points(group=group))
+
+
+def _expand_source(source: SchemaSource, pattern: str) -> list[Path]:
+    """List the schema files of a file, a directory, or an iterable of those."""
+    if isinstance(source, (str, PurePath)):
+        path = Path(source)
+        if path.is_dir():
+            return sorted(path.glob(pattern))
+        return [path]
+    return [path for item in source for path in _expand_source(item, pattern)]
+
+
 class SchemaRegistry:
     """A convenient API for storing and searching a group of schemas."""
 
-    def __init__(self, schemas: dict[str, EventSchema] | None = None):
-        """Initialize the registry."""
-        self._schemas: dict[str, EventSchema] = schemas or {}
+    def __init__(
+        self,
+        schemas: dict[str, EventSchema] | None = None,
+        cache: SchemaCache | None = None,
+        shared: bool = True,
+    ):
+        """Initialize the registry.
+
+        Schema files are loaded through `cache`, if given (see `SchemaCache`).
+        If `shared` is True (default), schemas are shared with other
+        registries in the process that register the same content
+        (see `EventSchema.shared`).
+
+        All the schemas in the registry resolve `$ref`s to other documents
+        with `references`, a `referencing.Registry` that retrieves the
+        definitions registered with `register_definitions` and the
+        registered schemas themselves.
+        """
+        from referencing import Registry
+
+        # The latest version of each schema, which is used when no version
+        # is requested, and every version of each schema.
+        self._schemas: dict[str, EventSchema] = {}
+        self._versions: dict[str, dict[str, EventSchema]] = {}
+        self.cache = cache
+        self.shared = shared
+        # Paths of schemas registered lazily that have not been loaded yet.
+        self._lazy: dict[str, PurePath] = {}
+        # Every loaded schema, keyed by its fingerprint.
+        self._fingerprints: dict[str, EventSchema] = {}
+        # Upgrade functions, keyed by schema and the version they upgrade from.
+        self._upgrades: dict[tuple[str, str], tuple[str, UpgradeFunction]] = {}
+        # Shared definitions, keyed by their $id. Their resources are built
+        # once, so resolving a reference to them is a dict lookup.
+        self._definitions: dict[str, Resource[Any]] = {}
+        self.references: Registry[Any] = Registry(retrieve=self._retrieve)  # type:ignore[call-arg]
+        for schema in (schemas or {}).values():
+            self._add(schema)
 
     def __contains__(self, key: str) -> bool:
         """Syntax sugar to check if a schema is found in the registry"""
-        return key in self._schemas
+        return key in self._schemas or key in self._lazy
 
     def __repr__(self) -> str:
         """The str repr of the registry."""
-        return ",\n".join([str(s) for s in self._schemas.values()])
+        return ",\n".join(
+            [str(s) for versions in self._versions.values() for s in versions.values()]
+            + [f"{id_} (not loaded yet, from {path})" for id_, path in self._lazy.items()]
+        )
 
-    def _add(self, schema_obj: EventSchema) -> None:
-        if schema_obj.id in self._schemas:
-            msg = (
-                f"The schema, {schema_obj.id}, is already "
-                "registered. Try removing it and registering it again."
-            )
-            raise SchemaRegistryException(msg)
-        self._schemas[schema_obj.id] = schema_obj
+    def _find_registered(self, schema_obj: EventSchema) -> EventSchema | None:
+        """Find the registered schema with the same $id and version, if any.
+
+        Raises a SchemaRegistryException if that schema is different.
+        """
+        id_, version = schema_obj.id, str(schema_obj.version)
+        if id_ in self._lazy:
+            # Load it to find out its version.
+            self._load(id_)
+        existing = self._versions.get(id_, {}).get(version)
+        if existing is None or existing.fingerprint == schema_obj.fingerprint:
+            return existing
+        msg = (
+            f"A different schema is already registered as version {version} "
+            f"of {id_}. Try removing it and registering it again."
+        )
+        raise SchemaRegistryException(msg)
+
+    def _add(self, schema_obj: EventSchema) -> EventSchema:
+        """Add a schema, returning the registered schema.
+
+        Adding a schema that is identical to a registered one does nothing,
+        and the registered schema is returned.
+        """
+        existing = self._find_registered(schema_obj)
+        if existing is not None:
+            return existing
+        id_, version = schema_obj.id, str(schema_obj.version)
+        self._versions.setdefault(id_, {})[version] = schema_obj
+        self._fingerprints[schema_obj.fingerprint] = schema_obj
+        latest = self._schemas.get(id_)
+        if latest is None or _is_newer(version, str(latest.version)):
+            self._schemas[id_] = schema_obj
+        return schema_obj
 
     @property
     def schema_ids(self) -> list[str]:
-        return list(self._schemas.keys())
+        return [*self._schemas, *self._lazy]
 
-    def register(self, schema: dict[str, Any] | (str | EventSchema)) -> EventSchema:
+    def versions(self, id_: str) -> list[str]:
+        """The registered versions of a schema, in registration order."""
+        if id_ in self._lazy:
+            self._load(id_)
+        return list(self._versions.get(id_, {}))
+
+    def is_loaded(self, id_: str) -> bool:
+        """Whether a registered schema has been loaded (see `register_lazy`)."""
+        return id_ in self._schemas
+
+    def register(self, schema: SchemaType | EventSchema) -> EventSchema:
         """Add a valid schema to the registry.
 
         All schemas are validated against the Jupyter Events meta-schema
         found here:
+
+        Several versions of a schema may be registered, e.g. to accept
+        events from producers on both sides of a rolling upgrade. The
+        newest version is used unless a version is requested.
+
+        Registering a schema identical to a registered one (with the same
+        fingerprint) does nothing and returns the registered schema; a
+        different schema with the same $id and version is rejected.
         """
         if not isinstance(schema, EventSchema):
-            schema = EventSchema(schema)
-        self._add(schema)
-        return schema
+            schema = self._new_schema(schema)
+        return self._add(schema)
 
-    def get(self, id_: str) -> EventSchema:
-        """Fetch a given schema. If the schema is not found,
-        this will raise a KeyError.
+    def _new_schema(self, schema: SchemaType) -> EventSchema:
+        if self.shared:
+            return EventSchema.shared(schema, cache=self.cache, registry=self.references)
+        return EventSchema(schema, cache=self.cache, registry=self.references)
+
+    def _retrieve(self, uri: str) -> Resource[Any]:
+        """Retrieve a referenced document for `references`."""
+        from referencing.exceptions import NoSuchResource
+
+        try:
+            return self._definitions[uri]
+        except KeyError:
+            pass
+        if uri in self:
+            return self.get(uri).resource
+        raise NoSuchResource(ref=uri)  # type:ignore[call-arg]
+
+    def register_definitions(self, definitions: SchemaType) -> str:
+        """Add a document of definitions that schemas can reference.
+
+        Definitions that several schemas share (e.g. a user or a session
+        object) can be written once and referenced by `$id`, e.g.
+        ``$ref: http://event.jupyter.org/definitions#/definitions/user``.
+        The document must be a valid Draft 7 JSON schema with an `$id`.
+        Register definitions before the schemas that reference them, since
+        references are inlined when a schema is compiled.
+
+        Registering the same definitions again does nothing, but
+        definitions cannot be changed once registered.
+
+        Parameters
+        ----------
+        definitions: dict, str or PurePath
+            The document of definitions.
+
+        Returns
+        -------
+        str
+            The `$id` of the document.
         """
+        from jsonschema import Draft7Validator
+        from referencing.jsonschema import DRAFT7
+
+        contents = EventSchema._load_schema(definitions)
+        id_ = contents.get("$id")
+        if not isinstance(id_, str):
+            msg = "Definitions must have an $id to be referenced by."
+            raise SchemaRegistryException(msg)
+        Draft7Validator.check_schema(contents)
+        existing = self._definitions.get(id_)
+        if existing is not None:
+            if existing.contents != contents:
+                msg = f"Different definitions are already registered as {id_}."
+                raise SchemaRegistryException(msg)
+            return id_
+        if id_ in self:
+            msg = f"The schema, {id_}, is already registered."
+            raise SchemaRegistryException(msg)
+        self._definitions[id_] = DRAFT7.create_resource(copy.deepcopy(contents))
+        return id_
+
+    @property
+    def definition_ids(self) -> list[str]:
+        """The $ids of the registered definitions."""
+        return list(self._definitions)
+
+    def _load_file(self, path: Path) -> tuple[EventSchema | Exception, float]:
+        start = perf_counter()
         try:
-            return self._schemas[id_]
+            schema: EventSchema | Exception = self._new_schema(path)
+        except Exception as err:
+            schema = err
+        return schema, perf_counter() - start
+
+    def register_files(
+        self, sources: dict[str, list[Path]], max_workers: int | None = None
+    ) -> RegistrationReport:
+        """Load and register groups of schema files, in parallel.
+
+        The files are parsed and validated against the Jupyter Events
+        meta-schema in a thread pool. Every failure is collected, and if
+        there are any, a `SchemaRegistrationError` listing all of them is
+        raised and none of the schemas are registered.
+
+        Parameters
+        ----------
+        sources: dict
+            Lists of schema files, keyed by where they came from.
+        max_workers: int, optional
+            The number of threads used to load the files.
+
+        Returns
+        -------
+        RegistrationReport
+            The registered schemas and the time spent loading each file.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        start = perf_counter()
+        paths = list(dict.fromkeys(path for files in sources.values() for path in files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(paths, executor.map(self._load_file, paths)))
+
+        errors: dict[str, Exception] = {}
+        schemas: dict[tuple[str, str], EventSchema] = {}
+        for path, (schema, _) in results.items():
+            if isinstance(schema, Exception):
+                errors[str(path)] = schema
+                continue
+            key = (schema.id, str(schema.version))
+            try:
+                if key in schemas:
+                    if schemas[key].fingerprint != schema.fingerprint:
+                        msg = f"A different schema is registered as version {key[1]} of {key[0]}."
+                        raise SchemaRegistryException(msg)
+                else:
+                    self._find_registered(schema)
+                    schemas[key] = schema
+            except SchemaRegistryException as err:
+                errors[str(path)] = err
+        if errors:
+            raise SchemaRegistrationError(errors)
+
+        # Only add the schemas once they have all loaded.
+        for schema in schemas.values():
+            self._add(schema)
+        return RegistrationReport(
+            schema_ids=list(dict.fromkeys(id_ for id_, _ in schemas)),
+            timings={str(path): elapsed for path, (_, elapsed) in results.items()},
+            sources={source: [str(path) for path in files] for source, files in sources.items()},
+            elapsed=perf_counter() - start,
+        )
+
+    def register_directory(
+        self, path: str | PurePath, pattern: str = "*.yaml", max_workers: int | None = None
+    ) -> RegistrationReport:
+        """Register every schema file in a directory, in parallel.
+
+        See `register_files` for how failures are reported.
+
+        Parameters
+        ----------
+        path: str or PurePath
+            The directory.
+        pattern: str
+            A glob pattern selecting the schema files in the directory,
+            e.g. "**/*.yaml" to include subdirectories.
+        max_workers: int, optional
+            The number of threads used to load the files.
+        """
+        if not Path(path).is_dir():
+            msg = f"{path} is not a directory."
+            raise SchemaRegistryException(msg)
+        return self.register_files({str(path): _expand_source(path, pattern)}, max_workers)
+
+    def register_entry_points(
+        self,
+        group: str = ENTRY_POINT_GROUP,
+        pattern: str = "*.yaml",
+        max_workers: int | None = None,
+    ) -> RegistrationReport:
+        """Register the schemas shipped by installed packages, in parallel.
+
+        Packages declare their schemas with an entry point in the
+        "jupyter_events.schemas" group, e.g. in pyproject.toml:
+
+        .. code-block:: toml
+
+            [project.entry-points."jupyter_events.schemas"]
+            my_extension = "my_extension:get_event_schemas"
+
+        An entry point refers to a schema file or directory path, an
+        iterable of those, or a callable returning one. Files in
+        directories are selected with `pattern`. The report's sources are
+        keyed by entry point name. See `register_files` for how failures
+        are reported.
+        """
+        sources: dict[str, list[Path]] = {}
+        errors: dict[str, Exception] = {}
+        for entry_point in _entry_points(group):
+            try:
+                source: SchemaSource | Callable[[], SchemaSource] = entry_point.load()
+                if callable(source):
+                    source = source()
+                sources[entry_point.name] = _expand_source(source, pattern)
+            except Exception as err:
+                errors[f"entry point {entry_point.name}"] = err
+        if errors:
+            raise SchemaRegistrationError(errors)
+        return self.register_files(sources, max_workers)
+
+    def register_lazy(self, path: PurePath, schema_id: str | None = None) -> str:
+        """Register a schema file without loading it.
+
+        Only the schema's `$id` is read from the file, without parsing
+        it. The file is parsed, validated against the Jupyter Events
+        meta-schema and turned into an `EventSchema` the first time the
+        schema is fetched with `get` (e.g. when an event is emitted).
+        Errors in the schema are raised then, rather than here.
+
+        If the `$id` cannot be found cheaply, or a schema with the same
+        `$id` is already registered, the schema is loaded immediately
+        instead (see `register`).
+
+        Parameters
+        ----------
+        path: PurePath
+            The path of the schema file.
+        schema_id: str, optional
+            The `$id` of the schema, if known. When the schema is loaded,
+            its actual `$id` must match.
+
+        Returns
+        -------
+        str
+            The `$id` of the schema.
+        """
+        if schema_id is None:
+            schema_id = _scan_schema_id(path)
+            if schema_id is None:
+                return self.register(path).id
+        if schema_id in self:
+            # Load it now, to compare it with the registered schema.
+            return self.register(path).id
+        self._lazy[schema_id] = path
+        return schema_id
+
+    def _load(self, id_: str) -> EventSchema:
+        """Load a lazily registered schema."""
+        path = self._lazy[id_]
+        schema = self._new_schema(path)
+        if schema.id != id_:
+            msg = f"The schema at {path} was registered as {id_}, but its $id is {schema.id}."
+            raise SchemaRegistryException(msg)
+        del self._lazy[id_]
+        return self._add(schema)
+
+    def get(self, id_: str, version: str | None = None) -> EventSchema:
+        """Fetch a given schema, at its latest version unless a version
+        is given. If the schema is not found, this will raise a KeyError.
+        """
+        try:
+            if version is None:
+                return self._schemas[id_]
+            return self._versions[id_][version]
         except KeyError:
-            msg = (
-                f"The requested schema, {id_}, was not found in the "
-                "schema registry. Are you sure it was previously registered?"
-            )
+            if id_ in self._lazy:
+                self._load(id_)
+                return self.get(id_, version)
+            if version is not None and id_ in self._schemas:
+                msg = (
+                    f"Version {version} of the schema, {id_}, was not found in the "
+                    f"schema registry. Registered versions: {', '.join(self._versions[id_])}."
+                )
+            else:
+                msg = (
+                    f"The requested schema, {id_}, was not found in the "
+                    "schema registry. Are you sure it was previously registered?"
+                )
             raise KeyError(msg) from None
 
-    def remove(self, id_: str) -> None:
-        """Remove a given schema. If the schema is not found,
+    def get_by_fingerprint(self, fingerprint: str) -> EventSchema:
+        """Fetch the schema with a given fingerprint (see
+        `EventSchema.fingerprint`). If the schema is not found,
         this will raise a KeyError.
         """
         try:
-            del self._schemas[id_]
+            return self._fingerprints[fingerprint]
+        except KeyError:
+            msg = f"No schema with the fingerprint {fingerprint} was found in the schema registry."
+            raise KeyError(msg) from None
+
+    def remove(self, id_: str, version: str | None = None) -> None:
+        """Remove a given schema, or only one version of it. If the schema
+        is not found, this will raise a KeyError.
+        """
+        if version is not None:
+            schema = self.get(id_, version)
+            del self._fingerprints[schema.fingerprint]
+            del self._versions[id_][version]
+            if not self._versions[id_]:
+                del self._versions[id_]
+                del self._schemas[id_]
+            elif self._schemas[id_] is schema:
+                # Point at the newest remaining version.
+                remaining = iter(self._versions[id_].items())
+                _, latest = next(remaining)
+                for other_version, other in remaining:
+                    if _is_newer(other_version, str(latest.version)):
+                        latest = other
+                self._schemas[id_] = latest
+            return
+        try:
+            if self._lazy.pop(id_, None) is None:
+                del self._schemas[id_]
+                for schema in self._versions.pop(id_).values():
+                    del self._fingerprints[schema.fingerprint]
         except KeyError:
             msg = (
                 f"The requested schema, {id_}, was not found in the "
@@ -75,9 +575,181 @@ class SchemaRegistry:
             )
             raise KeyError(msg) from None
 
-    def validate_event(self, id_: str, data: dict[str, Any]) -> None:
+    def snapshot(self, path: str | PurePath | None = None) -> bytes:
+        """Save the registry, so that other processes can load it quickly.
+
+        The snapshot holds every registered schema and definition, already
+        validated, with the code of their compiled validators. Schemas
+        registered lazily that have not been loaded are saved as paths.
+        Upgrade functions are not saved.
+
+        The snapshot can only be loaded (see `load_snapshot`) by the same
+        versions of Python and jupyter_events.
+
+        Parameters
+        ----------
+        path: str or PurePath, optional
+            A file to write the snapshot to.
+
+        Returns
+        -------
+        bytes
+            The snapshot.
+        """
+        schemas = [
+            (
+                schema._schema,
+                schema.fingerprint,
+                schema._compiled.code if schema._compiled is not None else None,
+            )
+            for versions in self._versions.values()
+            for schema in versions.values()
+        ]
+        body = {
+            "definitions": [resource.contents for resource in self._definitions.values()],
+            "schemas": schemas,
+            "lazy": {id_: str(path) for id_, path in self._lazy.items()},
+        }
+        try:
+            data = marshal.dumps(body)
+        except ValueError as err:
+            msg = "The registry holds schemas that cannot be saved in a snapshot."
+            raise SchemaRegistryException(msg) from err
+        snapshot = SNAPSHOT_MAGIC + json.dumps(_snapshot_header()).encode() + b"\n" + data
+        if path is not None:
+            Path(path).write_bytes(snapshot)
+        return snapshot
+
+    def load_snapshot(self, snapshot: bytes | str | PurePath) -> list[str]:
+        """Register the schemas and definitions saved in a snapshot (see `snapshot`).
+
+        The schemas are not validated against the meta-schema or compiled
+        again. As with `register`, schemas that are already registered
+        are reused, and conflicting schemas raise a SchemaRegistryException.
+
+        Parameters
+        ----------
+        snapshot: bytes, str or PurePath
+            The snapshot, or the path of a file holding it.
+
+        Returns
+        -------
+        list of str
+            The $ids of the schemas in the snapshot.
+        """
+        if not isinstance(snapshot, bytes):
+            snapshot = Path(snapshot).read_bytes()
+        if not snapshot.startswith(SNAPSHOT_MAGIC):
+            msg = "This is not a schema registry snapshot."
+            raise SchemaRegistryException(msg)
+        header_line, _, data = snapshot[len(SNAPSHOT_MAGIC) :].partition(b"\n")
+        try:
+            header = json.loads(header_line)
+        except ValueError:
+            header = None
+        if header != _snapshot_header():
+            msg = (
+                "This snapshot was taken with different versions of Python or "
+                "jupyter_events. Register the schemas again and take a new snapshot."
+            )
+            raise SchemaRegistryException(msg)
+        body = marshal.loads(data)  # noqa: S302
+
+        for definitions in body["definitions"]:
+            self.register_definitions(definitions)
+        schema_ids = []
+        for schema, fingerprint, code in body["schemas"]:
+            event_schema = EventSchema._restore(schema, fingerprint, code, self.references)
+            schema_ids.append(self._add(event_schema).id)
+        for id_, path in body["lazy"].items():
+            schema_ids.append(self.register_lazy(Path(path), id_))
+        return list(dict.fromkeys(schema_ids))
+
+    def validate_event(self, id_: str, data: dict[str, Any], version: str | None = None) -> None:
         """Validate an event against a schema within this
-        registry.
+        registry, at its latest version unless a version is given.
         """
-        schema = self.get(id_)
+        schema = self.get(id_, version)
         schema.validate(data)
+
+    def register_upgrade(
+        self, id_: str, from_version: str, to_version: str, upgrade: UpgradeFunction
+    ) -> None:
+        """Register a function that migrates events from one version of a
+        schema to another.
+
+        Upgrades are chained, so an event can be migrated across several
+        versions (see `upgrade_events`).
+
+        Parameters
+        ----------
+        id_: str
+            The $id of the schema.
+        from_version: str
+            The version of the events that `upgrade` accepts.
+        to_version: str
+            The version of the events that `upgrade` returns.
+        upgrade: callable
+            Takes the data of an event and returns the migrated data.
+        """
+        self._upgrades[(id_, from_version)] = (to_version, upgrade)
+
+    def _upgrade_path(self, id_: str, from_version: str, to_version: str) -> list[UpgradeFunction]:
+        """The chain of upgrade functions from one version to another."""
+        path: list[UpgradeFunction] = []
+        version = from_version
+        seen = {version}
+        while version != to_version:
+            try:
+                version, upgrade = self._upgrades[(id_, version)]
+            except KeyError:
+                msg = f"No upgrade from version {version} of the schema, {id_}, is registered."
+                raise SchemaRegistryException(msg) from None
+            if version in seen:
+                msg = f"The upgrades of the schema, {id_}, form a cycle at version {version}."
+                raise SchemaRegistryException(msg)
+            seen.add(version)
+            path.append(upgrade)
+        return path
+
+    def upgrade_events(
+        self,
+        id_: str,
+        events: Iterable[dict[str, Any]],
+        from_version: str,
+        to_version: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Migrate the data of events from one version of a schema to another.
+
+        The chain of upgrade functions is worked out once for the whole
+        batch, then applied to each event in turn.
+
+        Parameters
+        ----------
+        id_: str
+            The $id of the schema.
+        events: iterable of dict
+            The data of events recorded with `from_version`.
+        from_version: str
+            The version of the events.
+        to_version: str, optional
+            The version to migrate the events to. Defaults to the latest
+            registered version.
+
+        Returns
+        -------
+        list of dict
+            The migrated data.
+        """
+        if to_version is None:
+            to_version = str(self.get(id_).version)
+        path = self._upgrade_path(id_, from_version, to_version)
+        if not path:
+            return list(events)
+        upgraded = []
+        for data in events:
+            event = data
+            for upgrade in path:
+                event = upgrade(event)
+            upgraded.append(event)
+        return upgraded
@@ -0,0 +1,51 @@
+"""Serializers that turn event capsules into bytes."""
+from __future__ import annotations
+
+import json
+import typing as t
+from datetime import date, datetime, time
+
+
+def default(obj: t.Any) -> t.Any:
+    """Serialize objects that JSON encoders do not support natively."""
+    if isinstance(obj, (date, datetime, time)):
+        return obj.isoformat()
+    return str(obj)
+
+
+class EventSerializer:
+    """Base class for event serializers.
+
+    A serializer turns an event capsule into a single JSON document, encoded
+    as UTF-8 bytes without a trailing newline. The result is passed as-is to
+    every EventSink registered with an EventLogger.
+    """
+
+    def dumps(self, obj: t.Any) -> bytes:
+        """Serialize an event."""
+        raise NotImplementedError
+
+
+class JSONSerializer(EventSerializer):
+    """A serializer using the standard library's json module."""
+
+    def dumps(self, obj: t.Any) -> bytes:
+        """Serialize an event."""
+        return json.dumps(obj, default=default).encode("utf-8")
+
+
+class OrjsonSerializer(EventSerializer):
+    """A serializer using orjson, a fast JSON library.
+
+    orjson must be installed separately.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the serializer."""
+        import orjson  # type:ignore[import-not-found,unused-ignore]
+
+        self._dumps: t.Callable[..., bytes] = orjson.dumps
+
+    def dumps(self, obj: t.Any) -> bytes:
+        """Serialize an event."""
+        return self._dumps(obj, default=default)
@@ -0,0 +1,19 @@
+"""Event sinks: logging handlers that receive already-serialized events."""
+from __future__ import annotations
+
+from .base import EventSink, StreamSink
+from .file import FileSink
+from .network import SocketSink
+from .ring import RingReader, RingSink
+from .segments import SegmentSink, read_segments
+
+__all__ = [
+    "EventSink",
+    "FileSink",
+    "RingReader",
+    "RingSink",
+    "SegmentSink",
+    "SocketSink",
+    "StreamSink",
+    "read_segments",
+]
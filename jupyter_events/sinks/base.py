@@ -0,0 +1,123 @@
+"""Base classes for event sinks."""
+from __future__ import annotations
+
+import io
+import logging
+import sys
+import traceback
+import typing as t
+
+if t.TYPE_CHECKING:
+    from ..projections import Projection
+
+# Attribute of the LogRecords created by an EventLogger that holds
+# the event already serialized as a string.
+SERIALIZED_EVENT_ATTRIBUTE = "jupyter_event"
+
+
+class EventFormatter(logging.Formatter):
+    """A formatter for the records created by an EventLogger.
+
+    The EventLogger serializes each event once and attaches the result to
+    the record; this formatter returns it as-is instead of serializing the
+    event again for every handler.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Return the serialized event attached to the record."""
+        try:
+            return getattr(record, SERIALIZED_EVENT_ATTRIBUTE)  # type:ignore[no-any-return]
+        except AttributeError:
+            return super().format(record)
+
+
+class EventSink(logging.Handler):
+    """A logging handler that receives events serialized as bytes.
+
+    An EventLogger serializes each event once and hands the same bytes to
+    every sink, bypassing the `logging.LogRecord` machinery. Sinks are still
+    `logging.Handler` instances, so they can be listed in the EventLogger's
+    `handlers` trait (and configured like any other handler) and will also
+    work when attached to a regular logger.
+
+    Each event is a single JSON document without a trailing newline.
+    Subclasses implement `write_events`.
+
+    A sink's `projection`, if set, selects the fields of the events it
+    receives from an EventLogger. It must be set before the sink is
+    registered, and does not apply to records coming through `logging`.
+    """
+
+    projection: Projection | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record coming through the `logging` machinery."""
+        try:
+            data = getattr(record, SERIALIZED_EVENT_ATTRIBUTE, None)
+            if data is None:
+                data = self.format(record)
+            self.write_events([data.encode("utf-8")])
+        except Exception:
+            self.handleError(record)
+
+    def handle_events(self, events: t.Sequence[bytes]) -> None:
+        """Write a batch of serialized events while holding the handler's lock.
+
+        Errors are reported the same way `logging.Handler.handleError`
+        reports them, rather than propagating to the code emitting events.
+        """
+        self.acquire()
+        try:
+            self.write_events(events)
+        except Exception:
+            if logging.raiseExceptions:
+                sys.stderr.write(f"--- Error writing events to {self!r} ---\n")
+                traceback.print_exc(file=sys.stderr)
+        finally:
+            self.release()
+
+    def write_events(self, events: t.Sequence[bytes]) -> None:
+        """Write a batch of serialized events."""
+        raise NotImplementedError
+
+
+class StreamSink(EventSink):
+    """A sink that writes events as JSON lines to a stream.
+
+    Parameters
+    ----------
+    stream: file-like
+        A binary stream, or a text stream (events are then decoded
+        before being written). Defaults to `sys.stdout`.
+    projection: Projection, optional
+        The fields of the events written to the stream. Defaults to every field.
+    """
+
+    def __init__(
+        self,
+        stream: t.Any = None,
+        level: int = logging.NOTSET,
+        projection: Projection | None = None,
+    ) -> None:
+        """Initialize the sink."""
+        super().__init__(level)
+        self.projection = projection
+        self.stream: t.Any = sys.stdout if stream is None else stream
+        self._binary = not isinstance(self.stream, io.TextIOBase)
+
+    def write_events(self, events: t.Sequence[bytes]) -> None:
+        """Write a batch of events, one per line."""
+        buffer = b"\n".join(events) + b"\n"
+        if self._binary:
+            self.stream.write(buffer)
+        else:
+            self.stream.write(buffer.decode("utf-8"))
+
+    def flush(self) -> None:
+        """Flush the stream."""
+        self.acquire()
+        try:
+            if hasattr(self.stream, "flush"):
+                self.stream.flush()
+        finally:
+            self.release()
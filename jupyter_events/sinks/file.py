@@ -0,0 +1,234 @@
+"""An event sink writing JSON lines to a file, with rotation."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import typing as t
+import weakref
+from datetime import datetime, timezone
+from pathlib import Path
+from time import monotonic
+
+from .base import EventSink
+
+if t.TYPE_CHECKING:
+    from ..projections import Projection
+
+FSYNC_POLICIES = ("never", "batch", "event")
+
+
+class FileSink(EventSink):
+    """A sink that appends events as JSON lines to a file.
+
+    Events are buffered in memory and committed to the file in groups, with
+    a single write, once `buffer_size` bytes are buffered or the oldest
+    buffered event has waited `flush_interval` seconds. Calling `flush`
+    commits the buffer immediately.
+
+    The file is rotated once it would grow past `max_bytes`, or every
+    `rotate_interval` seconds. Rotation always happens between two events:
+    the current file is renamed with the time of the rotation as a suffix,
+    e.g. ``events.jsonl.20240101-120000-000000``, and a new file is started.
+
+    Parameters
+    ----------
+    path: str or PathLike
+        The file to write to. Events are appended to it if it exists.
+    buffer_size: int
+        The number of buffered bytes that triggers a commit. 0 commits every
+        batch of events as soon as it is written.
+    flush_interval: float
+        The longest time, in seconds, that an event stays buffered.
+    max_bytes: int
+        The size at which the file is rotated. 0 disables size-based rotation.
+        A single event larger than this is written to a file of its own.
+    rotate_interval: float
+        The time, in seconds, after which the file is rotated.
+        0 disables time-based rotation.
+    backup_count: int
+        The number of rotated files to keep; older ones are deleted.
+        0 keeps every rotated file.
+    fsync: str
+        When to ask the operating system to write the file to disk:
+
+        - "never": leave it to the operating system (fastest).
+        - "batch": after each commit.
+        - "event": after each event; events are not buffered.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        max_bytes: int = 0,
+        rotate_interval: float = 0,
+        backup_count: int = 0,
+        fsync: str = "never",
+        level: int = logging.NOTSET,
+        projection: Projection | None = None,
+    ) -> None:
+        """Initialize the sink and open the file."""
+        super().__init__(level)
+        if fsync not in FSYNC_POLICIES:
+            msg = f"Unknown fsync policy {fsync!r}; expected one of {', '.join(FSYNC_POLICIES)}."
+            raise ValueError(msg)
+        if buffer_size < 0 or max_bytes < 0 or backup_count < 0:
+            msg = "buffer_size, max_bytes and backup_count must not be negative."
+            raise ValueError(msg)
+        self.path = Path(path)
+        self.buffer_size = 0 if fsync == "event" else buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.fsync = fsync
+        self.projection = projection
+        # Buffered events, each with its trailing newline.
+        self._buffer: list[bytes] = []
+        self._buffered = 0
+        # When the oldest buffered event was written.
+        self._buffered_since = 0.0
+        self._file: t.BinaryIO | None = None
+        self._size = 0
+        self._rotate_at = 0.0
+        self._open()
+        # Commits buffers that have waited flush_interval, even when no
+        # more events are written.
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+        if self.buffer_size and flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._run_flusher,
+                args=(weakref.ref(self), self._stop, flush_interval),
+                name="jupyter-events-file-sink",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Buffering is done by the sink, so each commit is a single write.
+        self._file = t.cast(t.BinaryIO, self.path.open("ab", buffering=0))
+        self._size = self._file.seek(0, os.SEEK_END)
+        if self.rotate_interval > 0:
+            self._rotate_at = monotonic() + self.rotate_interval
+
+    @staticmethod
+    def _run_flusher(
+        ref: weakref.ref[FileSink], stop: threading.Event, flush_interval: float
+    ) -> None:
+        # Only holds a weak reference, so that the thread does not keep
+        # the sink alive; it exits once the sink is closed or collected.
+        while not stop.wait(flush_interval / 2):
+            sink = ref()
+            if sink is None:
+                return
+            if sink._buffer and monotonic() - sink._buffered_since >= flush_interval:
+                sink.flush()
+            del sink
+
+    def write_events(self, events: t.Sequence[bytes]) -> None:
+        """Buffer a batch of events, committing the buffer if it is full."""
+        if self._file is None:
+            msg = f"Cannot write events to a closed sink: {self.path}"
+            raise ValueError(msg)
+        if self.fsync == "event":
+            for event in events:
+                self._commit([event + b"\n"])
+            return
+        if not self._buffer:
+            self._buffered_since = monotonic()
+        for event in events:
+            self._buffer.append(event + b"\n")
+            self._buffered += len(event) + 1
+        if (
+            self._buffered >= self.buffer_size
+            or monotonic() - self._buffered_since >= self.flush_interval
+        ):
+            self._commit_buffer()
+
+    def _commit_buffer(self) -> None:
+        buffer = self._buffer
+        if buffer:
+            self._buffer = []
+            self._buffered = 0
+            self._commit(buffer)
+
+    def _commit(self, lines: list[bytes]) -> None:
+        """Write lines to the file, rotating it between lines when needed."""
+        if self.rotate_interval > 0 and monotonic() >= self._rotate_at and self._size:
+            self._rotate()
+        max_bytes = self.max_bytes
+        if not max_bytes or self._size + sum(map(len, lines)) <= max_bytes:
+            self._write(b"".join(lines))
+            return
+        start = 0
+        size = self._size
+        for index, line in enumerate(lines):
+            if size and size + len(line) > max_bytes:
+                self._write(b"".join(lines[start:index]))
+                self._rotate()
+                start = index
+                size = 0
+            size += len(line)
+        self._write(b"".join(lines[start:]))
+
+    def _write(self, data: bytes) -> None:
+        if not data:
+            return
+        file = t.cast(t.BinaryIO, self._file)
+        view = memoryview(data)
+        while view:
+            view = view[file.write(view) :]
+        self._size += len(data)
+        if self.fsync != "never":
+            os.fsync(file.fileno())
+
+    def _rotate(self) -> None:
+        """Rename the current file and start a new one."""
+        t.cast(t.BinaryIO, self._file).close()
+        suffix = datetime.now(tz=timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+        target = self.path.with_name(f"{self.path.name}.{suffix}")
+        index = 0
+        while target.exists():
+            # Rotated twice within a microsecond.
+            index += 1
+            target = self.path.with_name(f"{self.path.name}.{suffix}-{index}")
+        self.path.rename(target)
+        if self.backup_count:
+            for backup in self.rotated_files()[: -self.backup_count]:
+                backup.unlink()
+        self._open()
+
+    def rotated_files(self) -> list[Path]:
+        """The rotated files that were kept, oldest first."""
+        return sorted(self.path.parent.glob(f"{self.path.name}.*"))
+
+    def flush(self) -> None:
+        """Commit the buffered events to the file."""
+        self.acquire()
+        try:
+            if self._file is not None:
+                self._commit_buffer()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Commit the buffered events and close the file."""
+        self._stop.set()
+        self.acquire()
+        try:
+            if self._file is not None:
+                try:
+                    self._commit_buffer()
+                finally:
+                    self._file.close()
+                    self._file = None
+        finally:
+            self.release()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        super().close()
@@ -0,0 +1,266 @@
+"""An event sink sending events to a collector over a Unix or TCP socket."""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import struct
+import typing as t
+from collections import deque
+from pathlib import Path
+from time import monotonic
+
+from .base import EventSink
+
+if t.TYPE_CHECKING:
+    from ..projections import Projection
+
+# The header of a frame: the length of its payload, as a big-endian integer.
+FRAME_HEADER = struct.Struct(">I")
+
+# The amount of spilled frames read from disk and sent at once.
+SPILL_BLOCK_SIZE = 1024 * 1024
+
+
+def _read_frames(file: t.BinaryIO, size: int) -> bytes:
+    """Read whole frames from a spill file, until at least `size` bytes are read.
+
+    An incomplete frame at the end of the file, left by a crash while
+    spilling, is not returned.
+    """
+    chunks: list[bytes] = []
+    total = 0
+    while total < size:
+        header = file.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            break
+        (length,) = FRAME_HEADER.unpack(header)
+        payload = file.read(length)
+        if len(payload) < length:
+            break
+        chunks += (header, payload)
+        total += FRAME_HEADER.size + length
+    return b"".join(chunks)
+
+
+class SocketSink(EventSink):
+    """A sink that sends events to a collector over a Unix or TCP socket.
+
+    Events are packed into frames of up to `max_frame_size` bytes: the length
+    of the frame's payload, as a 4-byte big-endian integer, followed by the
+    events separated by newlines. An event larger than `max_frame_size` is
+    sent in a frame of its own. A `jupyter_events.funnel.FunnelServer` can
+    be used as the collector.
+
+    Events wait in a spool until they are sent. When the collector cannot be
+    reached, the sink waits `reconnect_delay` seconds before trying again,
+    on a later write, doubling the delay after each failure up to
+    `max_reconnect_delay`. Once the spool holds more than `spool_size`
+    bytes, its events are appended to the `spill_path` file, and sent from
+    there, before newer events, once the collector is back. Without a
+    `spill_path`, the oldest events are dropped and counted in `dropped`.
+
+    Frames interrupted by a failure are sent again, so the collector should
+    drop the incomplete frame of a closed connection, and may receive some
+    events twice.
+
+    Parameters
+    ----------
+    address: str, PathLike or (host, port) tuple
+        The path of the collector's Unix socket, or its TCP address.
+    max_frame_size: int
+        The maximum size of a frame's payload, in bytes.
+    spool_size: int
+        The maximum size, in bytes, of the events kept in memory while the
+        collector is unreachable.
+    spill_path: str or PathLike, optional
+        The file the spool spills to. Events still spilled when the sink is
+        closed are sent by the next sink using the same file.
+    reconnect_delay: float
+        The time, in seconds, to wait before reconnecting after a failure.
+    max_reconnect_delay: float
+        The longest time, in seconds, to wait before reconnecting.
+    timeout: float, optional
+        The longest time, in seconds, to wait for the collector to connect
+        or accept events.
+    """
+
+    def __init__(
+        self,
+        address: str | os.PathLike[str] | tuple[str, int],
+        *,
+        max_frame_size: int = 64 * 1024,
+        spool_size: int = 1024 * 1024,
+        spill_path: str | os.PathLike[str] | None = None,
+        reconnect_delay: float = 0.1,
+        max_reconnect_delay: float = 30.0,
+        timeout: float | None = 5.0,
+        level: int = logging.NOTSET,
+        projection: Projection | None = None,
+    ) -> None:
+        """Initialize the sink."""
+        super().__init__(level)
+        if max_frame_size <= 0 or spool_size < 0:
+            msg = "max_frame_size must be positive and spool_size must not be negative."
+            raise ValueError(msg)
+        self.address = address if isinstance(address, tuple) else Path(address)
+        self.max_frame_size = max_frame_size
+        self.spool_size = spool_size
+        self.spill_path = None if spill_path is None else Path(spill_path)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.timeout = timeout
+        self.projection = projection
+        # The number of events dropped because the spool was full.
+        self.dropped = 0
+        self._events: deque[bytes] = deque()
+        self._spooled = 0
+        # Whether the spill file holds events, and how many of its bytes
+        # were already sent to the collector.
+        self._spilled = self.spill_path is not None and self.spill_path.exists()
+        self._spill_offset = 0
+        self._socket: socket.socket | None = None
+        self._pid = os.getpid()
+        self._delay = reconnect_delay
+        self._retry_at = 0.0
+        self._closed = False
+
+    def _connect(self) -> socket.socket:
+        sock = self._socket
+        if sock is not None and self._pid != os.getpid():
+            # Forked: the connection belongs to the parent process.
+            self._disconnect()
+        elif sock is not None:
+            # The collector never sends anything: a readable socket means
+            # that it closed the connection, and sending to it would fail
+            # only after losing events.
+            sock.setblocking(False)
+            try:
+                closed = sock.recv(1) == b""
+            except BlockingIOError:
+                closed = False
+            finally:
+                sock.settimeout(self.timeout)
+            if closed:
+                self._disconnect()
+        if self._socket is None:
+            if isinstance(self.address, tuple):
+                sock = socket.create_connection(self.address, timeout=self.timeout)
+            else:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                try:
+                    sock.connect(str(self.address))
+                except OSError:
+                    sock.close()
+                    raise
+            self._socket = sock
+            self._pid = os.getpid()
+        return self._socket
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _encode(self, events: t.Iterable[bytes]) -> bytes:
+        """Pack events into frames."""
+        pack = FRAME_HEADER.pack
+        max_frame_size = self.max_frame_size
+        chunks: list[bytes] = []
+        frame: list[bytes] = []
+        size = -1
+        for event in events:
+            if frame and size + 1 + len(event) > max_frame_size:
+                payload = b"\n".join(frame)
+                chunks += (pack(len(payload)), payload)
+                frame = []
+                size = -1
+            frame.append(event)
+            size += 1 + len(event)
+        if frame:
+            payload = b"\n".join(frame)
+            chunks += (pack(len(payload)), payload)
+        return b"".join(chunks)
+
+    def write_events(self, events: t.Sequence[bytes]) -> None:
+        """Spool a batch of events and send the spool, unless waiting to reconnect."""
+        if self._closed:
+            msg = f"Cannot write events to a closed sink: {self.address}"
+            raise ValueError(msg)
+        self._events.extend(events)
+        self._spooled += sum(map(len, events))
+        if self._socket is not None or monotonic() >= self._retry_at:
+            self._send()
+        if self._spooled > self.spool_size:
+            self._spill()
+
+    def _send(self) -> bool:
+        """Send the spilled then the spooled events, returning whether all were sent."""
+        try:
+            sock = self._connect()
+            if self._spilled:
+                self._send_spill(sock)
+            if self._events:
+                sock.sendall(self._encode(self._events))
+                self._events.clear()
+                self._spooled = 0
+        except OSError:
+            self._disconnect()
+            self._retry_at = monotonic() + self._delay
+            self._delay = min(self._delay * 2, self.max_reconnect_delay)
+            return False
+        self._delay = self.reconnect_delay
+        return True
+
+    def _send_spill(self, sock: socket.socket) -> None:
+        path = t.cast(Path, self.spill_path)
+        with path.open("rb") as file:
+            file.seek(self._spill_offset)
+            while chunk := _read_frames(file, SPILL_BLOCK_SIZE):
+                sock.sendall(chunk)
+                self._spill_offset += len(chunk)
+        path.unlink()
+        self._spilled = False
+        self._spill_offset = 0
+
+    def _spill(self) -> None:
+        """Make room in the spool, spilling events to disk or dropping the oldest ones."""
+        if self.spill_path is None:
+            while self._spooled > self.spool_size:
+                self._spooled -= len(self._events.popleft())
+                self.dropped += 1
+            return
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill_path.open("ab") as file:
+            file.write(self._encode(self._events))
+        self._spilled = True
+        self._events.clear()
+        self._spooled = 0
+
+    def flush(self) -> None:
+        """Send the spooled events, unless waiting to reconnect."""
+        self.acquire()
+        try:
+            if (
+                not self._closed
+                and (self._events or self._spilled)
+                and (self._socket is not None or monotonic() >= self._retry_at)
+            ):
+                self._send()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Send the spooled events, spill those that could not be sent and disconnect."""
+        self.acquire()
+        try:
+            if not self._closed:
+                self.flush()
+                if self._events and self.spill_path is not None:
+                    self._spill()
+                self._disconnect()
+                self._closed = True
+        finally:
+            self.release()
+        super().close()
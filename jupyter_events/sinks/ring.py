@@ -0,0 +1,389 @@
+"""A sink keeping the latest events in a memory-mapped ring file, and its reader.
+
+The ring file starts with a 64-byte header, followed by a data area of fixed
+capacity holding the records. Each record is an event prefixed by its length,
+the CRC32 of the event and its sequence number, padded to 8 bytes; a record
+never wraps around the end of the data area. The header holds:
+
+- the absolute write position (`head`): the total number of bytes written;
+- the absolute position of the oldest record still in the ring (`tail`);
+- the sequence number of the next record;
+- a sequence lock counter, odd while the writer is updating the ring.
+
+The writer only moves `head` past a record once the record is complete, so a
+writer that crashes leaves at most one torn record behind, which readers
+detect with its CRC. A single `RingSink` may write to a ring file at a time;
+any number of `RingReader`s, in any local process, may read it.
+"""
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import time
+import typing as t
+import zlib
+from pathlib import Path
+
+from .base import EventSink
+
+if t.TYPE_CHECKING:
+    from ..projections import Projection
+
+MAGIC = b"JEVRING\x00"
+FORMAT_VERSION = 1
+HEADER_SIZE = 64
+RECORD_HEADER = struct.Struct("<IIQ")
+WRAP_MARKER = 0xFFFFFFFF
+
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_VERSION_OFFSET = 8
+_CAPACITY_OFFSET = 16
+_SEQLOCK_OFFSET = 24
+_HEAD_OFFSET = 32
+_TAIL_OFFSET = 40
+_SEQUENCE_OFFSET = 48
+
+
+class RingFormatError(Exception):
+    """A file is not a ring file this version can use."""
+
+
+def _record_size(length: int) -> int:
+    """The size of a record holding `length` bytes, padded to 8 bytes."""
+    return (RECORD_HEADER.size + length + 7) & ~7
+
+
+def _read_ring_header(buffer: t.Any, path: Path) -> int:
+    """Check the header of a ring file and return its capacity."""
+    if len(buffer) < HEADER_SIZE or bytes(buffer[:8]) != MAGIC:
+        msg = f"{path} is not an event ring file."
+        raise RingFormatError(msg)
+    version = _U32.unpack_from(buffer, _VERSION_OFFSET)[0]
+    if version != FORMAT_VERSION:
+        msg = f"{path} uses ring format version {version}; expected {FORMAT_VERSION}."
+        raise RingFormatError(msg)
+    capacity: int = _U64.unpack_from(buffer, _CAPACITY_OFFSET)[0]
+    if len(buffer) < HEADER_SIZE + capacity:
+        msg = f"{path} is truncated."
+        raise RingFormatError(msg)
+    return capacity
+
+
+def _scan(
+    buffer: t.Any, capacity: int, start: int, end: int
+) -> t.Iterator[tuple[int, int, int, memoryview | None]]:
+    """Walk the records between two absolute positions.
+
+    Yields (position, next position, sequence number, payload) for each record;
+    the payload is None when the record is torn (its CRC does not match),
+    after which the walk stops.
+    """
+    view = memoryview(buffer)
+    position = start
+    while position < end:
+        offset = position % capacity
+        if capacity - offset < RECORD_HEADER.size or (
+            _U32.unpack_from(buffer, HEADER_SIZE + offset)[0] == WRAP_MARKER
+        ):
+            position += capacity - offset
+            continue
+        length, crc, sequence = RECORD_HEADER.unpack_from(buffer, HEADER_SIZE + offset)
+        next_position = position + _record_size(length)
+        if next_position > end or offset + _record_size(length) > capacity:
+            yield position, end, sequence, None
+            return
+        data_start = HEADER_SIZE + offset + RECORD_HEADER.size
+        payload = view[data_start : data_start + length]
+        if zlib.crc32(payload) != crc:
+            yield position, end, sequence, None
+            return
+        yield position, next_position, sequence, payload
+        position = next_position
+
+
+class RingSink(EventSink):
+    """A sink that keeps the latest events in a memory-mapped ring file.
+
+    Once the ring is full, the oldest events are overwritten. Use a
+    `RingReader` to read the events, e.g. from a dashboard in another
+    process. The ring is not synced to disk unless `flush` is called, but
+    events are visible to readers as soon as they are written.
+
+    Parameters
+    ----------
+    path: str or PathLike
+        The ring file. An existing ring file is reused (it must have the
+        same capacity), recovering from a writer that crashed.
+    capacity: int
+        The size, in bytes, of the ring's data area, rounded up to 8 bytes.
+        Events larger than the ring are dropped and counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        capacity: int = 16 * 1024 * 1024,
+        *,
+        level: int = logging.NOTSET,
+        projection: Projection | None = None,
+    ) -> None:
+        """Initialize the sink, creating or opening the ring file."""
+        super().__init__(level)
+        if capacity < RECORD_HEADER.size:
+            msg = f"The ring capacity must be at least {RECORD_HEADER.size} bytes."
+            raise ValueError(msg)
+        self.path = Path(path)
+        self.capacity = (capacity + 7) & ~7
+        self.projection = projection
+        self.dropped = 0
+        self._file = self.path.open("r+b" if self.path.exists() else "w+b")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(HEADER_SIZE + self.capacity)
+            self._mmap: mmap.mmap | None = mmap.mmap(self._file.fileno(), 0)
+            self._mmap[:8] = MAGIC
+            _U32.pack_into(self._mmap, _VERSION_OFFSET, FORMAT_VERSION)
+            _U64.pack_into(self._mmap, _CAPACITY_OFFSET, self.capacity)
+        else:
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+            try:
+                existing = _read_ring_header(self._mmap, self.path)
+                if existing != self.capacity:
+                    msg = f"{self.path} has a capacity of {existing} bytes, not {self.capacity}."
+                    raise RingFormatError(msg)
+            except RingFormatError:
+                self._mmap.close()
+                self._file.close()
+                raise
+        self._head: int = _U64.unpack_from(self._mmap, _HEAD_OFFSET)[0]
+        self._tail: int = _U64.unpack_from(self._mmap, _TAIL_OFFSET)[0]
+        self._sequence: int = _U64.unpack_from(self._mmap, _SEQUENCE_OFFSET)[0]
+        self._seqlock: int = _U64.unpack_from(self._mmap, _SEQLOCK_OFFSET)[0]
+        if self._seqlock % 2:
+            self._recover(self._mmap)
+
+    def _recover(self, buffer: mmap.mmap) -> None:
+        """Drop a torn record left behind by a writer that crashed."""
+        head = self._tail
+        sequence = self._sequence
+        for _, next_position, record_sequence, payload in _scan(
+            buffer, self.capacity, self._tail, self._head
+        ):
+            if payload is None:
+                break
+            head = next_position
+            sequence = record_sequence + 1
+        self._head = head
+        self._sequence = max(sequence, self._sequence)
+        _U64.pack_into(buffer, _HEAD_OFFSET, self._head)
+        _U64.pack_into(buffer, _SEQUENCE_OFFSET, self._sequence)
+        self._seqlock += 1
+        _U64.pack_into(buffer, _SEQLOCK_OFFSET, self._seqlock)
+
+    def _make_room(self, buffer: mmap.mmap, size: int) -> None:
+        """Move the tail past the records that `size` more bytes would overwrite."""
+        capacity = self.capacity
+        tail = self._tail
+        while self._head + size - tail > capacity:
+            offset = tail % capacity
+            if capacity - offset < RECORD_HEADER.size:
+                tail += capacity - offset
+                continue
+            length = _U32.unpack_from(buffer, HEADER_SIZE + offset)[0]
+            tail += capacity - offset if length == WRAP_MARKER else _record_size(length)
+        if tail != self._tail:
+            self._tail = tail
+            _U64.pack_into(buffer, _TAIL_OFFSET, tail)
+
+    def write_events(self, events: t.Sequence[bytes]) -> None:
+        """Write a batch of events to the ring."""
+        buffer = self._mmap
+        if buffer is None:
+            msg = f"Cannot write events to a closed sink: {self.path}"
+            raise ValueError(msg)
+        capacity = self.capacity
+        # Readers retry while the counter is odd.
+        self._seqlock += 1
+        _U64.pack_into(buffer, _SEQLOCK_OFFSET, self._seqlock)
+        try:
+            for event in events:
+                size = _record_size(len(event))
+                if size > capacity:
+                    self.dropped += 1
+                    continue
+                offset = self._head % capacity
+                remaining = capacity - offset
+                wrap = size > remaining
+                self._make_room(buffer, remaining + size if wrap else size)
+                if wrap:
+                    if remaining >= _U32.size:
+                        _U32.pack_into(buffer, HEADER_SIZE + offset, WRAP_MARKER)
+                    self._head += remaining
+                    offset = 0
+                start = HEADER_SIZE + offset
+                RECORD_HEADER.pack_into(
+                    buffer, start, len(event), zlib.crc32(event), self._sequence
+                )
+                data_start = start + RECORD_HEADER.size
+                buffer[data_start : data_start + len(event)] = event
+                # The record is complete: publish it.
+                self._head += size
+                self._sequence += 1
+                _U64.pack_into(buffer, _HEAD_OFFSET, self._head)
+                _U64.pack_into(buffer, _SEQUENCE_OFFSET, self._sequence)
+        finally:
+            self._seqlock += 1
+            _U64.pack_into(buffer, _SEQLOCK_OFFSET, self._seqlock)
+
+    def flush(self) -> None:
+        """Sync the ring file to disk."""
+        self.acquire()
+        try:
+            if self._mmap is not None:
+                self._mmap.flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Close the ring file."""
+        self.acquire()
+        try:
+            if self._mmap is not None:
+                self._mmap.flush()
+                self._mmap.close()
+                self._mmap = None
+                self._file.close()
+        finally:
+            self.release()
+        super().close()
+
+
+class RingReader:
+    """Read the events of a ring file written by a `RingSink`.
+
+    Events are returned as memoryviews of the memory-mapped file, without
+    copying them. A view is only valid until the writer wraps around the ring
+    and overwrites it: use it (e.g. with ``json.loads(view.tobytes())``) or
+    copy it before reading more events.
+
+    Parameters
+    ----------
+    path: str or PathLike
+        The ring file.
+    from_start: bool
+        Whether `read` starts with the oldest event in the ring, rather than
+        only returning the events written after the reader was opened.
+
+    Attributes
+    ----------
+    lost: int
+        The number of events that were overwritten before they were read.
+    torn: int
+        The number of torn records found, i.e. records left incomplete by
+        a writer that crashed.
+    """
+
+    # How many times to retry reading the header while the writer updates it.
+    spin_count = 1000
+
+    def __init__(self, path: str | os.PathLike[str], from_start: bool = False) -> None:
+        """Open the ring file."""
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mmap: mmap.mmap | None = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.capacity = _read_ring_header(self._mmap, self.path)
+        except RingFormatError:
+            self._mmap.close()
+            raise
+        self.lost = 0
+        self.torn = 0
+        head, tail, sequence = self._read_header()
+        self._position = tail if from_start else head
+        self._next_sequence: int | None = None if from_start else sequence
+
+    def _read_header(self) -> tuple[int, int, int]:
+        """Read (head, tail, sequence) consistently, using the sequence lock.
+
+        If the writer stays in the middle of an update (e.g. it crashed),
+        the header is read anyway; records are still checked with their CRC.
+        """
+        buffer = self._mmap
+        if buffer is None:
+            msg = "The ring reader is closed."
+            raise ValueError(msg)
+        for attempt in range(self.spin_count):
+            before = _U64.unpack_from(buffer, _SEQLOCK_OFFSET)[0]
+            head, tail, sequence = struct.unpack_from("<QQQ", buffer, _HEAD_OFFSET)
+            after = _U64.unpack_from(buffer, _SEQLOCK_OFFSET)[0]
+            if before == after and not before % 2:
+                break
+            if attempt % 100 == 99:
+                time.sleep(0)
+        return head, tail, sequence
+
+    def _records(self, start: int, end: int) -> list[tuple[int, int, memoryview]]:
+        """Read the (position, sequence number, payload) of the records between two positions."""
+        records = []
+        torn_at = None
+        for position, _, sequence, payload in _scan(self._mmap, self.capacity, start, end):
+            if payload is None:
+                torn_at = position
+                break
+            records.append((position, sequence, payload))
+        # Drop the records the writer overwrote while they were being read.
+        _, tail, _ = self._read_header()
+        if torn_at is not None and torn_at >= tail:
+            self.torn += 1
+        while records and records[0][0] < tail:
+            records.pop(0)
+        return records
+
+    def last(self, n: int) -> list[memoryview]:
+        """Return the latest `n` events in the ring, oldest first."""
+        if n <= 0:
+            return []
+        head, tail, _ = self._read_header()
+        records = self._records(tail, head)
+        return [payload for _, _, payload in records[-n:]]
+
+    def read(self) -> list[memoryview]:
+        """Return the events written since the last call, oldest first."""
+        head, tail, _ = self._read_header()
+        records = self._records(max(self._position, tail), head)
+        if records:
+            # Gaps in the sequence numbers are events that were overwritten.
+            if self._next_sequence is not None:
+                self.lost += max(records[0][1] - self._next_sequence, 0)
+            self._next_sequence = records[-1][1] + 1
+        self._position = head
+        return [payload for _, _, payload in records]
+
+    def follow(self, poll_interval: float = 0.1) -> t.Iterator[memoryview]:
+        """Yield events as they are written, polling the ring every `poll_interval` seconds."""
+        while True:
+            events = self.read()
+            if not events:
+                time.sleep(poll_interval)
+            yield from events
+
+    def close(self) -> None:
+        """Close the ring file."""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Events returned by the reader are still in use; the file
+                # is unmapped once they are released.
+                pass
+            self._mmap = None
+
+    def __enter__(self) -> RingReader:  # noqa: PYI034
+        """Enter a context that closes the reader."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the reader."""
+        self.close()
@@ -0,0 +1,429 @@
+"""An event sink writing compressed, indexed segments, and their reader.
+
+Events are grouped into blocks, each compressed on its own (as a gzip member
+or an xz stream) and appended to the current segment file, so a segment is
+a regular ``.jsonl.gz`` or ``.jsonl.xz`` file that standard tools can read.
+Next to each segment, a small JSON index records the offset and size of
+every block, the earliest and latest ``__timestamp__`` and the ``__schema__``
+values of the events in the segment and in each block. Readers use the
+indexes to skip segments and blocks that cannot hold the events they want.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import lzma
+import os
+import re
+import threading
+import typing as t
+import weakref
+from datetime import datetime, timezone
+from pathlib import Path
+from time import monotonic
+
+from ..writer import BackgroundWriter
+from .base import EventSink
+
+if t.TYPE_CHECKING:
+    from ..projections import Projection
+
+INDEX_SUFFIX = ".index.json"
+INDEX_FORMAT_VERSION = 1
+
+COMPRESSIONS: dict[str, tuple[str, t.Callable[[bytes, int], bytes], t.Callable[[bytes], bytes]]] = {
+    "gzip": (".jsonl.gz", gzip.compress, gzip.decompress),
+    "lzma": (".jsonl.xz", lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+
+# The metadata fields are found with a regular expression rather than
+# by parsing every event.
+_TIMESTAMP = re.compile(rb'"__timestamp__"\s*:\s*"([^"]*)"')
+_SCHEMA = re.compile(rb'"__schema__"\s*:\s*"([^"\\]*(?:\\.[^"\\]*)*)"')
+
+
+def _parse_timestamp(value: str | datetime) -> datetime:
+    """Parse an event timestamp, e.g. ``2024-01-01T12:00:00+00:00Z``.
+
+    Timestamps without a timezone are taken to be in UTC.
+    """
+    if not isinstance(value, datetime):
+        # Events are emitted with a "Z" after the UTC offset.
+        value = datetime.fromisoformat(value.removesuffix("Z"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class _Summary:
+    """The number, time range and schemas of a group of events."""
+
+    def __init__(self) -> None:
+        self.events = 0
+        self.first: datetime | None = None
+        self.last: datetime | None = None
+        self.first_timestamp: str | None = None
+        self.last_timestamp: str | None = None
+        self.schemas: set[str] = set()
+
+    def add_timestamp(self, timestamp: str, parsed: datetime) -> None:
+        if self.first is None or parsed < self.first:
+            self.first, self.first_timestamp = parsed, timestamp
+        if self.last is None or parsed > self.last:
+            self.last, self.last_timestamp = parsed, timestamp
+
+    def add(self, other: _Summary) -> None:
+        self.events += other.events
+        self.schemas |= other.schemas
+        for timestamp, parsed in (
+            (other.first_timestamp, other.first),
+            (other.last_timestamp, other.last),
+        ):
+            if timestamp is not None and parsed is not None:
+                self.add_timestamp(timestamp, parsed)
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "events": self.events,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "schemas": sorted(self.schemas),
+        }
+
+
+def _summarize(lines: t.Sequence[bytes]) -> _Summary:
+    summary = _Summary()
+    summary.events = len(lines)
+    # Events emitted together share their timestamp and schema, so
+    # each distinct value is only decoded once.
+    timestamps: set[bytes] = set()
+    schemas: set[bytes] = set()
+    for line in lines:
+        match = _TIMESTAMP.search(line)
+        if match is not None:
+            timestamps.add(match.group(1))
+        match = _SCHEMA.search(line)
+        if match is not None:
+            schemas.add(match.group(1))
+    summary.schemas = {json.loads(b'"' + schema + b'"') for schema in schemas}
+    for raw in timestamps:
+        timestamp = raw.decode("utf-8")
+        try:
+            summary.add_timestamp(timestamp, _parse_timestamp(timestamp))
+        except ValueError:
+            continue
+    return summary
+
+
+class _Segment:
+    """A segment file being written, and its index."""
+
+    def __init__(self, path: Path, compression: str) -> None:
+        self.path = path
+        self.index_path = path.with_name(path.name + INDEX_SUFFIX)
+        self.compression = compression
+        self.file = path.open("ab")
+        self.offset = self.file.seek(0, os.SEEK_END)
+        # Uncompressed bytes written to the segment.
+        self.size = 0
+        self.summary = _Summary()
+        self.blocks: list[dict[str, t.Any]] = []
+
+    def write_block(self, lines: t.Sequence[bytes], data: bytes, compressed: bytes) -> None:
+        self.file.write(compressed)
+        self.file.flush()
+        summary = _summarize(lines)
+        self.blocks.append({"offset": self.offset, "length": len(compressed), **summary.to_dict()})
+        self.offset += len(compressed)
+        self.size += len(data)
+        self.summary.add(summary)
+        self.write_index(complete=False)
+
+    def write_index(self, complete: bool) -> None:
+        index = {
+            "version": INDEX_FORMAT_VERSION,
+            "segment": self.path.name,
+            "compression": self.compression,
+            "complete": complete,
+            **self.summary.to_dict(),
+            "blocks": self.blocks,
+        }
+        # Replace the index atomically, so readers never see a partial one.
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(index), encoding="utf-8")
+        tmp_path.replace(self.index_path)
+
+    def close(self) -> None:
+        self.file.close()
+        self.write_index(complete=True)
+
+
+class SegmentSink(EventSink):
+    """A sink that writes events to compressed segment files in a directory.
+
+    Events are buffered into blocks of about `block_size` bytes. Full blocks,
+    and partial blocks whose oldest event has waited `flush_interval`
+    seconds, are compressed and written by a background thread, so emitting
+    events does not wait for compression. Once a segment holds `segment_size`
+    bytes of (uncompressed) events, a new segment is started. Segments are
+    named after the time they were started, e.g.
+    ``events-20240101-120000-000000.jsonl.gz``, with their index in
+    ``events-20240101-120000-000000.jsonl.gz.index.json``.
+
+    Use `read_segments` to read the events back.
+
+    Parameters
+    ----------
+    directory: str or PathLike
+        The directory holding the segments.
+    prefix: str
+        The prefix of the segment file names.
+    compression: str
+        "gzip" or "lzma".
+    compression_level: int
+        The compression level (the gzip level or the lzma preset).
+    segment_size: int
+        The size, in uncompressed bytes, at which a new segment is started.
+    block_size: int
+        The size, in uncompressed bytes, of the blocks compressed together.
+        Smaller blocks let readers skip more precisely, larger blocks
+        compress better.
+    flush_interval: float
+        The longest time, in seconds, that an event waits in a partial
+        block before the block is written. 0 only writes full blocks (and
+        the partial block on `flush` or `close`).
+    max_queue_size: int
+        The maximum number of blocks waiting to be compressed. Writing
+        events blocks while the queue is full.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        prefix: str = "events",
+        compression: str = "gzip",
+        compression_level: int = 6,
+        segment_size: int = 64 * 1024 * 1024,
+        block_size: int = 1024 * 1024,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 16,
+        level: int = logging.NOTSET,
+        projection: Projection | None = None,
+    ) -> None:
+        """Initialize the sink and start its compression thread."""
+        super().__init__(level)
+        if compression not in COMPRESSIONS:
+            msg = f"Unknown compression {compression!r}; expected one of {', '.join(COMPRESSIONS)}."
+            raise ValueError(msg)
+        if segment_size < 1 or block_size < 1:
+            msg = "segment_size and block_size must be positive."
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.compression = compression
+        self.compression_level = compression_level
+        self.segment_size = segment_size
+        self.block_size = block_size
+        self.flush_interval = flush_interval
+        self.projection = projection
+        self._suffix, self._compress, _ = COMPRESSIONS[compression]
+        # The block being filled, each event with its trailing newline.
+        self._block: list[bytes] = []
+        self._block_bytes = 0
+        # When the oldest event of the block was written.
+        self._block_since = 0.0
+        # The segment being written; only used by the writer thread.
+        self._segment: _Segment | None = None
+        self._writer: BackgroundWriter | None = BackgroundWriter(
+            self._write_blocks,
+            max_queue_size=max_queue_size,
+            batch_size=1,
+            flush_interval=0,
+            name="jupyter-events-segment-sink",
+        )
+        # Submits partial blocks that have waited flush_interval, even when
+        # no more events are written.
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._run_flusher,
+                args=(weakref.ref(self), self._stop, flush_interval),
+                name="jupyter-events-segment-sink-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    @staticmethod
+    def _run_flusher(
+        ref: weakref.ref[SegmentSink], stop: threading.Event, flush_interval: float
+    ) -> None:
+        # Only holds a weak reference, so that the thread does not keep
+        # the sink alive; it exits once the sink is closed or collected.
+        while not stop.wait(flush_interval / 2):
+            sink = ref()
+            if sink is None:
+                return
+            if sink._block and monotonic() - sink._block_since >= flush_interval:
+                sink.acquire()
+                try:
+                    sink._submit_block()
+                finally:
+                    sink.release()
+            del sink
+
+    def write_events(self, events: t.Sequence[bytes]) -> None:
+        """Add a batch of events to the current block."""
+        if self._writer is None:
+            msg = f"Cannot write events to a closed sink: {self.directory}"
+            raise ValueError(msg)
+        block = self._block
+        if not block:
+            self._block_since = monotonic()
+        for event in events:
+            block.append(event + b"\n")
+            self._block_bytes += len(event) + 1
+            if self._block_bytes >= self.block_size:
+                self._submit_block()
+                block = self._block
+                self._block_since = monotonic()
+        if (
+            block
+            and self.flush_interval > 0
+            and monotonic() - self._block_since >= self.flush_interval
+        ):
+            self._submit_block()
+
+    def _submit_block(self) -> None:
+        if self._block and self._writer is not None:
+            self._writer.submit(self._block)
+            self._block = []
+            self._block_bytes = 0
+
+    def _write_blocks(self, blocks: list[list[bytes]]) -> None:
+        """Compress blocks and append them to the segments; runs in the writer thread."""
+        for lines in blocks:
+            data = b"".join(lines)
+            compressed = self._compress(data, self.compression_level)
+            segment = self._segment
+            if segment is None:
+                segment = self._segment = self._new_segment()
+            segment.write_block(lines, data, compressed)
+            if segment.size >= self.segment_size:
+                segment.close()
+                self._segment = None
+
+    def _new_segment(self) -> _Segment:
+        stamp = datetime.now(tz=timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+        path = self.directory / f"{self.prefix}-{stamp}{self._suffix}"
+        index = 0
+        while path.exists():
+            # Started twice within a microsecond.
+            index += 1
+            path = self.directory / f"{self.prefix}-{stamp}-{index}{self._suffix}"
+        return _Segment(path, self.compression)
+
+    def segments(self) -> list[Path]:
+        """The segment files in the directory, oldest first."""
+        return sorted(self.directory.glob(f"{self.prefix}-*{self._suffix}"))
+
+    def flush(self) -> None:
+        """Compress and write the events written so far."""
+        self.acquire()
+        try:
+            self._submit_block()
+            writer = self._writer
+        finally:
+            self.release()
+        if writer is not None:
+            writer.flush()
+
+    def close(self) -> None:
+        """Write the remaining events, finish the current segment and stop the thread."""
+        self._stop.set()
+        self.acquire()
+        try:
+            self._submit_block()
+            writer, self._writer = self._writer, None
+        finally:
+            self.release()
+        if writer is not None:
+            writer.close()
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        super().close()
+
+
+def _overlaps(
+    summary: dict[str, t.Any],
+    since: datetime | None,
+    until: datetime | None,
+    schema_ids: set[str] | None,
+) -> bool:
+    """Whether a segment or block, summarized in its index, may hold matching events."""
+    if schema_ids is not None and not schema_ids.intersection(summary["schemas"]):
+        return False
+    last, first = summary["last_timestamp"], summary["first_timestamp"]
+    if since is not None and last is not None and _parse_timestamp(last) < since:
+        return False
+    return until is None or first is None or _parse_timestamp(first) <= until
+
+
+def read_segments(
+    directory: str | os.PathLike[str],
+    prefix: str = "events",
+    *,
+    since: str | datetime | None = None,
+    until: str | datetime | None = None,
+    schema_ids: t.Iterable[str] | None = None,
+) -> t.Iterator[dict[str, t.Any]]:
+    """Read the events written by a `SegmentSink`, oldest segment first.
+
+    Segments and blocks whose index shows that they hold no matching events
+    are skipped without being read or decompressed.
+
+    Parameters
+    ----------
+    directory: str or PathLike
+        The directory holding the segments.
+    prefix: str
+        The prefix of the segment file names.
+    since, until: str or datetime, optional
+        Only read events whose ``__timestamp__`` is within this range
+        (inclusive). Times without a timezone are taken to be in UTC.
+    schema_ids: iterable of str, optional
+        Only read events with one of these ``__schema__`` values.
+    """
+    since_time = None if since is None else _parse_timestamp(since)
+    until_time = None if until is None else _parse_timestamp(until)
+    schemas = None if schema_ids is None else set(schema_ids)
+    for index_path in sorted(Path(directory).glob(f"{prefix}-*{INDEX_SUFFIX}")):
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        if not _overlaps(index, since_time, until_time, schemas):
+            continue
+        decompress = COMPRESSIONS[index["compression"]][2]
+        with index_path.with_name(index["segment"]).open("rb") as f:
+            for block in index["blocks"]:
+                if not _overlaps(block, since_time, until_time, schemas):
+                    continue
+                f.seek(block["offset"])
+                for line in decompress(f.read(block["length"])).splitlines():
+                    event = json.loads(line)
+                    if schemas is not None and event.get("__schema__") not in schemas:
+                        continue
+                    if since_time is not None or until_time is not None:
+                        timestamp = event.get("__timestamp__")
+                        if timestamp is None:
+                            continue
+                        parsed = _parse_timestamp(timestamp)
+                        if since_time is not None and parsed < since_time:
+                            continue
+                        if until_time is not None and parsed > until_time:
+                            continue
+                    yield event
@@ -1,35 +1,45 @@
-"""Event validators."""
+"""Event validators.
+
+The meta-schemas are loaded from JSON copies of the YAML files in
+``jupyter_events/schemas``, which are much faster to load. The validators,
+and jsonschema itself, are only imported the first time they are used.
+"""
 from __future__ import annotations
 
+import json
 import pathlib
 import warnings
-from typing import Any
-
-import jsonschema
-from jsonschema import Draft7Validator, ValidationError
-from referencing import Registry
-from referencing.jsonschema import DRAFT7
+from typing import TYPE_CHECKING, Any, Callable
 
-from . import yaml
 from .utils import JupyterEventsVersionWarning
 
-draft7_format_checker = (
-    Draft7Validator.FORMAT_CHECKER
-    if hasattr(Draft7Validator, "FORMAT_CHECKER")
-    else jsonschema.draft7_format_checker
-)
+if TYPE_CHECKING:
+    from jsonschema import Draft7Validator, FormatChecker
+    from referencing import Registry, Resource
+
+    draft7_format_checker: FormatChecker
+    resources: list[Resource[Any]]
+    METASCHEMA_REGISTRY: Registry[Any]
+    JUPYTER_EVENTS_SCHEMA_VALIDATOR: Draft7Validator
+    JUPYTER_EVENTS_CORE_VALIDATOR: Draft7Validator
 
 
 METASCHEMA_PATH = pathlib.Path(__file__).parent.joinpath("schemas")
 
+
+def _load_metaschema(name: str) -> dict[str, Any]:
+    with METASCHEMA_PATH.joinpath(f"{name}.json").open(encoding="utf-8") as f:
+        return json.load(f)  # type:ignore[no-any-return]
+
+
 EVENT_METASCHEMA_FILEPATH = METASCHEMA_PATH.joinpath("event-metaschema.yml")
-EVENT_METASCHEMA = yaml.load(EVENT_METASCHEMA_FILEPATH)
+EVENT_METASCHEMA = _load_metaschema("event-metaschema")
 
 EVENT_CORE_SCHEMA_FILEPATH = METASCHEMA_PATH.joinpath("event-core-schema.yml")
-EVENT_CORE_SCHEMA = yaml.load(EVENT_CORE_SCHEMA_FILEPATH)
+EVENT_CORE_SCHEMA = _load_metaschema("event-core-schema")
 
 PROPERTY_METASCHEMA_FILEPATH = METASCHEMA_PATH.joinpath("property-metaschema.yml")
-PROPERTY_METASCHEMA = yaml.load(PROPERTY_METASCHEMA_FILEPATH)
+PROPERTY_METASCHEMA = _load_metaschema("property-metaschema")
 
 SCHEMA_STORE = {
     EVENT_METASCHEMA["$id"]: EVENT_METASCHEMA,
@@ -37,27 +47,77 @@ SCHEMA_STORE = {
     EVENT_CORE_SCHEMA["$id"]: EVENT_CORE_SCHEMA,
 }
 
-resources = [
-    DRAFT7.create_resource(each)
-    for each in (EVENT_METASCHEMA, PROPERTY_METASCHEMA, EVENT_CORE_SCHEMA)
-]
-METASCHEMA_REGISTRY: Registry[Any] = resources @ Registry()
 
-JUPYTER_EVENTS_SCHEMA_VALIDATOR = Draft7Validator(
-    schema=EVENT_METASCHEMA,
-    registry=METASCHEMA_REGISTRY,
-    format_checker=draft7_format_checker,
-)
+def _draft7_format_checker() -> FormatChecker:
+    import jsonschema
+    from jsonschema import Draft7Validator
+
+    return (
+        Draft7Validator.FORMAT_CHECKER
+        if hasattr(Draft7Validator, "FORMAT_CHECKER")
+        else jsonschema.draft7_format_checker
+    )
+
+
+def _resources() -> list[Resource[Any]]:
+    from referencing.jsonschema import DRAFT7
+
+    return [
+        DRAFT7.create_resource(each)
+        for each in (EVENT_METASCHEMA, PROPERTY_METASCHEMA, EVENT_CORE_SCHEMA)
+    ]
+
+
+def _metaschema_registry() -> Registry[Any]:
+    from referencing import Registry
+
+    registry: Registry[Any] = _get("resources") @ Registry()
+    return registry
 
-JUPYTER_EVENTS_CORE_VALIDATOR = Draft7Validator(
-    schema=EVENT_CORE_SCHEMA,
-    registry=METASCHEMA_REGISTRY,
-    format_checker=draft7_format_checker,
-)
+
+def _validator(schema: dict[str, Any]) -> Callable[[], Draft7Validator]:
+    def build() -> Draft7Validator:
+        from jsonschema import Draft7Validator
+
+        return Draft7Validator(
+            schema=schema,
+            registry=_get("METASCHEMA_REGISTRY"),
+            format_checker=_get("draft7_format_checker"),
+        )
+
+    return build
+
+
+# Attributes that are built on first access.
+_LAZY_ATTRIBUTES: dict[str, Callable[[], Any]] = {
+    "draft7_format_checker": _draft7_format_checker,
+    "resources": _resources,
+    "METASCHEMA_REGISTRY": _metaschema_registry,
+    "JUPYTER_EVENTS_SCHEMA_VALIDATOR": _validator(EVENT_METASCHEMA),
+    "JUPYTER_EVENTS_CORE_VALIDATOR": _validator(EVENT_CORE_SCHEMA),
+}
+
+
+def _get(name: str) -> Any:
+    """Get a lazy attribute, building it if needed."""
+    try:
+        return globals()[name]
+    except KeyError:
+        value = globals()[name] = _LAZY_ATTRIBUTES[name]()
+        return value
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    return _get(name)
 
 
 def validate_schema(schema: dict[str, Any]) -> None:
     """Validate a schema dict."""
+    from jsonschema import ValidationError
+
     try:
         # If the `version` attribute is an integer, coerce to string.
         # TODO: remove this in a future version.
@@ -71,7 +131,7 @@ def validate_schema(schema: dict[str, Any]) -> None:
             )
             warnings.warn(JupyterEventsVersionWarning(msg), stacklevel=2)
         # Validate the schema against Jupyter Events metaschema.
-        JUPYTER_EVENTS_SCHEMA_VALIDATOR.validate(schema)
+        _get("JUPYTER_EVENTS_SCHEMA_VALIDATOR").validate(schema)
     except ValidationError as err:
         reserved_property_msg = " does not match '^(?!__.*)'"
         if reserved_property_msg in str(err):
@@ -0,0 +1,141 @@
+"""A background thread that writes events to handlers in batches."""
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import typing as t
+import weakref
+from time import monotonic
+
+# Writers that are still running; they are drained when the interpreter exits.
+_writers: weakref.WeakSet[BackgroundWriter] = weakref.WeakSet()
+
+
+@atexit.register
+def _close_writers() -> None:
+    for writer in list(_writers):
+        writer.close()
+
+
+class _Marker:
+    """A control message placed in the queue alongside the events."""
+
+    def __init__(self, stop: bool = False) -> None:
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class BackgroundWriter:
+    """Drain a bounded queue of events to a write callback in a dedicated thread.
+
+    Parameters
+    ----------
+    write: callable
+        Called from the writer thread with a list of queued items.
+    max_queue_size: int
+        The maximum number of queued items. `submit` blocks while the queue is full.
+    batch_size: int
+        The maximum number of items passed to `write` at once.
+    flush_interval: float
+        The longest time, in seconds, that an item waits in the queue for
+        a batch to fill up before it is written.
+    log: logging.Logger, optional
+        The logger used to report errors raised by `write`.
+    """
+
+    def __init__(
+        self,
+        write: t.Callable[[list[t.Any]], None],
+        *,
+        max_queue_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        log: logging.Logger | None = None,
+        name: str = "jupyter-events-writer",
+    ) -> None:
+        """Initialize and start the writer thread."""
+        if batch_size < 1:
+            msg = "batch_size must be at least 1."
+            raise ValueError(msg)
+        self._write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.log = log or logging.getLogger(__name__)
+        self._queue: queue.Queue[t.Any] = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        _writers.add(self)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the writer has been closed."""
+        return self._closed
+
+    @property
+    def queue_depth(self) -> int:
+        """The approximate number of queued items."""
+        return self._queue.qsize()
+
+    def submit(self, item: t.Any) -> None:
+        """Queue an item, blocking while the queue is full."""
+        if self._closed:
+            msg = "Cannot submit events to a closed writer."
+            raise RuntimeError(msg)
+        self._queue.put(item)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Write all the items queued so far.
+
+        Returns False if they were not written within `timeout` seconds.
+        """
+        if self._closed:
+            return True
+        marker = _Marker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write all queued items and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        _writers.discard(self)
+        marker = _Marker(stop=True)
+        self._queue.put(marker)
+        self._thread.join(timeout)
+
+    def _write_batch(self, batch: list[t.Any]) -> None:
+        if not batch:
+            return
+        try:
+            self._write(batch)
+        except Exception:
+            self.log.exception("Failed to write a batch of %d events.", len(batch))
+
+    def _run(self) -> None:
+        get = self._queue.get
+        while True:
+            batch: list[t.Any] = []
+            marker = None
+            item = get()
+            deadline = monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, _Marker):
+                    marker = item
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - monotonic()
+                try:
+                    item = get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+            if marker is not None:
+                marker.done.set()
+                if marker.stop:
+                    return
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.schema_registry import (
+    ENTRY_POINT_GROUP,
+    SchemaRegistrationError,
+    SchemaRegistry,
+)
+
+from .utils import SCHEMA_PATH
+
+SCHEMA = """\
+$id: http://event.jupyter.org/{name}
+version: "1"
+type: object
+properties:
+  prop:
+    title: Prop
+    type: string
+"""
+
+GOOD_FILES = [SCHEMA_PATH / "good" / "basic.yaml", SCHEMA_PATH / "good" / "user.yaml"]
+
+
+def get_good_files():
+    """Used as an entry point."""
+    return GOOD_FILES
+
+
+def write_schemas(directory, names):
+    directory.mkdir(exist_ok=True)
+    for name in names:
+        (directory / f"{name}.yaml").write_text(SCHEMA.format(name=name))
+
+
+def test_register_directory(tmp_path):
+    names = [f"schema{i}" for i in range(10)]
+    write_schemas(tmp_path, names)
+    (tmp_path / "notes.txt").write_text("not a schema")
+    registry = SchemaRegistry()
+    report = registry.register_directory(tmp_path)
+
+    expected = [f"http://event.jupyter.org/{name}" for name in names]
+    assert sorted(report.schema_ids) == sorted(expected)
+    assert sorted(registry.schema_ids) == sorted(expected)
+    assert len(report.timings) == 10
+    assert list(report.source_timings()) == [str(tmp_path)]
+    assert report.elapsed > 0
+
+
+def test_register_directory_pattern(tmp_path):
+    write_schemas(tmp_path, ["top"])
+    write_schemas(tmp_path / "nested", ["nested"])
+    registry = SchemaRegistry()
+    registry.register_directory(tmp_path, pattern="**/*.yaml")
+    assert sorted(registry.schema_ids) == [
+        "http://event.jupyter.org/nested",
+        "http://event.jupyter.org/top",
+    ]
+
+
+def test_register_directory_reports_all_errors(tmp_path):
+    write_schemas(tmp_path, ["good"])
+    (tmp_path / "bad.yaml").write_text("$id: http://event.jupyter.org/bad\nproperties: 1\n")
+    (tmp_path / "worse.yaml").write_text("{{{")
+    registry = SchemaRegistry()
+    with pytest.raises(SchemaRegistrationError) as excinfo:
+        registry.register_directory(tmp_path)
+
+    assert sorted(excinfo.value.errors) == [
+        str(tmp_path / "bad.yaml"),
+        str(tmp_path / "worse.yaml"),
+    ]
+    # Nothing is registered when any schema fails.
+    assert registry.schema_ids == []
+
+
+def test_register_directory_duplicates(tmp_path):
+    write_schemas(tmp_path, ["one"])
+    # Identical copies are registered once.
+    (tmp_path / "copy.yaml").write_text(SCHEMA.format(name="one"))
+    (tmp_path / "other.yaml").write_text(SCHEMA.format(name="one").replace("Prop", "Other"))
+    registry = SchemaRegistry()
+    with pytest.raises(SchemaRegistrationError) as excinfo:
+        registry.register_directory(tmp_path)
+    assert len(excinfo.value.errors) == 1
+    assert registry.schema_ids == []
+
+    (tmp_path / "other.yaml").unlink()
+    report = registry.register_directory(tmp_path)
+    assert report.schema_ids == ["http://event.jupyter.org/one"]
+
+
+def test_register_entry_points(monkeypatch, tmp_path):
+    write_schemas(tmp_path, ["from_directory"])
+    entry_points = [
+        EntryPoint("files", f"{__name__}:get_good_files", ENTRY_POINT_GROUP),
+        EntryPoint("directory", f"{__name__}:SCHEMA_DIRECTORY", ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr("jupyter_events.schema_registry._entry_points", lambda group: entry_points)
+    monkeypatch.setitem(globals(), "SCHEMA_DIRECTORY", str(tmp_path))
+
+    registry = SchemaRegistry()
+    report = registry.register_entry_points()
+    assert sorted(registry.schema_ids) == [
+        "http://event.jupyter.org/from_directory",
+        "http://event.jupyter.org/test",
+        "http://event.jupyter.org/user",
+    ]
+    assert sorted(report.source_timings()) == ["directory", "files"]
+
+
+def test_register_entry_points_load_error(monkeypatch):
+    entry_points = [EntryPoint("broken", "not_a_module_anywhere:schemas", ENTRY_POINT_GROUP)]
+    monkeypatch.setattr("jupyter_events.schema_registry._entry_points", lambda group: entry_points)
+    registry = SchemaRegistry()
+    with pytest.raises(SchemaRegistrationError) as excinfo:
+        registry.register_entry_points()
+    assert list(excinfo.value.errors) == ["entry point broken"]
+
+
+def test_logger_register_directory(tmp_path, caplog):
+    write_schemas(tmp_path, ["one", "two"])
+    el = EventLogger(handlers=[logging.NullHandler()])
+    with caplog.at_level(logging.DEBUG, logger=el.log.name):
+        el.register_event_schema_directory(tmp_path)
+
+    assert f"Loaded 2 event schema(s) from {tmp_path}" in caplog.text
+    capsule = el.emit(schema_id="http://event.jupyter.org/one", data={"prop": "value"})
+    assert capsule is not None
+    assert capsule["__schema__"] == "http://event.jupyter.org/one"
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from jupyter_events import cache as cache_module
+from jupyter_events.cache import CACHE_DIR_ENV, SchemaCache
+from jupyter_events.logger import EventLogger
+from jupyter_events.schema import EventSchema, EventSchemaFileAbsent
+from jupyter_events.utils import JupyterEventsVersionWarning
+
+SCHEMA = """\
+$id: http://event.jupyter.org/cached
+version: "1"
+type: object
+properties:
+  prop:
+    title: Prop
+    type: string
+"""
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text(SCHEMA)
+    return path
+
+
+@pytest.fixture
+def schema_cache(tmp_path):
+    return SchemaCache(tmp_path / "cache")
+
+
+def load(schema_file, schema_cache):
+    """Load a schema, returning it and whether it came from the cache."""
+    with patch("jupyter_events.schema.validate_schema") as validate_schema:
+        schema = EventSchema(schema_file, cache=schema_cache)
+    return schema, not validate_schema.called
+
+
+def test_cache_hit(schema_file, schema_cache):
+    schema, cached = load(schema_file, schema_cache)
+    assert not cached
+    assert len(list(schema_cache.directory.iterdir())) == 1
+
+    schema, cached = load(schema_file, schema_cache)
+    assert cached
+    assert schema.id == "http://event.jupyter.org/cached"
+    schema.validate({"prop": "value"})
+
+
+def test_cache_invalidated_by_content(schema_file, schema_cache):
+    load(schema_file, schema_cache)
+    schema_file.write_text(SCHEMA.replace('"1"', '"2"'))
+    schema, cached = load(schema_file, schema_cache)
+    assert not cached
+    assert schema.version == "2"
+
+
+@pytest.mark.parametrize(
+    "attribute,value",
+    [("__version__", "0.0.0"), ("metaschema_hash", lambda: "changed")],
+)
+def test_cache_invalidated_by_versions(schema_file, schema_cache, monkeypatch, attribute, value):
+    load(schema_file, schema_cache)
+    monkeypatch.setattr(cache_module, attribute, value)
+    _, cached = load(schema_file, schema_cache)
+    assert not cached
+
+
+def test_cache_entry_corrupted(schema_file, schema_cache):
+    load(schema_file, schema_cache)
+    for entry in schema_cache.directory.iterdir():
+        entry.write_text("{not json")
+    schema, cached = load(schema_file, schema_cache)
+    assert not cached
+    assert schema.id == "http://event.jupyter.org/cached"
+
+
+def test_coerced_version_not_cached(schema_file, schema_cache):
+    schema_file.write_text(SCHEMA.replace('"1"', "1"))
+    for _ in range(2):
+        with pytest.warns(JupyterEventsVersionWarning):
+            EventSchema(schema_file, cache=schema_cache)
+    assert not schema_cache.directory.exists()
+
+
+def test_unwritable_cache(schema_file, tmp_path):
+    # A file where the cache directory should be.
+    blocked = tmp_path / "blocked"
+    blocked.write_text("")
+    schema = EventSchema(schema_file, cache=SchemaCache(blocked / "cache"))
+    assert schema.id == "http://event.jupyter.org/cached"
+
+
+def test_missing_schema_file(tmp_path, schema_cache):
+    with pytest.raises(EventSchemaFileAbsent):
+        EventSchema(tmp_path / "missing.yaml", cache=schema_cache)
+
+
+def test_clear(schema_file, schema_cache):
+    load(schema_file, schema_cache)
+    assert schema_cache.clear() == 1
+    _, cached = load(schema_file, schema_cache)
+    assert not cached
+
+
+def test_clear_keeps_other_files(schema_file, schema_cache):
+    load(schema_file, schema_cache)
+    foreign = schema_cache.directory / "package.json"
+    foreign.write_text("{}")
+    leftover = schema_cache.directory / ".entry-abc.tmp"
+    leftover.write_text("{")
+    assert schema_cache.clear() == 1
+    assert foreign.read_text() == "{}"
+    assert not leftover.exists()
+
+
+def test_logger_cache_from_environment(schema_file, tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    for _ in range(2):
+        el = EventLogger(handlers=[logging.NullHandler()])
+        el.register_event_schema(schema_file)
+    assert el.schemas.cache is not None
+    assert el.schemas.cache.directory == tmp_path / "cache"
+    assert len(list(el.schemas.cache.directory.iterdir())) == 1
+
+
+def test_logger_cache_disabled_by_default(monkeypatch):
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    assert EventLogger().schemas.cache is None
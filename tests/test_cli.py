@@ -5,7 +5,9 @@ import os
 import pytest
 
 import jupyter_events
+from jupyter_events.cache import CACHE_DIR_ENV, SchemaCache
 from jupyter_events.cli import RC
+from jupyter_events.schema import EventSchema
 
 from .utils import SCHEMA_PATH
 
@@ -72,3 +74,14 @@ def test_cli_invalid(cli):
     assert not ret.success
     assert ret.returncode == RC.INVALID
     assert "The schema failed to validate" in ret.stderr.strip()
+
+
+def test_cli_clear_cache(cli, tmp_path):
+    cache = SchemaCache(tmp_path / "cache")
+    EventSchema(SCHEMA_PATH / "good/basic.yaml", cache=cache)
+    assert len(list(cache.directory.iterdir())) == 1
+
+    ret = cli("clear-cache", env={CACHE_DIR_ENV: str(cache.directory)})
+    assert ret.success
+    assert "Removed 1 cached schema" in ret.stdout
+    assert list(cache.directory.iterdir()) == []
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import pytest
+from jsonschema import Draft7Validator
+from jsonschema.exceptions import ValidationError
+from referencing import Registry
+from referencing.jsonschema import DRAFT7
+
+from jupyter_events import yaml
+from jupyter_events.compiler import CompiledValidator, SchemaCompilationError
+from jupyter_events.schema import EventSchema
+from jupyter_events.validators import draft7_format_checker
+
+from .utils import SCHEMA_PATH
+
+SCHEMA = {
+    "$id": "http://event.jupyter.org/compiled",
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "name": {"title": "Name", "type": "string", "minLength": 1, "maxLength": 8},
+        "code": {"title": "Code", "type": "string", "pattern": "^[a-z]+$"},
+        "status": {"title": "Status", "enum": ["success", "failure", None]},
+        "count": {"title": "Count", "type": "integer", "minimum": 0, "exclusiveMaximum": 10},
+        "ratio": {"title": "Ratio", "type": ["number", "null"], "maximum": 1},
+        "flag": {"title": "Flag", "const": True},
+        "when": {"title": "When", "type": "string", "format": "date-time"},
+        "tags": {
+            "title": "Tags",
+            "type": "array",
+            "minItems": 1,
+            "items": {"title": "Tag", "type": "string"},
+        },
+        "meta": {
+            "title": "Meta",
+            "type": "object",
+            "properties": {"key": {"title": "Key", "type": "string"}},
+            "required": ["key"],
+            "additionalProperties": False,
+        },
+    },
+    "required": ["name"],
+}
+
+INSTANCES = [
+    {"name": "a"},
+    {"name": ""},
+    {"name": "way too long"},
+    {},
+    [],
+    "not an object",
+    {"name": "a", "code": "abc"},
+    {"name": "a", "code": "ABC"},
+    {"name": "a", "status": "success"},
+    {"name": "a", "status": None},
+    {"name": "a", "status": "unknown"},
+    {"name": "a", "count": 3},
+    {"name": "a", "count": 3.0},
+    {"name": "a", "count": 3.5},
+    {"name": "a", "count": True},
+    {"name": "a", "count": -1},
+    {"name": "a", "count": 10},
+    {"name": "a", "ratio": 0.5},
+    {"name": "a", "ratio": None},
+    {"name": "a", "ratio": 2},
+    {"name": "a", "flag": True},
+    {"name": "a", "flag": 1},
+    {"name": "a", "when": "2023-01-01T00:00:00Z"},
+    {"name": "a", "when": "chucknorris"},
+    {"name": "a", "tags": ["x", "y"]},
+    {"name": "a", "tags": []},
+    {"name": "a", "tags": ["x", 1]},
+    {"name": "a", "meta": {"key": "value"}},
+    {"name": "a", "meta": {}},
+    {"name": "a", "meta": {"key": "value", "other": 1}},
+    {"name": "a", "extra": {"anything": [1, 2, 3]}},
+]
+
+
+def compile_schema(schema):
+    return CompiledValidator.from_schema(schema, draft7_format_checker)
+
+
+@pytest.mark.parametrize("instance", INSTANCES)
+def test_compiled_matches_draft7(instance):
+    compiled = compile_schema(SCHEMA)
+    validator = Draft7Validator(SCHEMA, format_checker=draft7_format_checker)
+    assert compiled.is_valid(instance) == validator.is_valid(instance)
+
+
+@pytest.mark.parametrize(
+    "schema_file,instance",
+    [
+        ("basic.yaml", {"prop": "hello"}),
+        ("basic.yaml", {"prop": 1}),
+        ("array.yaml", {"users": [{"email": "a@b.c", "id": "1"}]}),
+        ("array.yaml", {"users": [{"email": 1}]}),
+        ("nested-array.yaml", {"users": [{"name": "a", "hobbies": [{"sport": "golf"}]}]}),
+        ("nested-array.yaml", {"users": [{"name": "a", "hobbies": [{"sport": None}]}]}),
+        ("nested-array.yaml", {"users": {"name": "a"}}),
+    ],
+)
+def test_good_schemas_compile(schema_file, instance):
+    schema = yaml.load(SCHEMA_PATH / "good" / schema_file)
+    compiled = compile_schema(schema)
+    assert compiled.is_valid(instance) == Draft7Validator(schema).is_valid(instance)
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"anyOf": [{"type": "string"}, {"type": "null"}]},
+        {"properties": {"a": {"$ref": "#/definitions/a"}}},
+        {"items": [{"type": "string"}]},
+        {"enum": [{"a": 1}]},
+        {"type": "complex"},
+        {"minLength": 1.5},
+        {"maxItems": "2"},
+        {"maximum": float("inf")},
+        {"exclusiveMinimum": float("nan")},
+        {"pattern": "\\p{L}+"},
+        {"pattern": 5},
+    ],
+)
+def test_unsupported_schemas(schema):
+    with pytest.raises(SchemaCompilationError):
+        compile_schema(schema)
+
+
+@pytest.mark.parametrize(
+    "keywords,instances",
+    [
+        ("minLength: 1.5", ["a", "ab"]),
+        ("maxLength: 1.5", ["a", "ab"]),
+        ("minLength: 2.0", ["a", "ab"]),
+        ("minItems: 1.5", [["a"], ["a", "b"]]),
+        ("maxProperties: 0.5", [{}, {"a": 1}]),
+        ("maximum: .inf", [1, 1e308]),
+        ("minimum: -.inf", [-1, -1e308]),
+        ("exclusiveMaximum: .nan", [0, 1.5]),
+    ],
+)
+def test_event_schema_matches_draft7(keywords, instances):
+    definition = yaml.loads(
+        "$id: http://event.jupyter.org/bounds\n"
+        "version: '1'\n"
+        "properties:\n"
+        f"  thing: {{title: Thing, {keywords}}}\n"
+    )
+    schema = EventSchema(definition)
+    validator = Draft7Validator(definition)
+    for instance in instances:
+        data = {"thing": instance}
+        try:
+            schema.validate(data)
+        except ValidationError:
+            valid = False
+        else:
+            valid = True
+        assert valid == validator.is_valid(data), instance
+
+
+def test_event_schema_with_unsupported_pattern():
+    schema = EventSchema(
+        {
+            "$id": "http://event.jupyter.org/pattern",
+            "version": "1",
+            "properties": {
+                "name": {"title": "Name", "type": "string", "pattern": "\\p{L}+"},
+                "other": {"title": "Other", "type": "string"},
+            },
+        }
+    )
+    assert schema._compiled is None
+    schema.validate({"other": "value"})
+
+
+def test_event_schema_falls_back():
+    schema = EventSchema(
+        {
+            "$id": "http://event.jupyter.org/fallback",
+            "version": "1",
+            "properties": {
+                "thing": {"title": "Thing", "anyOf": [{"type": "string"}, {"type": "null"}]},
+            },
+        }
+    )
+    assert schema._compiled is None
+    schema.validate({"thing": None})
+    with pytest.raises(ValidationError):
+        schema.validate({"thing": 1})
+
+
+def test_event_schema_reports_errors():
+    schema = EventSchema(SCHEMA)
+    assert schema._compiled is not None
+    schema.validate({"name": "a", "status": "success"})
+    with pytest.raises(ValidationError) as err:
+        schema.validate({"name": "a", "status": "hi"})
+    assert "'hi' is not one of" in str(err.value)
+
+
+def test_event_schema_not_compiled():
+    schema = EventSchema(SCHEMA, compiled=False)
+    assert schema._compiled is None
+    schema.validate({"name": "a"})
+
+
+def test_references_inlined():
+    definitions = {
+        "$id": "http://event.jupyter.org/compiled-definitions",
+        "definitions": {
+            "name": {"type": "string", "minLength": 1},
+            "user": {"type": "object", "properties": {"name": {"$ref": "#/definitions/name"}}},
+        },
+    }
+    schema = {
+        "$id": "http://event.jupyter.org/compiled-refs",
+        "type": "object",
+        "definitions": {"count": {"type": "integer"}},
+        "properties": {
+            "user": {"$ref": "http://event.jupyter.org/compiled-definitions#/definitions/user"},
+            "count": {"$ref": "#/definitions/count"},
+        },
+    }
+    registry = Registry().with_resources(
+        (each["$id"], DRAFT7.create_resource(each)) for each in (definitions, schema)
+    )
+    compiled = CompiledValidator.from_schema(schema, draft7_format_checker, registry)
+    validator = Draft7Validator(schema, registry=registry)
+    for instance in [
+        {"user": {"name": "Ada"}, "count": 1},
+        {"user": {"name": ""}},
+        {"user": {"name": 1}},
+        {"count": "1"},
+    ]:
+        assert compiled.is_valid(instance) == validator.is_valid(instance)
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"properties": {"a": {"$ref": "http://event.jupyter.org/missing"}}},
+        {
+            "definitions": {"node": {"items": {"$ref": "#/definitions/node"}}},
+            "$ref": "#/definitions/node",
+        },
+    ],
+)
+def test_unsupported_references(schema):
+    with pytest.raises(SchemaCompilationError):
+        CompiledValidator.from_schema(schema, draft7_format_checker, Registry())
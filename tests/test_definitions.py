@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from jsonschema.exceptions import SchemaError, ValidationError
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.schema_registry import SchemaRegistry, SchemaRegistryException
+
+DEFINITIONS_ID = "http://event.jupyter.org/definitions"
+
+DEFINITIONS = {
+    "$id": DEFINITIONS_ID,
+    "definitions": {
+        "user": {
+            "type": "object",
+            "properties": {"name": {"type": "string"}},
+            "required": ["name"],
+        },
+    },
+}
+
+USER_REF = f"{DEFINITIONS_ID}#/definitions/user"
+
+
+def make_schema(name):
+    return {
+        "$id": f"http://event.jupyter.org/{name}",
+        "version": "1",
+        "type": "object",
+        "properties": {
+            "user": {"title": "User", "$ref": USER_REF},
+        },
+    }
+
+
+def test_shared_definitions():
+    registry = SchemaRegistry()
+    assert registry.register_definitions(DEFINITIONS) == DEFINITIONS_ID
+    assert registry.definition_ids == [DEFINITIONS_ID]
+    first = registry.register(make_schema("first"))
+    second = registry.register(make_schema("second"))
+
+    for schema in (first, second):
+        # The reference is inlined into the compiled validator.
+        assert schema._compiled is not None
+        schema.validate({"user": {"name": "Ada"}})
+        with pytest.raises(ValidationError):
+            schema.validate({"user": {}})
+
+
+def test_reference_other_schema():
+    registry = SchemaRegistry()
+    registry.register_definitions(DEFINITIONS)
+    registry.register(make_schema("first"))
+    schema = registry.register(
+        {
+            "$id": "http://event.jupyter.org/other",
+            "version": "1",
+            "properties": {
+                "user": {"title": "User", "$ref": "http://event.jupyter.org/first#/properties/user"}
+            },
+        }
+    )
+    with pytest.raises(ValidationError):
+        schema.validate({"user": {}})
+
+
+def test_schemas_with_references_not_shared():
+    first, second = SchemaRegistry(), SchemaRegistry()
+    first.register_definitions(DEFINITIONS)
+    other = dict(DEFINITIONS, definitions={"user": {"type": "string"}})
+    second.register_definitions(other)
+    first_schema = first.register(make_schema("first"))
+    second_schema = second.register(make_schema("first"))
+
+    assert first_schema is not second_schema
+    second_schema.validate({"user": "Ada"})
+    with pytest.raises(ValidationError):
+        first_schema.validate({"user": "Ada"})
+
+
+def test_register_definitions_again():
+    registry = SchemaRegistry()
+    registry.register_definitions(DEFINITIONS)
+    registry.register_definitions(dict(DEFINITIONS))
+    with pytest.raises(SchemaRegistryException, match="Different definitions"):
+        registry.register_definitions(dict(DEFINITIONS, definitions={}))
+
+
+@pytest.mark.parametrize(
+    "definitions,error",
+    [
+        ({"definitions": {}}, SchemaRegistryException),
+        ({"$id": DEFINITIONS_ID, "type": 1}, SchemaError),
+    ],
+)
+def test_invalid_definitions(definitions, error):
+    with pytest.raises(error):
+        SchemaRegistry().register_definitions(definitions)
+
+
+def test_unresolved_reference():
+    registry = SchemaRegistry()
+    schema = registry.register(make_schema("first"))
+    assert schema._compiled is None
+    # Definitions registered afterwards are still found by the full validator.
+    registry.register_definitions(DEFINITIONS)
+    with pytest.raises(ValidationError):
+        schema.validate({"user": {}})
+
+
+def test_logger_definitions():
+    el = EventLogger(handlers=[logging.NullHandler()])
+    el.schemas.register_definitions(DEFINITIONS)
+    el.register_event_schema(make_schema("first"))
+    el.emit(schema_id="http://event.jupyter.org/first", data={"user": {"name": "Ada"}})
+    with pytest.raises(ValidationError):
+        el.emit(schema_id="http://event.jupyter.org/first", data={"user": {}})
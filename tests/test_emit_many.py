@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+from datetime import datetime, timezone
+
+import pytest
+from jsonschema.exceptions import ValidationError
+
+from jupyter_events.logger import EventLogger, SchemaNotRegistered
+
+from .utils import SCHEMA, SCHEMA_ID, ListSink
+
+
+def test_emit_many_writes_one_batch():
+    sink = ListSink()
+    el = EventLogger(handlers=[sink])
+    el.register_event_schema(SCHEMA)
+    capsules = el.emit_many(schema_id=SCHEMA_ID, data=({"something": str(i)} for i in range(5)))
+
+    assert [capsule["something"] for capsule in capsules] == ["0", "1", "2", "3", "4"]
+    assert len(sink.batches) == 1
+    assert [json.loads(event) for event in sink.batches[0]] == capsules
+    # The whole batch shares a single timestamp.
+    assert len({capsule["__timestamp__"] for capsule in capsules}) == 1
+
+
+def test_emit_many_matches_emit():
+    output = io.StringIO()
+    handler = logging.StreamHandler(output)
+    el = EventLogger(handlers=[handler])
+    el.register_event_schema(SCHEMA)
+    timestamp = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    single = el.emit(schema_id=SCHEMA_ID, data={"something": "a"}, timestamp_override=timestamp)
+    batch = el.emit_many(
+        schema_id=SCHEMA_ID,
+        data=[{"something": "a"}, {"something": "b"}],
+        timestamp_override=timestamp,
+    )
+    handler.flush()
+
+    assert batch[0] == single
+    lines = output.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [single, *batch]
+
+
+def test_emit_many_invalid_event_writes_nothing():
+    sink = ListSink()
+    el = EventLogger(handlers=[sink])
+    el.register_event_schema(SCHEMA)
+    with pytest.raises(ValidationError):
+        el.emit_many(schema_id=SCHEMA_ID, data=[{"something": "a"}, {"something": 1}])
+    assert sink.batches == []
+
+
+def test_emit_many_noop():
+    el = EventLogger()
+    el.register_event_schema(SCHEMA)
+    assert el.emit_many(schema_id=SCHEMA_ID, data=[{"something": "a"}]) == []
+
+    el.register_handler(ListSink())
+    with pytest.warns(SchemaNotRegistered):
+        assert el.emit_many(schema_id="http://event.jupyter.org/unknown", data=[{}]) == []
+
+
+def test_emit_many_empty_batch():
+    sink = ListSink()
+    el = EventLogger(handlers=[sink])
+    el.register_event_schema(SCHEMA)
+    assert el.emit_many(schema_id=SCHEMA_ID, data=[]) == []
+    assert sink.batches == []
+
+
+async def test_emit_many_modifiers_and_listeners():
+    def modifier(schema_id, data):
+        data["something"] = data["something"].upper()
+        return data
+
+    modified, unmodified = [], []
+
+    async def modified_listener(logger, schema_id, data):
+        modified.append(data)
+
+    async def unmodified_listener(logger, schema_id, data):
+        unmodified.append(data)
+
+    el = EventLogger(handlers=[ListSink()])
+    el.register_event_schema(SCHEMA)
+    el.add_modifier(modifier=modifier)
+    el.add_listener(modified=True, schema_id=SCHEMA_ID, listener=modified_listener)
+    el.add_listener(modified=False, schema_id=SCHEMA_ID, listener=unmodified_listener)
+
+    events = [{"something": "a"}, {"something": "b"}]
+    capsules = el.emit_many(schema_id=SCHEMA_ID, data=events)
+    await el.gather_listeners()
+
+    assert [capsule["something"] for capsule in capsules] == ["A", "B"]
+    assert modified == [{"something": "A"}, {"something": "B"}]
+    assert unmodified == events == [{"something": "a"}, {"something": "b"}]
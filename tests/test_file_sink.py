@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.sinks import FileSink
+
+SCHEMA_ID = "http://event.jupyter.org/file-sink"
+SCHEMA = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "index": {"title": "Index", "type": "integer"},
+    },
+}
+
+
+def read_events(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def event(index):
+    return json.dumps({"index": index}).encode()
+
+
+def test_file_sink_logger(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = FileSink(path, flush_interval=60)
+    el = EventLogger(handlers=[sink])
+    el.register_event_schema(SCHEMA)
+    el.emit_many(schema_id=SCHEMA_ID, data=[{"index": i} for i in range(3)])
+    # Buffered until the buffer fills up or the logger is flushed.
+    assert path.read_text() == ""
+    el.flush()
+    assert [event["index"] for event in read_events(path)] == [0, 1, 2]
+    sink.close()
+
+
+def test_group_commit_by_size(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = FileSink(path, buffer_size=30, flush_interval=60)
+    with patch.object(sink, "_write", side_effect=sink._write) as write:
+        sink.handle_events([event(0), event(1)])
+        assert write.call_count == 0
+        sink.handle_events([event(2)])
+        # A single write for the whole group.
+        assert write.call_count == 1
+    assert len(read_events(path)) == 3
+    sink.close()
+
+
+def test_group_commit_by_interval(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = FileSink(path, flush_interval=0.05)
+    sink.handle_events([event(0)])
+    deadline = time.monotonic() + 5
+    while not path.read_text() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert read_events(path) == [{"index": 0}]
+    sink.close()
+
+
+def test_append_to_existing_file(tmp_path):
+    path = tmp_path / "events.jsonl"
+    for index in range(2):
+        sink = FileSink(path)
+        sink.handle_events([event(index)])
+        sink.close()
+    assert read_events(path) == [{"index": 0}, {"index": 1}]
+
+
+def test_rotate_by_size(tmp_path):
+    path = tmp_path / "events.jsonl"
+    line_size = len(event(0)) + 1
+    sink = FileSink(path, max_bytes=line_size * 2, buffer_size=0)
+    sink.handle_events([event(i) for i in range(5)])
+    sink.close()
+    rotated = sink.rotated_files()
+    assert len(rotated) == 2
+    # Files are rotated between events, oldest first.
+    contents = [read_events(file) for file in [*rotated, path]]
+    assert contents == [[{"index": 0}, {"index": 1}], [{"index": 2}, {"index": 3}], [{"index": 4}]]
+
+
+def test_rotate_by_time(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = FileSink(path, rotate_interval=0.01, buffer_size=0)
+    sink.handle_events([event(0)])
+    time.sleep(0.02)
+    sink.handle_events([event(1)])
+    sink.close()
+    (rotated,) = sink.rotated_files()
+    assert read_events(rotated) == [{"index": 0}]
+    assert read_events(path) == [{"index": 1}]
+
+
+def test_backup_count(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = FileSink(path, max_bytes=1, backup_count=2, buffer_size=0)
+    for index in range(5):
+        sink.handle_events([event(index)])
+    sink.close()
+    assert [read_events(file) for file in sink.rotated_files()] == [[{"index": 2}], [{"index": 3}]]
+
+
+@pytest.mark.parametrize("fsync,syncs", [("never", 0), ("batch", 1), ("event", 3)])
+def test_fsync_policies(tmp_path, fsync, syncs):
+    sink = FileSink(tmp_path / "events.jsonl", fsync=fsync, buffer_size=0)
+    with patch("os.fsync") as fsync_mock:
+        sink.handle_events([event(i) for i in range(3)])
+    assert fsync_mock.call_count == syncs
+    sink.close()
+
+
+def test_write_after_close(tmp_path, capsys):
+    sink = FileSink(tmp_path / "events.jsonl")
+    sink.close()
+    sink.handle_events([event(0)])
+    assert "closed sink" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("kwargs", [{"fsync": "always"}, {"max_bytes": -1}])
+def test_invalid_options(tmp_path, kwargs):
+    with pytest.raises(ValueError, match=r"fsync policy|must not be negative"):
+        FileSink(tmp_path / "events.jsonl", **kwargs)
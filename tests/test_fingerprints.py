@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+
+import pytest
+
+from jupyter_events import yaml
+from jupyter_events.logger import EventLogger
+from jupyter_events.schema import EventSchema
+from jupyter_events.schema_registry import SchemaRegistry
+
+from .utils import SCHEMA_PATH
+
+BASIC_SCHEMA = SCHEMA_PATH / "good" / "basic.yaml"
+
+
+def test_fingerprint_ignores_source():
+    loaded = yaml.load(BASIC_SCHEMA)
+    reordered = dict(reversed(list(loaded.items())))
+    fingerprints = {
+        EventSchema(BASIC_SCHEMA).fingerprint,
+        EventSchema(loaded).fingerprint,
+        EventSchema(reordered).fingerprint,
+        EventSchema(json.dumps(loaded)).fingerprint,
+    }
+    assert len(fingerprints) == 1
+
+
+def test_fingerprint_changes_with_content():
+    loaded = yaml.load(BASIC_SCHEMA)
+    changed = {**loaded, "title": "Changed"}
+    assert EventSchema(loaded).fingerprint != EventSchema(changed).fingerprint
+
+
+def test_get_by_fingerprint():
+    registry = SchemaRegistry()
+    schema = registry.register(BASIC_SCHEMA)
+    assert registry.get_by_fingerprint(schema.fingerprint) is schema
+
+    registry.remove(schema.id)
+    with pytest.raises(KeyError):
+        registry.get_by_fingerprint(schema.fingerprint)
+
+
+def test_reregister_unshared_schema():
+    registry = SchemaRegistry(shared=False)
+    schema = registry.register(BASIC_SCHEMA)
+    assert registry.register(BASIC_SCHEMA) is schema
+
+
+def test_capsule_fingerprint():
+    sink = io.StringIO()
+    el = EventLogger(handlers=[logging.StreamHandler(sink)])
+    schema = el.schemas.register(BASIC_SCHEMA)
+
+    capsule = el.emit(schema_id=schema.id, data={"prop": "hello"})
+    assert capsule is not None
+    assert "__schema_fingerprint__" not in capsule
+
+    el.include_schema_fingerprint = True
+    capsule = el.emit(schema_id=schema.id, data={"prop": "hello"})
+    assert capsule is not None
+    assert capsule["__schema_fingerprint__"] == schema.fingerprint
+    written = json.loads(sink.getvalue().splitlines()[-1])
+    assert written["__schema_fingerprint__"] == schema.fingerprint
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+from jupyter_events.funnel import FunnelServer, FunnelSink, encode_frames
+from jupyter_events.logger import EventLogger
+
+from .utils import ListSink
+
+SCHEMA_ID = "http://event.jupyter.org/funnel"
+SCHEMA = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "producer": {"title": "Producer", "type": "string"},
+        "index": {"title": "Index", "type": "integer"},
+        "padding": {"title": "Padding", "type": "string"},
+    },
+}
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="Unix sockets are required")
+
+PRODUCER = """
+import sys
+from pathlib import Path
+
+from jupyter_events.logger import EventLogger
+
+schema, path, name, count = sys.argv[1:]
+el = EventLogger(funnel_path=path)
+el.register_event_schema(Path(schema))
+for index in range(int(count)):
+    el.emit(
+        schema_id={schema_id!r},
+        data={{"producer": name, "index": index, "padding": "x" * 5000}},
+    )
+"""
+
+
+def producer_events(events, producer):
+    return [event["index"] for event in events if event["producer"] == producer]
+
+
+def test_funnel_logger(jp_event_funnel, jp_read_funnel_events):
+    el = EventLogger(funnel_path=str(jp_event_funnel.path))
+    el.register_event_schema(SCHEMA)
+    el.emit(schema_id=SCHEMA_ID, data={"producer": "main", "index": 0})
+    el.emit_many(schema_id=SCHEMA_ID, data=[{"producer": "main", "index": i} for i in range(1, 3)])
+    events = jp_read_funnel_events(count=3)
+    assert producer_events(events, "main") == [0, 1, 2]
+    assert events[0]["__schema__"] == SCHEMA_ID
+
+    el.funnel_path = None
+    el.emit(schema_id=SCHEMA_ID, data={"producer": "main", "index": 3})
+    assert jp_read_funnel_events() == []
+
+
+def test_funnel_processes(tmp_path, jp_event_funnel, jp_read_funnel_events):
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps(SCHEMA))
+    code = PRODUCER.format(schema_id=SCHEMA_ID)
+    count = 200
+    args = [sys.executable, "-c", code, str(schema_path), str(jp_event_funnel.path)]
+    producers = [
+        subprocess.Popen([*args, name, str(count)])  # noqa: S603
+        for name in ("a", "b", "c")
+    ]
+    for producer in producers:
+        assert producer.wait(timeout=60) == 0
+
+    events = jp_read_funnel_events(count=3 * count)
+    assert len(events) == 3 * count
+    # Every event arrived whole, and each producer's events in order.
+    for name in ("a", "b", "c"):
+        assert producer_events(events, name) == list(range(count))
+
+
+def test_funnel_fork(jp_event_funnel, jp_read_funnel_events):
+    el = EventLogger(funnel_path=str(jp_event_funnel.path))
+    el.register_event_schema(SCHEMA)
+    el.emit(schema_id=SCHEMA_ID, data={"producer": "parent", "index": 0})
+    jp_read_funnel_events(count=1)
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        try:
+            el.emit(schema_id=SCHEMA_ID, data={"producer": "child", "index": 0})
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    el.emit(schema_id=SCHEMA_ID, data={"producer": "parent", "index": 1})
+    el.funnel_path = None
+    events = jp_read_funnel_events(count=2)
+    assert producer_events(events, "parent") == [1]
+    assert producer_events(events, "child") == [0]
+
+
+def test_funnel_server_batches():
+    sink = ListSink()
+    handler_records = []
+
+    class RecordHandler(logging.Handler):
+        def emit(self, record):
+            handler_records.append(self.format(record))
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = FunnelServer(f"{directory}/funnel.sock", [sink, RecordHandler()], max_batch_size=2)
+        funnel = FunnelSink(server.path)
+        funnel.handle_events([b'{"a": 1}', b'{"a": 2}', b'{"a": 3}'])
+        # Events sent before the server runs are written once it starts.
+        server.start()
+        funnel.close()
+        server.close()
+    assert [event for batch in sink.batches for event in batch] == [
+        b'{"a": 1}',
+        b'{"a": 2}',
+        b'{"a": 3}',
+    ]
+    assert max(len(batch) for batch in sink.batches) <= 2
+    assert handler_records == ['{"a": 1}', '{"a": 2}', '{"a": 3}']
+    assert server.events_written == 3
+
+
+def test_funnel_drops_partial_frames(caplog):
+    sink = ListSink()
+    with tempfile.TemporaryDirectory() as directory:
+        server = FunnelServer(f"{directory}/funnel.sock", [sink])
+        server.start()
+        funnel = FunnelSink(server.path)
+        funnel.handle_events([b'{"a": 1}'])
+        # A producer dying in the middle of sending an event.
+        funnel._connect().sendall(encode_frames([b'{"a": 2}'])[:-2])
+        funnel.close()
+        funnel.handle_events([b'{"a": 3}'])
+        funnel.close()
+        server.close()
+    assert [event for batch in sink.batches for event in batch] == [b'{"a": 1}', b'{"a": 3}']
+    assert "incomplete event" in caplog.text
+
+
+def test_funnel_sink_without_server(tmp_path, capsys):
+    sink = FunnelSink(tmp_path / "missing.sock")
+    sink.handle_events([b"{}"])
+    assert "Error writing events" in capsys.readouterr().err
+
+
+def test_funnel_server_single_writer():
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/funnel.sock"
+        server = FunnelServer(path, [ListSink()])
+        server.start()
+        with pytest.raises(OSError, match="already listening"):
+            FunnelServer(path, [ListSink()])
+        assert server._is_served(server.path)
+        server.close()
+        assert not server.path.exists()
+
+        # A socket file left behind by a server that is gone is replaced.
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        server = FunnelServer(path, [ListSink()])
+        server.start()
+        server.close()
+        assert not server.path.exists()
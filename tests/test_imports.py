@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import jupyter_events
+from jupyter_events import validators, yaml
+
+# Modules that are slow to import, and only needed once schemas are used.
+DEFERRED_MODULES = ["jsonschema", "referencing", "yaml", "importlib.metadata", "packaging"]
+
+
+def imported_modules(statement):
+    """The deferred modules imported by `statement` in a fresh interpreter."""
+    code = f"import sys\n{statement}\nprint(repr([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    args = [sys.executable, "-c", code]
+    result = subprocess.run(args, capture_output=True, text=True, check=True)  # noqa: S603
+    return result.stdout.strip()
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import jupyter_events",
+        "from jupyter_events import EventLogger",
+        "from jupyter_events import EventLogger; EventLogger().emit(schema_id='x', data={})",
+    ],
+)
+def test_import_is_lazy(statement):
+    assert imported_modules(statement) == "[]"
+
+
+@pytest.mark.parametrize("name", ["event-metaschema", "event-core-schema", "property-metaschema"])
+def test_metaschema_json_matches_yaml(name):
+    """The JSON meta-schemas are generated from the YAML files, and must be kept in sync."""
+    path = validators.METASCHEMA_PATH / name
+    with path.with_suffix(".json").open(encoding="utf-8") as f:
+        loaded = json.load(f)
+    expected = yaml.load(path.with_suffix(".yml"))
+    assert loaded == expected, f"{name}.json is out of date; regenerate it from {name}.yml"
+
+
+def test_lazy_attributes():
+    from jupyter_events.logger import EventLogger
+    from jupyter_events.schema import EventSchema
+
+    assert jupyter_events.EventLogger is EventLogger
+    assert jupyter_events.EventSchema is EventSchema
+    assert "EventLogger" in dir(jupyter_events)
+    with pytest.raises(AttributeError):
+        jupyter_events.not_an_attribute  # noqa: B018
+
+
+def test_lazy_validators():
+    validator = validators.JUPYTER_EVENTS_SCHEMA_VALIDATOR
+    assert validators.JUPYTER_EVENTS_SCHEMA_VALIDATOR is validator
+    assert validator.schema is validators.EVENT_METASCHEMA
+    with pytest.raises(AttributeError):
+        validators.not_an_attribute  # noqa: B018
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+from jsonschema.exceptions import ValidationError
+
+from jupyter_events import yaml
+from jupyter_events.logger import EventLogger
+from jupyter_events.schema_registry import SchemaRegistry, SchemaRegistryException
+
+from .utils import SCHEMA_PATH
+
+BASIC_SCHEMA = SCHEMA_PATH / "good" / "basic.yaml"
+BASIC_ID = "http://event.jupyter.org/test"
+
+
+def test_register_lazy_does_not_load():
+    registry = SchemaRegistry()
+    with patch("jupyter_events.schema_registry.EventSchema") as event_schema:
+        assert registry.register_lazy(BASIC_SCHEMA) == BASIC_ID
+    event_schema.assert_not_called()
+
+    assert BASIC_ID in registry
+    assert registry.schema_ids == [BASIC_ID]
+    assert not registry.is_loaded(BASIC_ID)
+
+    schema = registry.get(BASIC_ID)
+    assert schema.id == BASIC_ID
+    assert registry.is_loaded(BASIC_ID)
+    assert registry.get(BASIC_ID) is schema
+
+
+def test_register_lazy_json(tmp_path):
+    schema = yaml.load(BASIC_SCHEMA)
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(schema))
+    registry = SchemaRegistry()
+    assert registry.register_lazy(path) == BASIC_ID
+    assert registry.get(BASIC_ID).id == BASIC_ID
+
+
+def test_register_lazy_without_id_loads_immediately(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text("{'$id': http://event.jupyter.org/flow, version: '1', properties: {}}")
+    registry = SchemaRegistry()
+    # The `$id` of flow-style YAML is not recognized by the scan.
+    assert registry.register_lazy(path) == "http://event.jupyter.org/flow"
+    assert registry.is_loaded("http://event.jupyter.org/flow")
+
+
+NESTED_ID_SCHEMA = {
+    "properties": {
+        "thing": {"$id": "http://event.jupyter.org/nested", "title": "Thing", "type": "string"},
+    },
+    "$id": BASIC_ID,
+    "version": "1",
+}
+
+
+@pytest.mark.parametrize(
+    "name,dump",
+    [
+        ("schema.json", lambda schema: json.dumps(schema, indent=2)),
+        ("schema.json", json.dumps),
+        ("schema.yaml", yaml.dumps),
+    ],
+)
+def test_register_lazy_nested_id(tmp_path, name, dump):
+    path = tmp_path / name
+    path.write_text(dump(NESTED_ID_SCHEMA))
+    registry = SchemaRegistry()
+    assert registry.register_lazy(path) == BASIC_ID
+    assert registry.get(BASIC_ID).id == BASIC_ID
+
+
+def test_register_lazy_ambiguous_id_loads_immediately(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text(
+        "$id: http://event.jupyter.org/test\n"
+        "version: '1'\n"
+        "properties: {}\n"
+        "$id: http://event.jupyter.org/other\n"
+    )
+    registry = SchemaRegistry()
+    # Two unindented `$id`s: the file is loaded to find out which one wins.
+    assert registry.register_lazy(path) == "http://event.jupyter.org/other"
+    assert registry.is_loaded("http://event.jupyter.org/other")
+
+
+def test_register_lazy_duplicate(tmp_path):
+    registry = SchemaRegistry()
+    schema = registry.register(BASIC_SCHEMA)
+    # An identical schema is loaded and ignored.
+    assert registry.register_lazy(BASIC_SCHEMA) == BASIC_ID
+    assert registry.get(BASIC_ID) is schema
+
+    path = tmp_path / "schema.yaml"
+    path.write_text(BASIC_SCHEMA.read_text().replace("Test Property", "Other Property"))
+    with pytest.raises(SchemaRegistryException):
+        registry.register_lazy(path)
+
+
+def test_register_lazy_mismatched_id():
+    registry = SchemaRegistry()
+    registry.register_lazy(BASIC_SCHEMA, schema_id="http://event.jupyter.org/other")
+    with pytest.raises(SchemaRegistryException, match="but its \\$id is"):
+        registry.get("http://event.jupyter.org/other")
+
+
+def test_remove_lazy():
+    registry = SchemaRegistry()
+    registry.register_lazy(BASIC_SCHEMA)
+    registry.remove(BASIC_ID)
+    assert BASIC_ID not in registry
+
+
+def test_logger_lazy_registration():
+    el = EventLogger(handlers=[logging.NullHandler()], lazy_schema_registration=True)
+    el.register_event_schema(BASIC_SCHEMA)
+    assert not el.schemas.is_loaded(BASIC_ID)
+
+    capsule = el.emit(schema_id=BASIC_ID, data={"prop": "hello"})
+    assert capsule is not None
+    assert capsule["__schema__"] == BASIC_ID
+    assert el.schemas.is_loaded(BASIC_ID)
+
+
+def test_logger_lazy_registration_errors_on_emit():
+    path = SCHEMA_PATH / "bad" / "reserved-property.yaml"
+    el = EventLogger(handlers=[logging.NullHandler()])
+    el.register_event_schema(path, lazy=True)
+    schema_id = el.schemas.schema_ids[0]
+    with pytest.raises(ValidationError, match="reserved"):
+        el.emit(schema_id=schema_id, data={})
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from jupyter_events.listeners import ListenerQueue
+from jupyter_events.logger import EventLogger
+
+from .utils import SCHEMA, SCHEMA_ID
+
+
+def make_logger(**kwargs):
+    el = EventLogger(listener_dispatch="queue", **kwargs)
+    el.register_event_schema(SCHEMA)
+    return el
+
+
+def emit(el, n, start=0):
+    for i in range(start, start + n):
+        el.emit(schema_id=SCHEMA_ID, data={"count": i})
+
+
+async def test_queue_dispatch_in_order():
+    seen = []
+
+    async def listener(logger, schema_id, data):
+        seen.append(data["count"])
+
+    el = make_logger()
+    el.add_listener(schema_id=SCHEMA_ID, listener=listener)
+    emit(el, 50)
+    # No task is created per event.
+    assert len(el._active_listeners) == 0
+    await el.gather_listeners()
+
+    assert seen == list(range(50))
+    stats = el.listener_queue_stats[listener]
+    assert stats == {"depth": 0, "max_depth": 50, "processed": 50, "dropped": 0}
+
+
+async def test_stats_of_listeners_with_the_same_name():
+    class Counter:
+        def __init__(self):
+            self.seen = []
+
+        async def listener(self, logger, schema_id, data):
+            self.seen.append(data["count"])
+
+    first, second = Counter(), Counter()
+    el = make_logger()
+    el.add_listener(schema_id=SCHEMA_ID, listener=first.listener)
+    emit(el, 3)
+    el.add_listener(schema_id=SCHEMA_ID, listener=second.listener)
+    emit(el, 2)
+    await el.gather_listeners()
+
+    stats = el.listener_queue_stats
+    assert len(stats) == 2
+    assert stats[first.listener]["processed"] == 5
+    assert stats[second.listener]["processed"] == 2
+
+
+async def test_modified_and_unmodified_listeners_share_a_queue():
+    seen = []
+
+    def modifier(schema_id, data):
+        data["count"] += 100
+        return data
+
+    async def listener(logger, schema_id, data):
+        seen.append(data["count"])
+
+    el = make_logger()
+    el.add_modifier(modifier=modifier)
+    el.add_listener(modified=True, schema_id=SCHEMA_ID, listener=listener)
+    el.add_listener(modified=False, schema_id=SCHEMA_ID, listener=listener)
+    emit(el, 1)
+    await el.gather_listeners()
+
+    assert sorted(seen) == [0, 100]
+    assert len(el._listener_queues) == 1
+
+
+@pytest.mark.parametrize(
+    "overflow,expected",
+    [
+        ("block", [0, 1, 2, 3, 4, 5, 6]),
+        ("drop_newest", [0, 1, 2]),
+        ("drop_oldest", [0, 5, 6]),
+    ],
+)
+async def test_overflow(overflow, expected):
+    seen = []
+    release = asyncio.Event()
+
+    async def listener(logger, schema_id, data):
+        await release.wait()
+        seen.append(data["count"])
+
+    el = make_logger(listener_queue_size=2, listener_overflow=overflow)
+    el.add_listener(schema_id=SCHEMA_ID, listener=listener)
+    emit(el, 1)
+    # Let the consumer pick up the first event and wait in the listener.
+    await asyncio.sleep(0)
+    emit(el, 6, start=1)
+    queue_stats = el.listener_queue_stats[listener]
+    release.set()
+    await el.gather_listeners()
+
+    assert seen == expected
+    assert queue_stats["dropped"] == 7 - len(expected)
+    assert el.listener_queue_stats[listener]["depth"] == 0
+
+
+async def test_listener_errors_are_logged(caplog):
+    seen = []
+
+    async def listener(logger, schema_id, data):
+        if data["count"] == 0:
+            msg = "first event"
+            raise ValueError(msg)
+        seen.append(data["count"])
+
+    el = make_logger()
+    el.add_listener(schema_id=SCHEMA_ID, listener=listener)
+    with caplog.at_level(logging.ERROR):
+        emit(el, 2)
+        await el.gather_listeners()
+
+    # The consumer keeps going after a listener error.
+    assert seen == [1]
+    assert "first event" in caplog.text
+
+
+async def test_remove_listener_stops_queue():
+    async def listener(logger, schema_id, data):
+        pass
+
+    el = make_logger()
+    el.add_listener(schema_id=SCHEMA_ID, listener=listener)
+    emit(el, 1)
+    listener_queue = el._listener_queues[listener]
+    await el.gather_listeners()
+
+    el.remove_listener(listener=listener)
+    assert el._listener_queues == {}
+    await asyncio.sleep(0)
+    assert listener_queue._consumer is None
+
+
+def test_unknown_overflow_policy():
+    async def listener(logger, schema_id, data):
+        pass
+
+    with pytest.raises(ValueError, match="Unknown overflow policy"):
+        ListenerQueue(listener, EventLogger(), overflow="explode")
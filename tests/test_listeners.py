@@ -203,3 +203,30 @@ async def test_listener_added_before_schemas_passes(jp_event_logger, schema):
     assert listener_was_called
     # Check that the active listeners are cleaned up.
     assert len(jp_event_logger._active_listeners) == 0
+
+
+async def test_wildcard_listener_applies_to_later_schemas(jp_event_logger, schema):
+    seen = []
+
+    async def my_listener(logger: EventLogger, schema_id: str, data: dict) -> None:
+        seen.append(schema_id)
+
+    other_schema = {
+        "$id": "http://event.jupyter.org/other",
+        "version": "1",
+        "type": "object",
+        "properties": {"prop": {"title": "Prop", "type": "string"}},
+    }
+    # Listen to all events, then register another schema.
+    jp_event_logger.add_listener(listener=my_listener)
+    jp_event_logger.register_event_schema(other_schema)
+
+    jp_event_logger.emit(schema_id=schema.id, data={"prop": "hello, world"})
+    jp_event_logger.emit(schema_id=other_schema["$id"], data={"prop": "hello, world"})
+    await jp_event_logger.gather_listeners()
+    assert seen == [schema.id, other_schema["$id"]]
+
+    jp_event_logger.remove_listener(listener=my_listener)
+    jp_event_logger.emit(schema_id=other_schema["$id"], data={"prop": "hello, world"})
+    await jp_event_logger.gather_listeners()
+    assert len(seen) == 2
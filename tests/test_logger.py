@@ -13,7 +13,7 @@ from traitlets import TraitError
 from traitlets.config.loader import PyFileConfigLoader
 
 from jupyter_events import yaml
-from jupyter_events.logger import EventLogger
+from jupyter_events.logger import CoreMetadataError, EventLogger
 from jupyter_events.schema_registry import SchemaRegistryException
 
 GOOD_CONFIG = """
@@ -127,6 +127,58 @@ def test_timestamp_override():
     assert event_capsule["__timestamp__"] == timestamp_override.isoformat() + "Z"
 
 
+def test_timestamp_override_must_be_datetime():
+    schema = {
+        "$id": "http://test/test",
+        "version": "1",
+        "properties": {
+            "something": {
+                "type": "string",
+                "title": "test",
+            },
+        },
+    }
+    el = EventLogger(handlers=[logging.NullHandler()])
+    el.register_event_schema(schema)
+    with pytest.raises(CoreMetadataError):
+        el.emit(
+            schema_id="http://test/test",
+            data={"something": "blah"},
+            timestamp_override="yesterday",  # type:ignore[arg-type]
+        )
+
+
+def test_core_metadata_validated_once(monkeypatch):
+    """The constant capsule metadata is validated at registration, not per event."""
+    schema = {
+        "$id": "http://test/test",
+        "version": "1",
+        "properties": {
+            "something": {
+                "type": "string",
+                "title": "test",
+            },
+        },
+    }
+    core_validator = MagicMock(name="JUPYTER_EVENTS_CORE_VALIDATOR")
+    monkeypatch.setattr("jupyter_events.validators.JUPYTER_EVENTS_CORE_VALIDATOR", core_validator)
+    el = EventLogger(handlers=[logging.NullHandler()])
+    el.register_event_schema(schema)
+    assert core_validator.validate.call_count == 1
+
+    for _ in range(3):
+        capsule = el.emit(schema_id="http://test/test", data={"something": "blah"})
+    assert core_validator.validate.call_count == 1
+    assert capsule is not None
+    assert list(capsule) == [
+        "__timestamp__",
+        "__schema__",
+        "__schema_version__",
+        "__metadata_version__",
+        "something",
+    ]
+
+
 def test_emit():
     """
     Simple test for emitting valid events
@@ -468,10 +520,26 @@ def test_register_duplicate_schemas():
         },
     }
 
+    schema2 = {
+        "$id": "http://test/test",
+        "version": "1",
+        "type": "object",
+        "properties": {
+            "something": {
+                "type": "string",
+                "title": "something else",
+            },
+        },
+    }
+
     el = EventLogger()
     el.register_event_schema(schema0)
+    registered = el.schemas.get("http://test/test")
+    # Registering an identical schema again does nothing.
+    el.register_event_schema(schema1)
+    assert el.schemas.get("http://test/test") is registered
     with pytest.raises(SchemaRegistryException):
-        el.register_event_schema(schema1)
+        el.register_event_schema(schema2)
 
 
 async def test_noop_emit():
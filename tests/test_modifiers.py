@@ -81,3 +81,73 @@ def test_remove_modifier(schema, jp_event_logger, jp_read_emitted_events):
 
     assert "username" in output
     assert output["username"] == "jovyan"
+
+
+OTHER_SCHEMA = {
+    "$id": "http://event.jupyter.org/other-user",
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "username": {
+            "title": "Username",
+            "type": "string",
+        },
+    },
+}
+
+
+def test_modifiers_run_in_order(schema, jp_event_logger, jp_read_emitted_events):
+    event_logger = jp_event_logger
+
+    def make_modifier(suffix):
+        def modifier(schema_id: str, data: dict) -> dict:
+            data["username"] += suffix
+            return data
+
+        return modifier
+
+    for suffix in "abcde":
+        # Alternate between schema-specific and wildcard registrations.
+        schema_id = schema.id if suffix in "ace" else None
+        event_logger.add_modifier(schema_id=schema_id, modifier=make_modifier(suffix))
+
+    event_logger.emit(schema_id=schema.id, data={"username": "jovyan"})
+    output = jp_read_emitted_events()[0]
+    assert output["username"] == "jovyanabcde"
+
+
+def test_wildcard_modifier_applies_to_later_schemas(jp_event_logger, jp_read_emitted_events):
+    event_logger = jp_event_logger
+
+    def redactor(schema_id: str, data: dict) -> dict:
+        data["username"] = "<masked>"
+        return data
+
+    event_logger.add_modifier(modifier=redactor)
+    event_logger.register_event_schema(OTHER_SCHEMA)
+
+    event_logger.emit(schema_id=OTHER_SCHEMA["$id"], data={"username": "jovyan"})
+    output = jp_read_emitted_events()[0]
+    assert output["username"] == "<masked>"
+
+
+def test_remove_wildcard_modifier_from_one_schema(schema, jp_event_logger, jp_read_emitted_events):
+    event_logger = jp_event_logger
+    event_logger.register_event_schema(OTHER_SCHEMA)
+
+    def redactor(schema_id: str, data: dict) -> dict:
+        data["username"] = "<masked>"
+        return data
+
+    event_logger.add_modifier(modifier=redactor)
+    event_logger.remove_modifier(schema_id=schema.id, modifier=redactor)
+
+    event_logger.emit(schema_id=schema.id, data={"username": "jovyan"})
+    event_logger.emit(schema_id=OTHER_SCHEMA["$id"], data={"username": "jovyan"})
+    outputs = jp_read_emitted_events()
+    assert [output["username"] for output in outputs] == ["jovyan", "<masked>"]
+
+    # Adding it back for the schema undoes the removal.
+    event_logger.add_modifier(schema_id=schema.id, modifier=redactor)
+    event_logger.emit(schema_id=schema.id, data={"username": "jovyan"})
+    assert jp_read_emitted_events()[0]["username"] == "<masked>"
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.payload import CopyOnWriteDict, CopyOnWriteList, unwrap
+from jupyter_events.schema import EventSchema
+
+from .utils import SCHEMA_PATH
+
+
+def is_plain(value, cls):
+    return isinstance(value, cls) and not isinstance(value, (CopyOnWriteDict, CopyOnWriteList))
+
+
+def make_data():
+    return {
+        "users": [
+            {"name": "alice", "hobbies": [{"sport": "golf"}]},
+            {"name": "bob", "hobbies": [{"sport": "chess"}, {"sport": "tennis"}]},
+        ],
+        "meta": {"tags": ["a", "b"], "count": 1},
+        "title": "hello",
+    }
+
+
+def test_mutations_do_not_touch_source():
+    source = make_data()
+    expected = copy.deepcopy(source)
+    data = CopyOnWriteDict(source)
+
+    data["title"] = "changed"
+    data["users"][0]["name"] = "carol"
+    data["users"][1]["hobbies"].append({"sport": "golf"})
+    data["meta"]["tags"].pop()
+    data["meta"].setdefault("new", []).append(1)
+    for user in data["users"]:
+        user["hobbies"].clear()
+    del data["meta"]["count"]
+
+    assert source == expected
+    assert unwrap(data) == {
+        "users": [{"name": "carol", "hobbies": []}, {"name": "bob", "hobbies": []}],
+        "meta": {"tags": ["a"], "new": [1]},
+        "title": "changed",
+    }
+
+
+def test_untouched_subtrees_are_shared():
+    source = make_data()
+    data = CopyOnWriteDict(source)
+    data["users"][0]["name"] = "carol"
+    plain = unwrap(data)
+    assert is_plain(plain, dict)
+    assert is_plain(plain["users"], list)
+    assert is_plain(plain["users"][0], dict)
+    # Subtrees that were never accessed are not copied.
+    assert plain["meta"] is source["meta"]
+    assert plain["users"][1] is source["users"][1]
+
+
+def test_assigned_values_are_not_copied():
+    data = CopyOnWriteDict({"a": 1})
+    value: dict = {}
+    data["b"] = value
+    data["b"]["c"] = 1
+    assert value == {"c": 1}
+
+    items = CopyOnWriteList([{"a": 1}])
+    item: dict = {}
+    items.append(item)
+    items[1]["b"] = 2
+    assert item == {"b": 2}
+
+
+def test_views_and_copies_are_safe():
+    source = make_data()
+    expected = copy.deepcopy(source)
+    data = CopyOnWriteDict(source)
+    for value in data.values():
+        if isinstance(value, dict):
+            value["x"] = 1
+    for _key, value in data.items():
+        if isinstance(value, list):
+            value[0]["name"] = "x"
+    other = data.copy()
+    other["meta"]["y"] = 2
+    merged = data | {"z": 1}
+    merged["users"][1]["name"] = "y"
+    assert source == expected
+
+
+def pickle_roundtrip(value):
+    return pickle.loads(pickle.dumps(value))  # noqa: S301
+
+
+@pytest.mark.parametrize("roundtrip", [copy.deepcopy, pickle_roundtrip])
+def test_copy_and_pickle(roundtrip):
+    data = CopyOnWriteDict(make_data())
+    data["users"][0]["name"] = "carol"
+    assert roundtrip(data) == unwrap(data)
+
+
+def test_serializes_like_a_dict():
+    data = CopyOnWriteDict(make_data())
+    data["users"][0]["hobbies"][0]["sport"] = "polo"
+    assert json.loads(json.dumps(data)) == unwrap(data)
+
+
+@pytest.fixture
+def schema():
+    return EventSchema(schema=SCHEMA_PATH / "good" / "nested-array.yaml")
+
+
+@pytest.fixture
+def jp_event_schemas(schema):
+    return [schema]
+
+
+async def test_modifiers_leave_data_untouched(schema, jp_event_logger, jp_read_emitted_events):
+    received = []
+
+    async def listener(logger: EventLogger, schema_id: str, data: dict) -> None:
+        received.append(data)
+
+    def redactor(schema_id: str, data: dict) -> dict:
+        for user in data["users"]:
+            user["name"] = "<masked>"
+        return data
+
+    jp_event_logger.add_modifier(modifier=redactor)
+    jp_event_logger.add_listener(modified=False, schema_id=schema.id, listener=listener)
+    data = {"users": [{"name": "alice", "hobbies": [{"sport": "golf"}]}]}
+    expected = copy.deepcopy(data)
+    jp_event_logger.emit(schema_id=schema.id, data=data)
+    await jp_event_logger.gather_listeners()
+
+    assert data == expected
+    assert received == [expected]
+    output = jp_read_emitted_events()[0]
+    assert output["users"] == [{"name": "<masked>", "hobbies": [{"sport": "golf"}]}]
+
+
+@pytest.mark.parametrize(
+    "copy_data",
+    [dict, lambda data: {**data}, lambda data: dict.update(new := {}, data) or new],
+    ids=["dict", "unpacking", "update"],
+)
+def test_copies_of_the_payload_copy_nested_values(copy_data):
+    source = make_data()
+    expected = copy.deepcopy(source)
+    new = copy_data(CopyOnWriteDict(source))
+    new["users"][0]["name"] = "carol"
+    new["meta"]["tags"].append("c")
+    assert source == expected
+    plain = unwrap(new)
+    assert plain["users"][0]["name"] == "carol"
+    assert is_plain(plain["users"], list)
+    assert is_plain(plain["users"][0], dict)
+    assert is_plain(plain["meta"], dict)
+
+
+@pytest.mark.parametrize("copy_data", [dict, lambda data: {**data}], ids=["dict", "unpacking"])
+async def test_modifiers_returning_a_new_dict(
+    copy_data, schema, jp_event_logger, jp_read_emitted_events
+):
+    received = []
+
+    async def listener(logger: EventLogger, schema_id: str, data: dict) -> None:
+        received.append(data)
+
+    def redactor(schema_id: str, data: dict) -> dict:
+        new = copy_data(data)
+        new["users"][0]["name"] = "<masked>"
+        return new
+
+    jp_event_logger.add_modifier(modifier=redactor)
+    jp_event_logger.add_listener(modified=False, schema_id=schema.id, listener=listener)
+    data = {"users": [{"name": "alice", "hobbies": [{"sport": "golf"}]}]}
+    expected = copy.deepcopy(data)
+    jp_event_logger.emit(schema_id=schema.id, data=data)
+    await jp_event_logger.gather_listeners()
+
+    assert data == expected
+    assert received == [expected]
+    output = jp_read_emitted_events()[0]
+    assert output["users"] == [{"name": "<masked>", "hobbies": [{"sport": "golf"}]}]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from jsonschema.exceptions import ValidationError
+from traitlets import TraitError
+from traitlets.config import Config
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.policies import ValidationPolicy
+
+from .utils import SCHEMA, SCHEMA_ID
+
+BAD_EVENT = {"something": 1}
+
+
+def make_logger(**kwargs):
+    el = EventLogger(handlers=[logging.NullHandler()], **kwargs)
+    el.register_event_schema(SCHEMA)
+    return el
+
+
+@pytest.mark.parametrize(
+    "spec,kind,value",
+    [
+        ("always", "always", None),
+        ("trusted", "trusted", None),
+        ("first:10", "first", 10),
+        ("sampled:0.25", "sampled", 0.25),
+    ],
+)
+def test_policy_from_string(spec, kind, value):
+    policy = ValidationPolicy.from_string(spec)
+    assert policy.kind == kind
+    assert policy.value == value
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        "sometimes",
+        "first",
+        "first:-1",
+        "first:1.5",
+        "first:inf",
+        "first:nan",
+        "sampled:2",
+        "sampled:nan",
+        "always:3",
+        "first:x",
+    ],
+)
+def test_bad_policy_from_string(spec):
+    with pytest.raises(ValueError):  # noqa: PT011
+        ValidationPolicy.from_string(spec)
+
+
+def test_bad_policy_config():
+    with pytest.raises(TraitError):
+        EventLogger(validation_policies={SCHEMA_ID: "sometimes"})
+    with pytest.raises(TraitError):
+        EventLogger(default_validation_policy="sometimes")
+    with pytest.raises(TraitError):
+        EventLogger(default_validation_policy="first:inf")
+
+
+def test_always_policy():
+    el = make_logger()
+    el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    with pytest.raises(ValidationError):
+        el.emit(schema_id=SCHEMA_ID, data=BAD_EVENT)
+    assert el.validation_stats == {SCHEMA_ID: {"validated": 2, "skipped": 0}}
+
+
+def test_trusted_policy():
+    el = make_logger(validation_policies={SCHEMA_ID: "trusted"})
+    capsule = el.emit(schema_id=SCHEMA_ID, data=BAD_EVENT)
+    assert capsule is not None
+    assert capsule["something"] == 1
+    assert el.validation_stats == {SCHEMA_ID: {"validated": 0, "skipped": 1}}
+
+
+def test_first_n_policy():
+    el = make_logger(validation_policies={SCHEMA_ID: "first:2"})
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            el.emit(schema_id=SCHEMA_ID, data=BAD_EVENT)
+    el.emit(schema_id=SCHEMA_ID, data=BAD_EVENT)
+    el.emit(schema_id=SCHEMA_ID, data=BAD_EVENT)
+    assert el.validation_stats == {SCHEMA_ID: {"validated": 2, "skipped": 2}}
+
+
+def test_sampled_policy():
+    el = make_logger(validation_policies={SCHEMA_ID: "sampled:0.5"})
+    for _ in range(200):
+        el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    stats = el.validation_stats[SCHEMA_ID]
+    assert stats["validated"] + stats["skipped"] == 200
+    assert 0 < stats["validated"] < 200
+
+
+def test_default_policy_from_config():
+    cfg = Config()
+    cfg.EventLogger.default_validation_policy = "trusted"
+    el = make_logger(config=cfg)
+    el.emit(schema_id=SCHEMA_ID, data=BAD_EVENT)
+    assert el.validation_stats[SCHEMA_ID]["skipped"] == 1
+
+
+async def test_validate_once_without_modifiers():
+    el = make_logger()
+    calls = []
+    validate_event = el.schemas.validate_event
+
+    def counting_validate_event(id_, data):
+        calls.append(data)
+        validate_event(id_, data)
+
+    el.schemas.validate_event = counting_validate_event  # type:ignore[method-assign]
+
+    async def listener(logger: EventLogger, schema_id: str, data: dict) -> None:
+        pass
+
+    el.add_listener(modified=False, schema_id=SCHEMA_ID, listener=listener)
+    el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    assert len(calls) == 1
+
+    def modifier(schema_id: str, data: dict) -> dict:
+        return data
+
+    el.add_modifier(schema_id=SCHEMA_ID, modifier=modifier)
+    el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    assert len(calls) == 3
+    await el.gather_listeners()
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.projections import Projection
+from jupyter_events.schema import EventSchema
+from jupyter_events.sinks import StreamSink
+
+from .utils import SCHEMA_PATH, ListSink
+
+SCHEMA_ID = "http://event.jupyter.org/projected"
+SCHEMA = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "action": {"title": "Action", "type": "string"},
+        "path": {"title": "Path", "type": "string"},
+        "user": {
+            "title": "User",
+            "type": "object",
+            "properties": {
+                "name": {"title": "Name", "type": "string"},
+                "email": {"title": "Email", "type": "string"},
+            },
+        },
+        "extra": {"title": "Extra", "type": "object"},
+    },
+}
+
+DATA = {
+    "action": "open",
+    "path": "notebook.ipynb",
+    "user": {"name": "Ada", "email": "ada@example.com", "undeclared": True},
+    "extra": {"anything": 1},
+    "message": "not declared",
+}
+
+
+def project(projection, data=DATA):
+    function = projection.compile(EventSchema(SCHEMA))
+    return data if function is None else function(data)
+
+
+@pytest.mark.parametrize(
+    "projection,expected",
+    [
+        (Projection(include=["action"]), {"action": "open"}),
+        (
+            Projection(include=["user.name", "path"]),
+            {"user": {"name": "Ada"}, "path": "notebook.ipynb"},
+        ),
+        (
+            Projection(include=["user.name", "user"]),
+            {"user": {"name": "Ada", "email": "ada@example.com", "undeclared": True}},
+        ),
+        (
+            Projection(exclude=["user.email", "extra", "message"]),
+            {
+                "action": "open",
+                "path": "notebook.ipynb",
+                "user": {"name": "Ada", "undeclared": True},
+            },
+        ),
+        (
+            Projection(declared_only=True),
+            {
+                "action": "open",
+                "path": "notebook.ipynb",
+                "user": {"name": "Ada", "email": "ada@example.com"},
+                "extra": {"anything": 1},
+            },
+        ),
+        (
+            Projection(include=["user", "message"], declared_only=True),
+            {"user": {"name": "Ada", "email": "ada@example.com"}},
+        ),
+    ],
+)
+def test_projection(projection, expected):
+    assert project(projection) == expected
+
+
+ARRAY_DATA = {
+    "users": [
+        {
+            "name": "Ada",
+            "secret": "s3cr3t",
+            "hobbies": [{"sport": "chess", "position": "white", "rating": 2000}],
+        },
+        {"name": "Grace", "secret": "hunter2"},
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "projection,expected",
+    [
+        (
+            Projection(declared_only=True),
+            {
+                "users": [
+                    {"name": "Ada", "hobbies": [{"sport": "chess", "position": "white"}]},
+                    {"name": "Grace"},
+                ],
+            },
+        ),
+        (
+            Projection(include=["users.name", "users.hobbies.sport"]),
+            {"users": [{"name": "Ada", "hobbies": [{"sport": "chess"}]}, {"name": "Grace"}]},
+        ),
+        (
+            Projection(exclude=["users.secret", "users.hobbies.rating"]),
+            {
+                "users": [
+                    {"name": "Ada", "hobbies": [{"sport": "chess", "position": "white"}]},
+                    {"name": "Grace"},
+                ],
+            },
+        ),
+    ],
+)
+def test_projection_of_arrays(projection, expected):
+    schema = EventSchema(SCHEMA_PATH / "good" / "nested-array.yaml")
+    assert projection.compile(schema)(ARRAY_DATA) == expected
+
+
+def test_projection_keeps_metadata():
+    capsule = {"__timestamp__": "now", "__schema__": SCHEMA_ID, **DATA}
+    assert project(Projection(include=["action"]), capsule) == {
+        "__timestamp__": "now",
+        "__schema__": SCHEMA_ID,
+        "action": "open",
+    }
+    assert (
+        project(Projection(exclude=["__timestamp__", "action"]), capsule)["__schema__"] == SCHEMA_ID
+    )
+    assert "__timestamp__" not in project(Projection(exclude=["__timestamp__"]), capsule)
+
+
+def test_full_projection_compiles_to_none():
+    assert Projection().compile(EventSchema(SCHEMA)) is None
+
+
+def test_projection_equality():
+    assert Projection(include=["a"]) == Projection(include=("a",))
+    assert hash(Projection(include=["a"])) == hash(Projection(include=("a",)))
+    assert Projection(include=["a"]) != Projection(exclude=["a"])
+
+
+@pytest.mark.parametrize("path", ["", "user.", ".name"])
+def test_invalid_projection(path):
+    with pytest.raises(ValueError, match="Invalid field path"):
+        Projection(include=[path])
+
+
+def test_sinks_with_projections():
+    slim = Projection(include=["action", "path"])
+    full, slim_sink, other_slim_sink = (
+        ListSink(),
+        ListSink(slim),
+        ListSink(Projection(include=["action", "path"])),
+    )
+    stream = io.StringIO()
+    el = EventLogger(
+        handlers=[full, slim_sink, other_slim_sink, StreamSink(stream, projection=slim)]
+    )
+    el.register_event_schema(SCHEMA)
+
+    dumps = el.serializer.dumps
+    with patch.object(el.serializer, "dumps", side_effect=dumps) as dumps_mock:
+        capsule = el.emit(schema_id=SCHEMA_ID, data=DATA)
+    # Once for the full event and once for the slim projection.
+    assert dumps_mock.call_count == 2
+
+    assert json.loads(full.events[0]) == capsule
+    slim_event = json.loads(slim_sink.events[0])
+    assert slim_event == {
+        key: value
+        for key, value in capsule.items()
+        if key.startswith("__") or key in ("action", "path")
+    }
+    # Sinks with equal projections receive the same bytes.
+    assert other_slim_sink.events[0] is slim_sink.events[0]
+    assert json.loads(stream.getvalue()) == slim_event
+
+
+def test_projection_compiled_at_registration():
+    el = EventLogger(handlers=[ListSink(Projection(declared_only=True))])
+    with patch.object(
+        Projection, "compile", autospec=True, side_effect=Projection.compile
+    ) as compile_mock:
+        el.register_event_schema(SCHEMA)
+        assert compile_mock.call_count == 1
+        el.emit_many(schema_id=SCHEMA_ID, data=[DATA, DATA])
+        el.emit(schema_id=SCHEMA_ID, data=DATA)
+    assert compile_mock.call_count == 1
+
+
+def test_sink_added_after_registration():
+    el = EventLogger(handlers=[logging.NullHandler()])
+    el.register_event_schema(SCHEMA)
+    el.emit(schema_id=SCHEMA_ID, data=DATA)
+    sink = ListSink(Projection(declared_only=True))
+    el.register_handler(sink)
+    el.emit(schema_id=SCHEMA_ID, data=DATA)
+    assert "message" not in json.loads(sink.events[0])
+    el.remove_handler(sink)
+    el.emit(schema_id=SCHEMA_ID, data=DATA)
+    assert len(sink.events) == 1
+
+
+def test_projections_in_background():
+    sink = ListSink(Projection(include=["action"]))
+    el = EventLogger(handlers=[sink], background_writer=True)
+    el.register_event_schema(SCHEMA)
+    el.emit_many(schema_id=SCHEMA_ID, data=[DATA, DATA])
+    el.flush()
+    assert [json.loads(event)["action"] for event in sink.events] == ["open", "open"]
+    assert all("path" not in json.loads(event) for event in sink.events)
+    el.close()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.sinks import RingReader, RingSink
+from jupyter_events.sinks.ring import HEADER_SIZE, RECORD_HEADER, RingFormatError
+
+SCHEMA_ID = "http://event.jupyter.org/ring"
+SCHEMA = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {"index": {"title": "Index", "type": "integer"}},
+}
+
+
+def event(index):
+    return json.dumps({"index": index}).encode()
+
+
+def indices(views):
+    return [json.loads(view.tobytes())["index"] for view in views]
+
+
+def test_ring_logger(tmp_path):
+    path = tmp_path / "events.ring"
+    sink = RingSink(path, capacity=4096)
+    el = EventLogger(handlers=[sink])
+    el.register_event_schema(SCHEMA)
+    with RingReader(path) as reader:
+        el.emit_many(schema_id=SCHEMA_ID, data=[{"index": i} for i in range(3)])
+        events = [json.loads(view.tobytes()) for view in reader.read()]
+        assert [e["index"] for e in events] == [0, 1, 2]
+        assert events[0]["__schema__"] == SCHEMA_ID
+        assert reader.read() == []
+    sink.close()
+
+
+def test_ring_wraps(tmp_path):
+    path = tmp_path / "events.ring"
+    sink = RingSink(path, capacity=256)
+    reader = RingReader(path)
+    sink.handle_events([event(i) for i in range(5)])
+    assert indices(reader.read()) == list(range(5))
+
+    sink.handle_events([event(i) for i in range(5, 100)])
+    latest = indices(reader.last(3))
+    assert latest == [97, 98, 99]
+    # Only the latest events fit in the ring; the others were overwritten.
+    events = indices(reader.read())
+    assert events == list(range(100 - len(events), 100))
+    assert reader.lost == 100 - 5 - len(events)
+    assert reader.torn == 0
+    reader.close()
+    sink.close()
+
+
+def test_reader_from_start(tmp_path):
+    path = tmp_path / "events.ring"
+    sink = RingSink(path, capacity=4096)
+    sink.handle_events([event(i) for i in range(3)])
+    assert RingReader(path).read() == []
+    assert indices(RingReader(path, from_start=True).read()) == [0, 1, 2]
+    sink.close()
+
+
+def test_reopen_ring(tmp_path):
+    path = tmp_path / "events.ring"
+    sink = RingSink(path, capacity=4096)
+    sink.handle_events([event(0)])
+    sink.close()
+    sink = RingSink(path, capacity=4096)
+    sink.handle_events([event(1)])
+    assert indices(RingReader(path).last(10)) == [0, 1]
+    sink.close()
+    with pytest.raises(RingFormatError, match="capacity"):
+        RingSink(path, capacity=8192)
+
+
+def test_torn_record(tmp_path):
+    path = tmp_path / "events.ring"
+    sink = RingSink(path, capacity=4096)
+    sink.handle_events([event(i) for i in range(3)])
+    sink.close()
+    # Corrupt the payload of the last record, as if a write was interrupted.
+    data = bytearray(path.read_bytes())
+    last_record = HEADER_SIZE + 2 * ((RECORD_HEADER.size + len(event(0)) + 7) & ~7)
+    data[last_record + RECORD_HEADER.size] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    reader = RingReader(path, from_start=True)
+    assert indices(reader.read()) == [0, 1]
+    assert reader.torn == 1
+
+
+def test_recover_after_crash(tmp_path):
+    path = tmp_path / "events.ring"
+    # A writer that dies while writing a batch: the sequence lock stays odd
+    # and the second record is left half written.
+    code = f"""
+import os
+from jupyter_events.sinks.ring import RingSink
+sink = RingSink({str(path)!r}, capacity=4096)
+sink.handle_events([b'{{"index": 0}}'])
+sink._seqlock += 1
+sink._mmap[24:32] = sink._seqlock.to_bytes(8, "little")
+sink._mmap[{HEADER_SIZE} + 32:{HEADER_SIZE} + 40] = b"torn"
+sink._mmap.flush()
+os._exit(1)
+"""
+    subprocess.run([sys.executable, "-c", code], check=False)  # noqa: S603
+    reader = RingReader(path, from_start=True)
+    assert indices(reader.read()) == [0]
+
+    sink = RingSink(path, capacity=4096)
+    sink.handle_events([event(1)])
+    assert indices(reader.read()) == [1]
+    assert reader.lost == 0
+    assert reader.torn == 0
+    sink.close()
+
+
+def test_event_larger_than_ring(tmp_path):
+    sink = RingSink(tmp_path / "events.ring", capacity=64)
+    sink.handle_events([b"x" * 100, event(0)])
+    assert sink.dropped == 1
+    assert indices(RingReader(sink.path).last(1)) == [0]
+    sink.close()
+
+
+def test_not_a_ring(tmp_path):
+    path = tmp_path / "events.ring"
+    path.write_bytes(b"not a ring" * 10)
+    with pytest.raises(RingFormatError):
+        RingReader(path)
+    with pytest.raises(RingFormatError):
+        RingSink(path)
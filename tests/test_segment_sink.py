@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import gzip
+import json
+import lzma
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.sinks import SegmentSink, read_segments
+from jupyter_events.sinks.segments import COMPRESSIONS, INDEX_SUFFIX
+
+SCHEMA_IDS = ["http://event.jupyter.org/first", "http://event.jupyter.org/second"]
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_schema(schema_id):
+    return {
+        "$id": schema_id,
+        "version": "1",
+        "type": "object",
+        "properties": {"index": {"title": "Index", "type": "integer"}},
+    }
+
+
+@pytest.fixture
+def logger():
+    el = EventLogger()
+    for schema_id in SCHEMA_IDS:
+        el.register_event_schema(make_schema(schema_id))
+    return el
+
+
+def emit(el, schema_id, indices):
+    for index in indices:
+        el.emit(
+            schema_id=schema_id,
+            data={"index": index},
+            timestamp_override=START + timedelta(minutes=index),
+        )
+
+
+def load_indexes(path):
+    return [json.loads(index.read_text()) for index in sorted(path.glob(f"*{INDEX_SUFFIX}"))]
+
+
+@pytest.mark.parametrize("compression,open_", [("gzip", gzip.open), ("lzma", lzma.open)])
+def test_segments(tmp_path, logger, compression, open_):
+    sink = SegmentSink(tmp_path, compression=compression, block_size=200, segment_size=1000)
+    logger.register_handler(sink)
+    emit(logger, SCHEMA_IDS[0], range(20))
+    sink.close()
+
+    segments = sink.segments()
+    assert len(segments) > 1
+    # Each segment is a regular compressed file.
+    events = []
+    for segment in segments:
+        with open_(segment) as f:
+            events.extend(json.loads(line) for line in f)
+    assert [event["index"] for event in events] == list(range(20))
+    assert [event["index"] for event in read_segments(tmp_path)] == list(range(20))
+
+    indexes = load_indexes(tmp_path)
+    assert all(index["complete"] for index in indexes)
+    assert sum(index["events"] for index in indexes) == 20
+    assert indexes[0]["schemas"] == [SCHEMA_IDS[0]]
+    first_block = indexes[0]["blocks"][0]
+    assert first_block["offset"] == 0
+    assert indexes[0]["first_timestamp"].startswith("2024-01-01T00:00:00")
+
+
+def test_read_segments_skips(tmp_path, logger):
+    sink = SegmentSink(tmp_path, block_size=1, segment_size=400)
+    logger.register_handler(sink)
+    emit(logger, SCHEMA_IDS[0], range(10))
+    emit(logger, SCHEMA_IDS[1], range(10, 20))
+    sink.close()
+
+    def read(**kwargs):
+        return [event["index"] for event in read_segments(tmp_path, **kwargs)]
+
+    decompress = Mock(side_effect=gzip.decompress)
+    with patch.dict(COMPRESSIONS, {"gzip": (".jsonl.gz", gzip.compress, decompress)}):
+        assert read(schema_ids=[SCHEMA_IDS[1]]) == list(range(10, 20))
+    # Only the blocks holding events of the second schema were decompressed.
+    assert decompress.call_count == 10
+
+    since = START + timedelta(minutes=5)
+    until = (START + timedelta(minutes=12)).isoformat() + "Z"
+    decompress.reset_mock()
+    with patch.dict(COMPRESSIONS, {"gzip": (".jsonl.gz", gzip.compress, decompress)}):
+        assert read(since=since, until=until) == list(range(5, 13))
+    assert decompress.call_count == 8
+    assert read(since=START + timedelta(days=1)) == []
+
+
+def test_flush(tmp_path):
+    sink = SegmentSink(tmp_path)
+    sink.handle_events([b'{"__schema__": "a", "index": 1}'])
+    assert sink.segments() == []
+    sink.flush()
+    assert len(sink.segments()) == 1
+    (index,) = load_indexes(tmp_path)
+    assert not index["complete"]
+    assert index["schemas"] == ["a"]
+    assert index["first_timestamp"] is None
+    assert list(read_segments(tmp_path)) == [{"__schema__": "a", "index": 1}]
+    sink.close()
+    assert load_indexes(tmp_path)[0]["complete"]
+
+
+def test_flush_interval(tmp_path):
+    sink = SegmentSink(tmp_path, flush_interval=0.1)
+    sink.handle_events([b'{"__schema__": "a", "index": 1}'])
+    # The partial block is written without another write or a flush.
+    deadline = time.monotonic() + 5
+    while not load_indexes(tmp_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert list(read_segments(tmp_path)) == [{"__schema__": "a", "index": 1}]
+    sink.close()
+
+    sink = SegmentSink(tmp_path / "manual", flush_interval=0)
+    sink.handle_events([b'{"__schema__": "a", "index": 1}'])
+    time.sleep(0.2)
+    assert sink.segments() == []
+    sink.close()
+    assert len(sink.segments()) == 1
+
+
+def test_write_after_close(tmp_path, capsys):
+    sink = SegmentSink(tmp_path)
+    sink.close()
+    sink.handle_events([b"{}"])
+    assert "closed sink" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "kwargs,match",
+    [({"compression": "zstd"}, "Unknown compression"), ({"block_size": 0}, "positive")],
+)
+def test_invalid_options(tmp_path, kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        SegmentSink(tmp_path, **kwargs)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+from traitlets.config import Config
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.serializers import EventSerializer, JSONSerializer, OrjsonSerializer
+
+from .utils import SCHEMA, SCHEMA_ID, ListSink
+
+
+class UpperSerializer(EventSerializer):
+    def dumps(self, obj):
+        return json.dumps(obj).upper().encode()
+
+
+def test_json_serializer():
+    when = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    data = JSONSerializer().dumps({"a": "é", "when": when, "other": object()})
+    assert isinstance(data, bytes)
+    loaded = json.loads(data)
+    assert loaded["a"] == "é"
+    assert loaded["when"] == when.isoformat()
+    assert loaded["other"].startswith("<object")
+
+
+def test_orjson_serializer():
+    pytest.importorskip("orjson")
+    when = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    data = OrjsonSerializer().dumps({"a": "é", "when": when})
+    assert isinstance(data, bytes)
+    assert json.loads(data) == {"a": "é", "when": when.isoformat()}
+
+
+def test_default_serializer():
+    el = EventLogger()
+    assert isinstance(el.serializer, JSONSerializer)
+
+
+def test_serializer_from_config():
+    cfg = Config()
+    cfg.EventLogger.serializer_class = "tests.test_serializers.UpperSerializer"
+    sink = ListSink()
+    el = EventLogger(config=cfg, handlers=[sink])
+    el.register_event_schema(SCHEMA)
+    el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    assert isinstance(el.serializer, UpperSerializer)
+    assert b'"SOMETHING": "BLAH"' in sink.events[0]
+
+
+def test_orjson_serializer_with_logging_handler(jp_event_handler, jp_read_emitted_events):
+    pytest.importorskip("orjson")
+    el = EventLogger(serializer=OrjsonSerializer())
+    el.register_event_schema(SCHEMA)
+    el.register_handler(jp_event_handler)
+    capsule = el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    assert jp_read_emitted_events() == [capsule]
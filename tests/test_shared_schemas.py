@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import gc
+import weakref
+
+from jupyter_events import schema as schema_module
+from jupyter_events.logger import EventLogger
+from jupyter_events.schema import EventSchema
+from jupyter_events.schema_registry import SchemaRegistry
+
+from .utils import SCHEMA_PATH
+
+SCHEMA_ID = "http://event.jupyter.org/shared"
+
+
+def make_schema():
+    return {
+        "$id": SCHEMA_ID,
+        "version": "1",
+        "type": "object",
+        "properties": {
+            "prop": {"title": "Prop", "type": "string"},
+        },
+    }
+
+
+def test_loggers_share_schemas():
+    loggers = [EventLogger() for _ in range(3)]
+    for el in loggers:
+        el.register_event_schema(make_schema())
+    schemas = {id(el.schemas.get(SCHEMA_ID)) for el in loggers}
+    assert len(schemas) == 1
+
+
+def test_shared_file_schemas():
+    path = SCHEMA_PATH / "good" / "basic.yaml"
+    first, second = SchemaRegistry(), SchemaRegistry()
+    first.register(path)
+    second.register(path)
+    schema_id = first.schema_ids[0]
+    assert first.get(schema_id) is second.get(schema_id)
+
+
+def test_different_content_not_shared():
+    other = make_schema()
+    other["properties"]["prop"]["type"] = "integer"
+    first, second = SchemaRegistry(), SchemaRegistry()
+    first.register(make_schema())
+    second.register(other)
+    assert first.get(SCHEMA_ID) is not second.get(SCHEMA_ID)
+
+
+def test_shared_schema_copies_input():
+    source = make_schema()
+    shared = EventSchema.shared(source)
+    source["properties"]["prop"]["type"] = "integer"
+    shared.validate({"prop": "a string"})
+
+
+def test_unshared_registry():
+    shared, unshared = SchemaRegistry(), SchemaRegistry(shared=False)
+    shared.register(make_schema())
+    unshared.register(make_schema())
+    assert shared.get(SCHEMA_ID) is not unshared.get(SCHEMA_ID)
+
+
+def test_unused_schemas_are_freed():
+    key = schema_module._content_key(make_schema())
+    registry = SchemaRegistry()
+    registry.register(make_schema())
+    assert key in schema_module._shared_schemas
+
+    registry.remove(SCHEMA_ID)
+    gc.collect()
+    assert key not in schema_module._shared_schemas
+
+
+def test_shared_schemas_do_not_keep_registries_alive():
+    registry = SchemaRegistry()
+    registry.register(make_schema())
+    shared = registry.get(SCHEMA_ID)
+    ref = weakref.ref(registry)
+
+    del registry
+    gc.collect()
+    assert ref() is None
+    shared.validate({"prop": "a string"})
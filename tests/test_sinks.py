@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+
+import pytest
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.sinks import EventSink, StreamSink
+
+from .utils import SCHEMA, SCHEMA_ID, ListSink
+
+
+class BrokenSink(EventSink):
+    def write_events(self, events):
+        msg = "broken sink"
+        raise RuntimeError(msg)
+
+
+def test_sinks_share_serialized_event():
+    sinks = [ListSink(), ListSink(), ListSink()]
+    el = EventLogger(handlers=sinks)
+    el.register_event_schema(SCHEMA)
+    capsule = el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+
+    data = sinks[0].events[0]
+    assert isinstance(data, bytes)
+    assert json.loads(data) == capsule
+    # Every sink received the very same buffer.
+    assert all(sink.events == [data] and sink.events[0] is data for sink in sinks)
+
+
+def test_serialize_once(monkeypatch):
+    calls = []
+    dumps = json.dumps
+
+    def counting_dumps(*args, **kwargs):
+        calls.append(args)
+        return dumps(*args, **kwargs)
+
+    file_output, stream_output = io.StringIO(), io.StringIO()
+    handlers = [
+        logging.StreamHandler(file_output),
+        logging.StreamHandler(stream_output),
+        ListSink(),
+    ]
+    el = EventLogger(handlers=handlers)
+    el.register_event_schema(SCHEMA)
+    monkeypatch.setattr("jupyter_events.serializers.json.dumps", counting_dumps)
+    capsule = el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    assert len(calls) == 1
+    assert json.loads(file_output.getvalue()) == capsule
+    assert json.loads(stream_output.getvalue()) == capsule
+    assert json.loads(handlers[2].events[0]) == capsule
+
+
+def test_logging_handler_adapter_keeps_record():
+    records = []
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            records.append((record, self.format(record)))
+
+    el = EventLogger(handlers=[RecordingHandler()])
+    el.register_event_schema(SCHEMA)
+    capsule = el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    record, formatted = records[0]
+    assert record.msg == capsule
+    assert json.loads(formatted) == capsule
+
+
+def test_remove_sink():
+    sink = ListSink()
+    el = EventLogger(handlers=[sink])
+    el.register_event_schema(SCHEMA)
+    el.remove_handler(sink)
+    el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    assert sink.events == []
+    assert sink not in el.handlers
+
+
+def test_sink_level_is_respected():
+    sink = ListSink()
+    sink.setLevel(logging.WARNING)
+    el = EventLogger(handlers=[sink])
+    el.register_event_schema(SCHEMA)
+    el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    assert sink.events == []
+
+
+def test_broken_sink_does_not_raise(capsys):
+    good = ListSink()
+    el = EventLogger(handlers=[BrokenSink(), good])
+    el.register_event_schema(SCHEMA)
+    el.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    assert len(good.events) == 1
+    assert "broken sink" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("stream", [io.BytesIO(), io.StringIO()])
+def test_stream_sink(stream):
+    el = EventLogger(handlers=[StreamSink(stream)])
+    el.register_event_schema(SCHEMA)
+    first = el.emit(schema_id=SCHEMA_ID, data={"something": "one"})
+    second = el.emit(schema_id=SCHEMA_ID, data={"something": "two"})
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [first, second]
+
+
+def test_sink_on_regular_logger():
+    sink = ListSink()
+    logger = logging.getLogger("test_sink_on_regular_logger")
+    logger.propagate = False
+    logger.addHandler(sink)
+    logger.warning("hello")
+    logger.removeHandler(sink)
+    assert sink.events == [b"hello"]
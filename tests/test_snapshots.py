@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+from unittest.mock import patch
+
+import pytest
+from jsonschema.exceptions import ValidationError
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.schema_registry import SNAPSHOT_MAGIC, SchemaRegistry, SchemaRegistryException
+
+from .utils import SCHEMA_PATH
+
+BASIC_SCHEMA = SCHEMA_PATH / "good" / "basic.yaml"
+BASIC_ID = "http://event.jupyter.org/test"
+
+VERSIONED = {
+    "$id": "http://event.jupyter.org/snapshot",
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "name": {"title": "Name", "type": "string"},
+        "user": {
+            "title": "User",
+            "$ref": "http://event.jupyter.org/snapshot-definitions#/definitions/user",
+        },
+    },
+}
+
+DEFINITIONS = {
+    "$id": "http://event.jupyter.org/snapshot-definitions",
+    "definitions": {"user": {"type": "string", "minLength": 1}},
+}
+
+
+def make_registry():
+    registry = SchemaRegistry(shared=False)
+    registry.register_definitions(DEFINITIONS)
+    registry.register(BASIC_SCHEMA)
+    registry.register(VERSIONED)
+    registry.register({**VERSIONED, "version": "2"})
+    return registry
+
+
+def test_snapshot_round_trip():
+    original = make_registry()
+    snapshot = original.snapshot()
+    assert snapshot.startswith(SNAPSHOT_MAGIC)
+
+    registry = SchemaRegistry(shared=False)
+    validate_schema = patch("jupyter_events.schema.validate_schema")
+    from_schema = patch("jupyter_events.compiler.CompiledValidator.from_schema")
+    with validate_schema as validate_mock, from_schema as from_schema_mock:
+        schema_ids = registry.load_snapshot(snapshot)
+    validate_mock.assert_not_called()
+    from_schema_mock.assert_not_called()
+
+    assert schema_ids == [BASIC_ID, VERSIONED["$id"]]
+    assert registry.definition_ids == [DEFINITIONS["$id"]]
+    assert registry.versions(VERSIONED["$id"]) == ["1", "2"]
+    for id_ in schema_ids:
+        for version in registry.versions(id_):
+            schema = registry.get(id_, version)
+            assert schema.fingerprint == original.get(id_, version).fingerprint
+            assert schema._compiled is not None
+
+    schema = registry.get(VERSIONED["$id"])
+    schema.validate({"name": "event", "user": "Ada"})
+    with pytest.raises(ValidationError):
+        schema.validate({"user": ""})
+
+
+def test_snapshot_file(tmp_path):
+    path = tmp_path / "schemas.snapshot"
+    make_registry().snapshot(path)
+    registry = SchemaRegistry()
+    registry.load_snapshot(path)
+    assert BASIC_ID in registry
+
+
+def test_snapshot_lazy_schemas():
+    original = SchemaRegistry()
+    original.register_lazy(BASIC_SCHEMA)
+    registry = SchemaRegistry()
+    assert registry.load_snapshot(original.snapshot()) == [BASIC_ID]
+    assert not registry.is_loaded(BASIC_ID)
+    assert registry.get(BASIC_ID).id == BASIC_ID
+
+
+def test_load_snapshot_into_registry():
+    snapshot = make_registry().snapshot()
+    registry = SchemaRegistry()
+    existing = registry.register(BASIC_SCHEMA)
+    registry.load_snapshot(snapshot)
+    # Identical schemas are reused.
+    assert registry.get(BASIC_ID) is existing
+
+    conflicting = SchemaRegistry()
+    conflicting.register({**VERSIONED, "title": "Conflict"})
+    with pytest.raises(SchemaRegistryException):
+        conflicting.load_snapshot(snapshot)
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda snapshot: b"not a snapshot",
+        lambda snapshot: snapshot.replace(b'"format": 1', b'"format": 0'),
+        lambda snapshot: snapshot.replace(b'"python": "', b'"python": "other-'),
+    ],
+)
+def test_load_invalid_snapshot(corrupt):
+    snapshot = corrupt(make_registry().snapshot())
+    with pytest.raises(SchemaRegistryException):
+        SchemaRegistry().load_snapshot(snapshot)
+
+
+def test_logger_snapshot(tmp_path):
+    path = tmp_path / "schemas.snapshot"
+    make_registry().snapshot(path)
+    el = EventLogger(handlers=[logging.NullHandler()])
+    el.schemas.load_snapshot(path)
+    capsule = el.emit(schema_id=BASIC_ID, data={"prop": "hello"})
+    assert capsule is not None
+    assert capsule["__schema__"] == BASIC_ID
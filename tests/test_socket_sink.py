@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from jupyter_events.funnel import FunnelServer
+from jupyter_events.logger import EventLogger
+from jupyter_events.sinks import SocketSink
+from jupyter_events.sinks.network import FRAME_HEADER
+
+from .utils import ListSink
+
+SCHEMA_ID = "http://event.jupyter.org/socket"
+SCHEMA = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {"index": {"title": "Index", "type": "integer"}},
+}
+
+
+class Collector:
+    """A TCP listener standing in for a collector, recording the frames it receives."""
+
+    def __init__(self):
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.address = self.listener.getsockname()
+        self.frames = []
+        self.connections = []
+        self._lock = threading.Lock()
+
+    def listen(self):
+        self.listener.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            self.connections.append(sock)
+            threading.Thread(target=self._receive, args=(sock,), daemon=True).start()
+
+    def _receive(self, sock):
+        buffer = b""
+        while True:
+            try:
+                data = sock.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            buffer += data
+            while len(buffer) >= FRAME_HEADER.size:
+                (size,) = FRAME_HEADER.unpack_from(buffer)
+                end = FRAME_HEADER.size + size
+                if len(buffer) < end:
+                    break
+                with self._lock:
+                    self.frames.append(buffer[FRAME_HEADER.size : end])
+                buffer = buffer[end:]
+
+    def events(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                events = [event for frame in self.frames for event in frame.split(b"\n")]
+            if len(events) >= count:
+                return events
+            time.sleep(0.01)
+        return events
+
+    def drop_connections(self):
+        for sock in self.connections:
+            sock.shutdown(socket.SHUT_RDWR)
+            sock.close()
+        self.connections.clear()
+
+    def close(self):
+        self.drop_connections()
+        self.listener.close()
+
+
+@pytest.fixture
+def collector():
+    collector = Collector()
+    yield collector
+    collector.close()
+
+
+def events(start, stop):
+    return [b'{"index": %d}' % index for index in range(start, stop)]
+
+
+def test_socket_sink_packs_frames(collector):
+    collector.listen()
+    sink = SocketSink(collector.address, max_frame_size=40)
+    sink.handle_events(events(0, 5))
+    assert collector.events(5) == events(0, 5)
+    # Each frame holds as many events as fit in max_frame_size.
+    assert collector.frames == [b"\n".join(events(0, 3)), b"\n".join(events(3, 5))]
+    sink.handle_events([b"x" * 100])
+    assert collector.events(6)[-1] == b"x" * 100
+    sink.close()
+
+    with pytest.raises(ValueError, match="closed sink"):
+        sink.write_events(events(0, 1))
+
+
+def test_socket_sink_backoff(collector):
+    # The collector is not listening yet: connecting is refused.
+    sink = SocketSink(collector.address, reconnect_delay=10, max_reconnect_delay=15)
+    sink.handle_events(events(0, 1))
+    retry_at = sink._retry_at
+    assert retry_at > time.monotonic() + 9
+    collector.listen()
+    # Waiting to reconnect: events are spooled.
+    sink.handle_events(events(1, 2))
+    sink.flush()
+    assert sink._retry_at == retry_at
+    assert collector.frames == []
+
+    sink._retry_at = 0
+    sink.flush()
+    assert collector.events(2) == events(0, 2)
+    assert sink._delay == 10
+    sink.close()
+
+
+def test_socket_sink_reconnects(collector):
+    collector.listen()
+    sink = SocketSink(collector.address)
+    sink.handle_events(events(0, 2))
+    assert collector.events(2) == events(0, 2)
+    collector.drop_connections()
+    time.sleep(0.05)
+    sink.handle_events(events(2, 4))
+    assert collector.events(4) == events(0, 4)
+    sink.close()
+
+
+def test_socket_sink_drops_oldest_events(collector):
+    sink = SocketSink(collector.address, spool_size=40, reconnect_delay=0)
+    sink.handle_events(events(0, 5))
+    assert sink.dropped == 2
+    collector.listen()
+    sink.flush()
+    assert collector.events(3) == events(2, 5)
+    sink.close()
+
+
+def test_socket_sink_spills_to_disk(collector, tmp_path):
+    spill_path = tmp_path / "spool" / "events.spill"
+    sink = SocketSink(collector.address, spool_size=40, spill_path=spill_path, reconnect_delay=0)
+    for index in range(100):
+        sink.handle_events(events(index, index + 1))
+    assert spill_path.exists()
+    assert sink._spooled <= 40
+    assert sink.dropped == 0
+
+    collector.listen()
+    sink.handle_events(events(100, 101))
+    assert collector.events(101) == events(0, 101)
+    assert not spill_path.exists()
+    sink.close()
+
+
+def test_socket_sink_spill_survives_close(collector, tmp_path):
+    spill_path = tmp_path / "events.spill"
+    sink = SocketSink(collector.address, spill_path=spill_path, reconnect_delay=0)
+    sink.handle_events(events(0, 3))
+    sink.close()
+    # An incomplete frame, left by a crash while spilling.
+    with spill_path.open("ab") as file:
+        file.write(FRAME_HEADER.pack(100) + b'{"index"')
+
+    collector.listen()
+    sink = SocketSink(collector.address, spill_path=spill_path)
+    sink.handle_events(events(3, 4))
+    assert collector.events(4) == events(0, 4)
+    assert not spill_path.exists()
+    sink.close()
+
+
+def test_socket_sink_to_funnel_server():
+    received = ListSink()
+    with tempfile.TemporaryDirectory() as directory:
+        server = FunnelServer(f"{directory}/funnel.sock", [received])
+        server.start()
+        sink = SocketSink(server.path)
+        el = EventLogger(handlers=[sink])
+        el.register_event_schema(SCHEMA)
+        el.emit_many(schema_id=SCHEMA_ID, data=[{"index": index} for index in range(10)])
+        el.remove_handler(sink)
+        sink.close()
+        server.close()
+    assert [json.loads(event)["index"] for event in received.events] == list(range(10))
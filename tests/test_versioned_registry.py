@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+
+import pytest
+from jsonschema.exceptions import ValidationError
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.schema_registry import (
+    SchemaRegistrationError,
+    SchemaRegistry,
+    SchemaRegistryException,
+)
+
+SCHEMA_ID = "http://event.jupyter.org/versioned"
+
+SCHEMA_V1 = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "name": {"title": "Name", "type": "string"},
+    },
+    "required": ["name"],
+}
+
+SCHEMA_V2 = {
+    "$id": SCHEMA_ID,
+    "version": "2",
+    "type": "object",
+    "properties": {
+        "first": {"title": "First name", "type": "string"},
+        "last": {"title": "Last name", "type": "string"},
+    },
+    "required": ["first", "last"],
+}
+
+
+def with_version(schema, version):
+    return {**schema, "version": version}
+
+
+def split_name(data):
+    first, last = data["name"].split(" ")
+    return {"first": first, "last": last}
+
+
+def test_register_versions():
+    registry = SchemaRegistry()
+    v2 = registry.register(SCHEMA_V2)
+    v1 = registry.register(SCHEMA_V1)
+
+    assert registry.schema_ids == [SCHEMA_ID]
+    assert registry.versions(SCHEMA_ID) == ["2", "1"]
+    # The newest version is the latest, whatever the registration order.
+    assert registry.get(SCHEMA_ID) is v2
+    assert registry.get(SCHEMA_ID, "1") is v1
+    assert registry.get(SCHEMA_ID, "2") is v2
+
+    registry.validate_event(SCHEMA_ID, {"name": "Ada Lovelace"}, version="1")
+    with pytest.raises(ValidationError):
+        registry.validate_event(SCHEMA_ID, {"name": "Ada Lovelace"})
+
+
+@pytest.mark.parametrize(
+    "versions,latest",
+    [(["1.9", "1.10"], "1.10"), (["10", "9"], "10"), (["beta", "alpha"], "alpha")],
+)
+def test_latest_version(versions, latest):
+    registry = SchemaRegistry()
+    for version in versions:
+        registry.register(with_version(SCHEMA_V1, version))
+    assert registry.get(SCHEMA_ID).version == latest
+
+
+def test_register_conflicting_version():
+    registry = SchemaRegistry()
+    registry.register(SCHEMA_V1)
+    with pytest.raises(SchemaRegistryException, match="version 1"):
+        registry.register({**SCHEMA_V1, "required": []})
+
+
+def test_get_missing_version():
+    registry = SchemaRegistry()
+    registry.register(SCHEMA_V1)
+    with pytest.raises(KeyError, match="Registered versions: 1"):
+        registry.get(SCHEMA_ID, "3")
+
+
+def test_remove_version():
+    registry = SchemaRegistry()
+    v1 = registry.register(SCHEMA_V1)
+    registry.register(SCHEMA_V2)
+
+    registry.remove(SCHEMA_ID, "2")
+    assert registry.get(SCHEMA_ID) is v1
+    assert registry.versions(SCHEMA_ID) == ["1"]
+
+    registry.remove(SCHEMA_ID, "1")
+    assert SCHEMA_ID not in registry
+
+
+def test_remove_all_versions():
+    registry = SchemaRegistry()
+    registry.register(SCHEMA_V1)
+    registry.register(SCHEMA_V2)
+    registry.remove(SCHEMA_ID)
+    assert SCHEMA_ID not in registry
+    assert registry.versions(SCHEMA_ID) == []
+
+
+def test_register_directory_versions(tmp_path):
+    for schema in (SCHEMA_V1, SCHEMA_V2):
+        (tmp_path / f"v{schema['version']}.json").write_text(json.dumps(schema))
+    registry = SchemaRegistry()
+    report = registry.register_directory(tmp_path, pattern="*.json")
+    assert report.schema_ids == [SCHEMA_ID]
+    assert registry.versions(SCHEMA_ID) == ["1", "2"]
+
+    (tmp_path / "v1.json").write_text(json.dumps({**SCHEMA_V1, "required": []}))
+    with pytest.raises(SchemaRegistrationError):
+        registry.register_directory(tmp_path, pattern="v1.json")
+
+
+def test_upgrade_events():
+    registry = SchemaRegistry()
+    registry.register(SCHEMA_V1)
+    registry.register(SCHEMA_V2)
+    registry.register(with_version(SCHEMA_V2, "3"))
+    registry.register_upgrade(SCHEMA_ID, "1", "2", split_name)
+    registry.register_upgrade(SCHEMA_ID, "2", "3", lambda data: {**data, "last": data["last"]})
+
+    events = [{"name": "Ada Lovelace"}, {"name": "Alan Turing"}]
+    upgraded = registry.upgrade_events(SCHEMA_ID, events, "1")
+    assert upgraded == [
+        {"first": "Ada", "last": "Lovelace"},
+        {"first": "Alan", "last": "Turing"},
+    ]
+    assert registry.upgrade_events(SCHEMA_ID, events, "1", "2") == upgraded
+    assert registry.upgrade_events(SCHEMA_ID, upgraded, "3") == upgraded
+
+
+def test_upgrade_events_missing_upgrade():
+    registry = SchemaRegistry()
+    registry.register(SCHEMA_V1)
+    registry.register(SCHEMA_V2)
+    with pytest.raises(SchemaRegistryException, match="No upgrade from version 1"):
+        registry.upgrade_events(SCHEMA_ID, [{"name": "Ada Lovelace"}], "1")
+
+
+def test_upgrade_cycle():
+    registry = SchemaRegistry()
+    registry.register(SCHEMA_V1)
+    registry.register_upgrade(SCHEMA_ID, "1", "2", split_name)
+    registry.register_upgrade(SCHEMA_ID, "2", "1", split_name)
+    with pytest.raises(SchemaRegistryException, match="cycle"):
+        registry.upgrade_events(SCHEMA_ID, [], "1", "3")
+
+
+def test_emit_versions():
+    sink = io.StringIO()
+    el = EventLogger(handlers=[logging.StreamHandler(sink)])
+    el.register_event_schema(SCHEMA_V1)
+    el.register_event_schema(SCHEMA_V2)
+
+    el.emit(schema_id=SCHEMA_ID, data={"first": "Ada", "last": "Lovelace"})
+    el.emit(schema_id=SCHEMA_ID, data={"name": "Alan Turing"}, schema_version="1")
+    el.emit_many(schema_id=SCHEMA_ID, data=[{"name": "Grace Hopper"}], schema_version="1")
+    with pytest.raises(ValidationError):
+        el.emit(schema_id=SCHEMA_ID, data={"name": "Alan Turing"})
+
+    events = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [event["__schema_version__"] for event in events] == ["2", "1", "1"]
+    assert events[1]["name"] == "Alan Turing"
+
+
+def test_emit_unknown_version():
+    el = EventLogger(handlers=[logging.NullHandler()])
+    el.register_event_schema(SCHEMA_V1)
+    with pytest.raises(KeyError):
+        el.emit(schema_id=SCHEMA_ID, data={"name": "Ada Lovelace"}, schema_version="2")
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+from jupyter_events.logger import EventLogger
+from jupyter_events.writer import BackgroundWriter
+
+from .utils import SCHEMA, SCHEMA_ID, ListSink
+
+
+@pytest.fixture
+def sink():
+    return ListSink()
+
+
+@pytest.fixture
+def logger(sink):
+    el = EventLogger(
+        handlers=[sink],
+        background_writer=True,
+        writer_batch_size=10,
+        writer_flush_interval=60,
+    )
+    el.register_event_schema(SCHEMA)
+    yield el
+    el.close()
+
+
+def test_background_writes(logger, sink):
+    capsules = [logger.emit(schema_id=SCHEMA_ID, data={"something": str(i)}) for i in range(25)]
+    logger.flush()
+    assert sink.capsules == capsules
+    assert threading.current_thread() not in sink.threads
+    # Events are written in batches of at most writer_batch_size.
+    assert all(len(batch) <= 10 for batch in sink.batches)
+    assert len(sink.batches) < 25
+
+
+def test_logging_handler_in_background(logger):
+    output = io.StringIO()
+    logger.register_handler(logging.StreamHandler(output))
+    capsule = logger.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    logger.flush()
+    assert json.loads(output.getvalue()) == capsule
+
+
+def test_validation_happens_on_emit(logger, sink):
+    with pytest.raises(Exception, match="is not of type"):
+        logger.emit(schema_id=SCHEMA_ID, data={"something": 1})
+    logger.flush()
+    assert sink.capsules == []
+
+
+def test_close_drains_queue(logger, sink):
+    capsule = logger.emit(schema_id=SCHEMA_ID, data={"something": "blah"})
+    writer = logger._writer
+    logger.close()
+    assert sink.capsules == [capsule]
+    assert writer.closed
+    # Events emitted after closing are written synchronously.
+    capsule = logger.emit(schema_id=SCHEMA_ID, data={"something": "after"})
+    assert sink.capsules[-1] == capsule
+    assert threading.current_thread() in sink.threads
+
+
+def test_disable_background_writer(logger, sink):
+    first = logger.emit(schema_id=SCHEMA_ID, data={"something": "first"})
+    logger.background_writer = False
+    second = logger.emit(schema_id=SCHEMA_ID, data={"something": "second"})
+    assert sink.capsules == [first, second]
+
+
+def test_writer_bounded_queue():
+    release = threading.Event()
+    written = []
+
+    def write(batch):
+        release.wait()
+        written.extend(batch)
+
+    writer = BackgroundWriter(write, max_queue_size=2, batch_size=1, flush_interval=0)
+    # The first item is taken by the (blocked) writer thread, two more
+    # fill the queue.
+    for i in range(3):
+        writer.submit(i)
+    submitted = threading.Event()
+
+    def submit():
+        writer.submit(3)
+        submitted.set()
+
+    thread = threading.Thread(target=submit)
+    thread.start()
+    assert not submitted.wait(0.2)
+    release.set()
+    thread.join()
+    writer.close()
+    assert written == [0, 1, 2, 3]
+
+
+def test_writer_reports_errors(caplog):
+    def write(batch):
+        msg = "cannot write"
+        raise RuntimeError(msg)
+
+    writer = BackgroundWriter(write, flush_interval=0)
+    with caplog.at_level(logging.ERROR):
+        writer.submit(1)
+        assert writer.flush(timeout=5)
+    writer.close()
+    assert "Failed to write a batch of 1 events" in caplog.text
+    with pytest.raises(RuntimeError):
+        writer.submit(2)
@@ -4,12 +4,53 @@ import io
 import json
 import logging
 import pathlib
+import threading
 from copy import deepcopy
 
 from jupyter_events.logger import EventLogger
+from jupyter_events.sinks import EventSink
 
 SCHEMA_PATH = pathlib.Path(__file__).parent / "schemas"
 
+SCHEMA_ID = "http://event.jupyter.org/test"
+SCHEMA = {
+    "$id": SCHEMA_ID,
+    "version": "1",
+    "type": "object",
+    "properties": {
+        "something": {
+            "type": "string",
+            "title": "test",
+        },
+        "count": {
+            "type": "integer",
+            "title": "count",
+        },
+    },
+}
+
+
+class ListSink(EventSink):
+    """An event sink that keeps the batches of events written to it."""
+
+    def __init__(self, projection=None):
+        super().__init__()
+        self.projection = projection
+        self.batches = []
+        self.threads = set()
+
+    def write_events(self, events):
+        self.threads.add(threading.current_thread())
+        self.batches.append(list(events))
+
+    @property
+    def events(self):
+        return [event for batch in self.batches for event in batch]
+
+    @property
+    def capsules(self):
+        return [json.loads(event) for event in self.events]
+
 
 def get_event_data(event, schema, schema_id, version, unredacted_policies):
     sink = io.StringIO()